@@ -5,6 +5,17 @@ Created on Tue Jul 28 17:16:44 2015
 @author: cadop
 """
 import pyCGM
+import numpy as np
+
+#Used to split the arrays with angles and axis
+#Start Joint Angles
+SJA=0
+#End Joint Angles
+EJA=SJA+19*3
+#Start Axis
+SA=EJA
+#End Axis
+EA=SA+72*3
 
 #Each rank should run this function and return the array of data
 # motiondata should be passed individually with scatter
@@ -17,4 +28,24 @@ def calcFramesMPI(motiondata,vsk):
         angles.append(angle)
     #should be send to master rank
     return angles
+
+#Frames of each rank when the data is split with Scatterv, as evenly as
+# possible and with rank 0 calculating its share too
+def splitFrames(nframes,size):
+    counts=np.zeros(size,dtype=int)+nframes//size
+    counts[:nframes%size]+=1
+    displs=np.zeros(size,dtype=int)
+    displs[1:]=np.cumsum(counts)[:-1]
+    return counts,displs
+
+#Same as calcFramesMPI for the part of the (frames, markers, 3) array of a
+# rank, the angles and axis are written in a (frames, 273) array that can be
+# sent with Gatherv
+def calcArrayMPI(labels,motiondata,vsk,out=None):
+    if out is None:
+        out=np.empty((len(motiondata),EA))
+    for i in range(len(motiondata)):
+        frame=dict(zip(labels,motiondata[i]))
+        out[i]=pyCGM.JointAngleCalc(frame,vsk)
+    return out
  ###############################################################################
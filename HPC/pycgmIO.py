@@ -50,98 +50,6 @@ def createVskDataDict(labels,data):
 def splitVskDataDict(vsk):
 	return vsk.keys(),np.asarray(vsk.values())
 
-def writeToMem(motiondata,static,vsk,counter,namePrefix="pycgm"):
-	#Get the binary from the obj
-	# p=pickle.dumps(obj)
-	motiondata_keys=json.dumps(motiondata[0])
-	motiondata_keys_size=len(motiondata_keys)
-
-	motiondata_data=motiondata[1].dumps()
-	motiondata_data_size=len(motiondata_data)
-
-	#Do this temporariliy because static should be gone
-	static = np.asarray([[0,0,0],[0,0,0]])
-	static_data_size=0
-	static_data=0
-	if type(static_data)!=type(None):
-		static_data=static.dumps()
-		static_data_size=len(static_data)
-
-	vsk_keys=0
-	vsk_keys_size=0
-	vsk_data=0
-	vsk_data_size=0
-	if type(vsk)!=type(None):
-		vsk_keys=json.dumps(vsk[0])
-		vsk_keys_size=len(vsk_keys)
-		vsk_data=vsk[1].dumps()
-		vsk_data_size=len(vsk_data)
-
-	#Get the size of the object to alocate in memory
-	# objsize=sys.getsizeof(p)
-	# objsize=len(p)
-	objsize=motiondata_keys_size+motiondata_data_size+static_data_size+vsk_keys_size+vsk_data_size
-	#Calculate the number of blocks in memory that need to be allocated
-	blocks=int(math.ceil(float(objsize)/mmap.PAGESIZE))
-	memsize=blocks*mmap.PAGESIZE
-	#Create a unique name
-	if platform.system()=='Linux':
-		filename=tempfile.gettempdir()+'/'+namePrefix+str(counter)+str(os.getpid())
-	else:
-		filename=tempfile.gettempdir()+'\\'+namePrefix+str(counter)+str(os.getpid())
-	# filename='./'+namePrefix+str(counter)+str(os.getpid())
-	#File descriptor for mmap
-	fd = os.open(filename, os.O_CREAT | os.O_TRUNC | os.O_RDWR)
-	#Make sure the memory is allocated
-	assert os.write(fd, '\x00' * memsize) == memsize
-	#Map the file to memory
-	buff = None
-	if platform.system()=='Linux':
-		buf = mmap.mmap(fd, memsize, mmap.MAP_SHARED,access=mmap.ACCESS_WRITE)
-	else:
-		buf = mmap.mmap(fd, memsize,access=mmap.ACCESS_WRITE)
-	#Put the data
-	buf.seek(0)
-	buf.write(motiondata_keys)
-	buf.write(motiondata_data)
-	if type(static_data)!=type(None):
-		buf.write(static_data)
-	if type(vsk)!=type(None):
-		buf.write(vsk_keys)
-		buf.write(vsk_data)
-	buf.seek(0)
-	buf.close()
-	os.close(fd)
-	header={'filename':filename,'memsize':memsize,'objsize':
-		[motiondata_keys_size,motiondata_data_size,static_data_size,vsk_keys_size,vsk_data_size]}
-	return [header]
-
-def readFromMem(header):
-	header=header[0]
-	temp=''
-	fd=os.open(header['filename'], os.O_RDONLY)
-	buf=mmap.mmap(fd, header['memsize'],access=mmap.ACCESS_READ)
-
-	motiondata_keys=json.loads(buf.read(header['objsize'][0]))
-	motiondata_data=np.loads(buf.read(header['objsize'][1]))
-	static_data=None
-	if header['objsize'][2]!=0:
-		static_data=np.loads(buf.read(header['objsize'][2]))
-	vsk=None
-	if header['objsize'][3]!=0 and header['objsize'][4]!=0:
-		vsk_keys=json.loads(buf.read(header['objsize'][3]))
-		vsk_data=np.loads(buf.read(header['objsize'][4]))
-		vsk=createVskDataDict(vsk_keys,vsk_data)
-
-	motiondata=createMotionDataDict(motiondata_keys,motiondata_data)
-	try:
-		os.remove(header['filename'])
-	except Exception, e:
-		print 'Could not remove file'
-		pass
-
-	return [motiondata,vsk]
-
 def loadC3D(filename):
     #Calls the py c3d file
     reader = c3d.Reader(open(filename, 'rb'))
@@ -170,6 +78,63 @@ def loadC3D(filename):
         mydict = {}
     return [data,dataunlabeled,markers]
 
+def loadC3DLayout(filename):
+    """
+    Reads only the header and the parameters of a c3d file, to read the
+    frames later with loadC3DFrames
+    @param filename Name of the c3d file
+    @return Dictionary with the marker labels, the number of frames and
+    points, the position of the data in the file, the words per frame and
+    the scale. It is small enough to broadcast to other processes
+    """
+    with open(filename, 'rb') as handle:
+        reader = c3d.Reader(handle)
+        labels = reader.get('POINT:LABELS').string_array
+        scale = reader.scale_factor()
+        ppf = reader.header.point_count
+        words = 4 * ppf + reader.header.analog_count
+        offset = (reader.header.data_block - 1) * 512
+        itemsize = [2, 4][scale < 0]
+        frames = reader.last_frame() - reader.first_frame() + 1
+        #frames missing from a truncated file are left out
+        handle.seek(0, 2)
+        if words > 0:
+            frames = min(frames, (handle.tell() - offset) // (words * itemsize))
+    layout = {'labels':[str(label.rstrip()) for label in labels][:ppf],
+              'frames':max(frames, 0),
+              'points':ppf,
+              'words':words,
+              'offset':offset,
+              'scale':scale}
+    return layout
+
+def loadC3DFrames(filename,layout,start,end):
+    """
+    Reads a range of frames of a c3d file with a single seek and read, so
+    each process can read its own frames of a trial
+    @param filename Name of the c3d file
+    @param layout Dictionary returned by loadC3DLayout
+    @param start,end Range of the frames to read
+    @return (frames, points, 3) array of the marker positions, in the order
+    of layout['labels']. Invalid points are NaN
+    """
+    scale = layout['scale']
+    dtype = np.dtype(['<i2', '<f4'][scale < 0])
+    words = layout['words']
+    ppf = layout['points']
+    start = max(start, 0)
+    end = min(end, layout['frames'])
+    count = max(end - start, 0)
+    with open(filename, 'rb') as handle:
+        handle.seek(layout['offset'] + start * words * dtype.itemsize)
+        raw = np.fromfile(handle, dtype=dtype, count=count * words)
+    raw = raw.reshape((count, words))[:, :4 * ppf].reshape((count, ppf, 4))
+    points = raw[:, :, :3].astype(np.float64)
+    if scale >= 0:
+        points *= scale
+    points[raw[:, :, 3] <= -1] = np.nan
+    return points
+
 def loadCSV(filename):
     if filename == '':
         self.returnedData.emit(None)
@@ -249,6 +214,34 @@ def loadCSV(filename):
     
     return [motionData,unlabeledMotionData,labels]
 
+def loadCSVLength(filename):
+    """
+    Counts the frames of the TRAJECTORIES block of a csv file without
+    parsing them, the frames that loadCSV reads
+    @param filename Name of the csv file
+    @return Number of frames
+    """
+    frames = 0
+    with open(filename, 'r') as fh:
+        for line in fh:
+            if line.startswith("TRAJECTORIES"):
+                #frequency, labels and fields before the rows of numbers
+                for i in range(3):
+                    next(fh)
+                #the block ends at a blank row or a row with other columns
+                columns = None
+                for row in fh:
+                    row = row.rstrip('\r\n')
+                    if row == '':
+                        break
+                    if columns == None:
+                        columns = row.count(',')
+                    elif row.count(',') != columns:
+                        break
+                    frames += 1
+                break
+    return frames
+
 def loadData(filename,rawData=True):
         if str(filename).endswith('.c3d'):
                 return loadC3D(filename)[0]
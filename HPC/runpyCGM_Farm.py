@@ -0,0 +1,173 @@
+#TO Use:
+# calculates many trials, each one on a single rank. Rank 0 hands the trials
+# to the other ranks as they become idle, the longest trials first, and each
+# rank calibrates its subject, calculates the angles and writes the output.
+
+#The manifest has one trial per line, with the dynamic trial, static trial,
+# vsk and output file separated by commas, and optionally a fifth field that
+# is true or 1 when the static trial is calibrated with flat feet. Empty
+# lines and lines starting with # are skipped:
+# Trial01.c3d,Static01.c3d,Subject01.vsk,Trial01_output
+# Trial02.c3d,Static02.c3d,Subject02.vsk,Trial02_output,true
+
+#Example With Input Args:
+# mpirun -n 4 python runpyCGM_Farm.py -m manifest.csv
+
+import time
+import numpy as np
+import sys
+import getopt
+import pycgmIO
+import pycgmCalc
+import pycgmStatic
+
+from mpi4py import MPI
+
+#Tags of the messages between rank 0 and the workers
+TAG_READY = 1
+TAG_TRIAL = 2
+
+def loadManifest(filename):
+    trials = []
+    with open(filename, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if line == '' or line.startswith('#'):
+                continue
+            fields = [field.strip() for field in line.split(',')]
+            if len(fields) not in (4,5):
+                raise Exception("Manifest lines need a dynamic, static, vsk and output file: "+line)
+            flat_foot = len(fields) == 5 and fields[4].lower() in ('true','1')
+            trials.append(fields[:4]+[flat_foot])
+    return trials
+
+#Number of frames of a trial, used to start the longest trials first. A file
+# that can not be read is left to fail in the worker, which reports the error
+def trialLength(filename):
+    try:
+        if filename.endswith('.c3d'):
+            return pycgmIO.loadC3DLayout(filename)['frames']
+        return pycgmIO.loadCSVLength(filename)
+    except Exception:
+        return 0
+
+def runTrial(trial):
+    dynamic,static,vskfile,output,flat_foot = trial
+    vskdata = pycgmIO.loadVSK(vskfile)
+    vsk = pycgmIO.createVskDataDict(vskdata[0],vskdata[1])
+    vsk = pycgmStatic.getStatic(pycgmIO.loadData(static),vsk,flat_foot)
+
+    if dynamic.endswith('.c3d'):
+        layout = pycgmIO.loadC3DLayout(dynamic)
+        labels = layout['labels']
+        motiondata = pycgmIO.loadC3DFrames(dynamic,layout,0,layout['frames'])
+    else:
+        motiondata,labels = pycgmIO.splitDataDict(pycgmIO.loadData(dynamic))
+        motiondata = np.asarray(motiondata)
+
+    result = pycgmCalc.calcArrayMPI(labels,motiondata,vsk)
+    pycgmIO.writeResult(result,output)
+    return len(result)
+
+def master(comm,trials):
+    rank_size = comm.Get_size()
+    order = sorted(range(len(trials)), key=lambda i: trialLength(trials[i][0]), reverse=True)
+    failed = []
+    status = MPI.Status()
+
+    if rank_size == 1:
+        #no workers, rank 0 calculates all the trials
+        nframes = 0
+        busy = time.time()
+        for i in order:
+            try:
+                nframes += runTrial(trials[i])
+            except Exception, e:
+                failed.append((i,str(e)))
+        return failed,(len(order),nframes,time.time()-busy)
+
+    #each worker asks for a trial when it starts and after each trial
+    stopped = 0
+    next_trial = 0
+    while stopped < rank_size-1:
+        message = comm.recv(source=MPI.ANY_SOURCE, tag=TAG_READY, status=status)
+        worker = status.Get_source()
+        if message != None and message[1] != None:
+            failed.append(message)
+        if next_trial < len(order):
+            comm.send(order[next_trial], dest=worker, tag=TAG_TRIAL)
+            next_trial += 1
+        else:
+            comm.send(None, dest=worker, tag=TAG_TRIAL)
+            stopped += 1
+    return failed,(0,0,0.0)
+
+#Returns the number of trials and frames calculated and the time spent on them
+def worker(comm,trials):
+    ntrials = 0
+    nframes = 0
+    busy = 0.0
+    message = None
+    while True:
+        comm.send(message, dest=0, tag=TAG_READY)
+        i = comm.recv(source=0, tag=TAG_TRIAL)
+        if i == None:
+            break
+        start = time.time()
+        try:
+            nframes += runTrial(trials[i])
+            message = (i,None)
+        except Exception, e:
+            message = (i,str(e))
+        busy += time.time()-start
+        ntrials += 1
+    return ntrials,nframes,busy
+
+def mainFarm(argv):
+    manifest = None
+    try:
+        opts, args = getopt.getopt(argv,"hm:",["manifest="])
+    except getopt.GetoptError:
+        print 'runpyCGM_Farm.py -m <manifest>'
+        sys.exit(2)
+    for opt, arg in opts:
+        if opt == '-h':
+            print 'runpyCGM_Farm.py -m <manifest>'
+            sys.exit()
+        elif opt in ("-m", "--manifest"):
+            manifest = arg
+    if manifest == None:
+        print 'runpyCGM_Farm.py -m <manifest>'
+        sys.exit(2)
+
+    comm = MPI.COMM_WORLD
+    rank = comm.Get_rank()
+    rank_size = comm.Get_size()
+
+    #every rank reads the manifest, only the trial numbers are sent
+    trials = loadManifest(manifest)
+
+    totalTime = time.time()
+    if rank == 0:
+        failed,stats = master(comm,trials)
+    else:
+        stats = worker(comm,trials)
+    totalTime = time.time()-totalTime
+
+    stats = comm.gather((rank,)+tuple(stats)+(totalTime,), root=0)
+    if rank == 0:
+        for i,error in failed:
+            print "Trial %s failed: %s" % (trials[i][0],error)
+        print "%d trials on %d ranks in %.2fs" % (len(trials),rank_size,totalTime)
+        print "rank\ttrials\tframes\tbusy (s)\tutilisation"
+        #rank 0 only hands out the trials when there are workers
+        if rank_size > 1:
+            stats = stats[1:]
+        for r,ntrials,nframes,busy,wall in stats:
+            print "%d\t%d\t%d\t%.2f\t\t%.1f%%" % (r,ntrials,nframes,busy,100.0*busy/max(wall,1e-9))
+        if rank_size > 1:
+            busy = sum(s[3] for s in stats)
+            print "mean worker utilisation: %.1f%%" % (100.0*busy/(totalTime*(rank_size-1)))
+
+if __name__ == '__main__':
+    mainFarm(sys.argv[1:])
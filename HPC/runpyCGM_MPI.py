@@ -4,6 +4,11 @@
 #Example With Input Args:
 # mpirun -c 12 python runpyCGM_MPI_Frames.py -o MPIFramesOutput -i Sample_ROM.c3d -v Sample_SM.vsk -x Sample_Static.c3d
 
+#With --parallelread rank 0 only reads the header and labels of the c3d file,
+# and every rank reads its own frames from the file. The file has to be on a
+# filesystem all the nodes can read, which is always the case on one machine:
+# mpirun -n 4 python runpyCGM_MPI.py -o MPIFramesOutput -i Sample_ROM.c3d -v Sample_SM.vsk -x Sample_Static.c3d --parallelread
+
 import time
 import numpy as np
 import sys
@@ -18,9 +23,10 @@ def mainMPI(argv):
     testtime =  time.strftime("%d_%H_%M_%S",time.gmtime())
     runfolder = str(testtime)+'/'
     pycgmIO.make_sure_path_exists(runfolder)
+    parallelread = False
     
     try:
-	opts, args = getopt.getopt(argv,"h:i:o:s:e:c:f:p:v:x:r",["ifile=","ofile=","start=","end=","calctype=","singleframe=","nprocs=","vskfile=","staticinput=","rank="])
+	opts, args = getopt.getopt(argv,"h:i:o:s:e:c:f:p:v:x:r",["ifile=","ofile=","start=","end=","calctype=","singleframe=","nprocs=","vskfile=","staticinput=","rank=","parallelread"])
     except getopt.GetoptError:
 	print 'pyCGM.py -i <motionFile> -o <outputfile> -s <start> -e <end> -c <calctype> -sf <singleframe>'
 	sys.exit(2)
@@ -49,6 +55,8 @@ def mainMPI(argv):
 		staticfile = arg
 	elif opt in ("-r","--rank"):
 		rank = arg
+	elif opt == "--parallelread":
+		parallelread = True
 
     #Get this processes rank and the size of the mpi rank call
     comm = MPI.COMM_WORLD
@@ -60,22 +68,32 @@ def mainMPI(argv):
     vsk = None
     static = None
     motiondata_lab = None
+    shape = None
+    layout = None
+    #File to use in calculation
+    filename = './'+inputfile
     if rank == 0:
-        #File to use in calculation
         start = 0
         flat_foot = False
-        filename = './'+inputfile
 
         #Time setup
         totalTime=time.time()
         loadDataTime=time.time()
 
-        #Load motion data from file
-        motionData  = pycgmIO.loadData(filename) 
+        if parallelread:
+            #Only the header and labels, the frames are read by each rank
+            layout = pycgmIO.loadC3DLayout(filename)
+            motiondata_lab = layout['labels']
+            shape = (layout['frames'],layout['points'],3)
+            nloaded = layout['frames']
+        else:
+            #Load motion data from file
+            motionData  = pycgmIO.loadData(filename) 
+            nloaded = len(motionData)
 
         loadDataTime=time.time()-loadDataTime
         
-        if len(motionData) == 0:
+        if nloaded == 0:
             print "No Data Loaded"
             sys.exit()
             
@@ -98,54 +116,55 @@ def mainMPI(argv):
             vsk = pycgmStatic.getStatic(staticData,vsk,flat_foot)
             calculateStaticTime=time.time()-calculateStaticTime
 
-        #Split the motion data to labels and values to send faster with MPI
-        # then combine again in each process
-        motiondata_val,motiondata_lab = pycgmIO.splitDataDict(motionData)
+        if not parallelread:
+            #Split the motion data to labels and values to send faster with MPI
+            motiondata_val,motiondata_lab = pycgmIO.splitDataDict(motionData)
+            motiondata_val = np.ascontiguousarray(motiondata_val,dtype=np.float64)
+            shape = motiondata_val.shape
 		
     #Start timing the calculation time
     calculateAnglesTime=time.time()
 
+    #The labels and vsk keys are small and sent as lists, the marker
+    # positions and vsk values as float64 arrays without pickling
+    vsk_keys = None
+    vsk_val = None
     if rank == 0:
-        #Split the data evenly for the processes  
-        motionData_val_scatter = []
-        motionData_val_scatter.append([None])
-        l=len(motiondata_val)/(rank_size-1)
-        for i in range(rank_size-1):
-            start=i*l
-            end=(i+1)*l
-            if i == rank_size-2:
-                end = len(motiondata_val)
-            #Append each dataset as an array of the data, vsk info, and static
-            motionData_val_scatter.append(motiondata_val[start:end])
-            
-        #Set the master rank single_result value to None so there is a variable
-        # for it to read when gathering
-        single_result = None
+        vsk_keys = list(vsk.keys())
+        vsk_val = np.array([vsk[key] for key in vsk_keys],dtype=np.float64)
+    shape = comm.bcast(shape, root=0)
+    motiondata_lab = comm.bcast(motiondata_lab, root=0)
+    vsk_keys = comm.bcast(vsk_keys, root=0)
+    if rank != 0:
+        vsk_val = np.empty(len(vsk_keys),dtype=np.float64)
+    comm.Bcast([vsk_val, MPI.DOUBLE], root=0)
+    vsk = dict(zip(vsk_keys,vsk_val))
+
+    #Every rank, the root too, calculates a contiguous part of the frames
+    nframes = shape[0]
+    markersize = shape[1]*3
+    counts,displs = pycgmCalc.splitFrames(nframes,rank_size)
+    if parallelread:
+        layout = comm.bcast(layout, root=0)
+        local = pycgmIO.loadC3DFrames(filename,layout,displs[rank],displs[rank]+counts[rank])
     else:
-        motionData_val_scatter = []
-        single_result = None
-        
-    motionData = comm.scatter(motionData_val_scatter, root=0)
-    vsk = comm.bcast(vsk, root=0)
-    static = comm.bcast(static, root=0)
-    motiondata_lab = comm.bcast(motiondata_lab,root=0)
- 
-    if rank !=0:     
-        #combine the values and labels back into a dict
-        motionData = pycgmIO.combineDataDict(motionData,motiondata_lab)
-        single_result=pycgmCalc.calcFramesMPI(motionData,vsk)
-
-    result_total = comm.gather(single_result,root=0)
-        
+        local = np.empty((counts[rank],shape[1],3),dtype=np.float64)
+        sendbuf = None
+        if rank == 0:
+            sendbuf = [motiondata_val, counts*markersize, displs*markersize, MPI.DOUBLE]
+        comm.Scatterv(sendbuf, [local, MPI.DOUBLE], root=0)
+
+    single_result = pycgmCalc.calcArrayMPI(motiondata_lab,local,vsk)
+
+    #The result is gathered straight into the array of all the frames
+    result = None
+    recvbuf = None
+    if rank == 0:
+        result = np.empty((nframes,pycgmCalc.EA),dtype=np.float64)
+        recvbuf = [result, counts*pycgmCalc.EA, displs*pycgmCalc.EA, MPI.DOUBLE]
+    comm.Gatherv([single_result, MPI.DOUBLE], recvbuf, root=0)
+
     if rank == 0:
-        results = np.asarray(result_total)[1:]
-        
-        #Put all angles in a list instead of separate arrays
-        angles = []
-        for i in results:
-            angles=angles+i
-        result = angles
-        
         #Check the time
         calculateAnglesTime=time.time()-calculateAnglesTime
         savaDataTime=time.time()
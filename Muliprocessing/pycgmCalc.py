@@ -117,57 +117,130 @@ def calcAngles(data,**kargs):
 		return r
 
 
-def multiCalc(start,end,data,nprocs,vsk):
+class CalcPool(object):
+	"""
+	Worker processes that are started once and used for the calculation
+	of many trials, so a batch does not start new processes for every trial.
+	The marker data and the vsk of a trial are put in a shared memory block
+	with writeToMem, and the workers attach to it with readFromMem from the
+	header they are sent, so only the header and the frame ranges are
+	pickled. Each worker writes the angles and axis of its frames into a
+	shared (frames, 273) array.
+	@param  nprocs Number of worker processes. By default one less than the
+	number of cpus
+	@param  frames Number of frames the shared output array is created for.
+	It is created again, with new workers, for a longer trial
+	"""
+	def __init__(self,nprocs=None,frames=10000):
+		if nprocs==None:
+			nprocs=max(multiprocessing.cpu_count()-1,1)
+		self.nprocs=nprocs
+		self.frames=0
+		self.trials=0
+		self.procs=[]
+		self.start(frames)
 
-	if nprocs == None:
-		nprocs = multiprocessing.cpu_count()-1
+	def start(self,frames):
+		"""Creates the shared output array and starts the workers"""
+		self.close()
+		self.frames=frames
+		self.outBuffer=multiprocessing.RawArray('d',frames*EA)
+		self.out=np.ctypeslib.as_array(self.outBuffer).reshape((frames,EA))
+		self.tasks=multiprocessing.Queue()
+		self.done=multiprocessing.Queue()
+		self.procs=[]
+		for i in range(self.nprocs):
+			ptemp=multiprocessing.Process(target=poolWorker,
+				args=(self.tasks,self.done,self.outBuffer))
+			ptemp.daemon=True
+			ptemp.start()
+			self.procs.append(ptemp)
 
-	results = multiprocessing.Queue()
-	labels=data[0]
-	motiondata=data[1]
-	l=len(motiondata)/nprocs
-	procs=[]
-	headers=[]
-	for i in range(nprocs):
-		start=i*l
-		end=(i+1)*l
-		if i==nprocs-1:
-			end=len(motiondata)
-		#Do this temporarily, then remove static totally
-		static=0
-		header=writeToMem((labels,motiondata[start:end]),static,vsk,i)
-		headers.append(header)
-		ptemp=multiprocessing.Process(target=calcFramesMulti, args=(header,results,i))
-		ptemp.daemon=True
-		ptemp.start()
-		procs.append(ptemp)
-
-	results=[results.get() for i in range(nprocs)]
-	results=sorted(results, key=lambda r: r[0])
-	results=[r[1] for r in results]
-
-	for ptemp in procs:
-		ptemp.join() 
-	angles = []
-	for i in results:
-		angles=angles+i
-
-	for header in headers:
+	def calc(self,labels,motiondata,vsk):
+		"""
+		Calculates the joint angles and axis of all the frames
+		@param  labels Marker names
+		@param  motiondata (frames, markers, 3) array of the marker positions
+		@param  vsk Vsk as a dictionary
+		@return (frames, 273) array. It is a copy, the shared array is
+		reused by the next trial
+		"""
+		nframes=len(motiondata)
+		if nframes>self.frames:
+			self.start(max(nframes,2*self.frames))
+		if type(vsk)==type({}):
+			vsk=splitVskDataDict(vsk)
+		self.trials+=1
+		header=writeToMem([labels,motiondata],None,vsk,self.trials)
 		try:
-			os.remove(header[0]['filename'])
+			l=nframes//self.nprocs
+			ranges=[]
+			for i in range(self.nprocs):
+				end=(i+1)*l
+				if i==self.nprocs-1:
+					end=nframes
+				ranges.append((i*l,end))
+				self.tasks.put((i*l,end,header))
+			errors=[self.done.get()[1] for r in ranges]
+		finally:
+			#only this process removes the block, once all the workers are done
+			freeMem(header)
+		errors=[e for e in errors if e!=None]
+		if len(errors)>0:
+			raise Exception("Calculation failed in a worker: "+errors[0])
+		return np.array(self.out[:nframes])
+
+	def close(self):
+		"""Stops the workers"""
+		for ptemp in self.procs:
+			self.tasks.put(None)
+		for ptemp in self.procs:
+			ptemp.join()
+		self.procs=[]
+
+def poolWorker(tasks,done,outBuffer):
+	out=np.ctypeslib.as_array(outBuffer).reshape((-1,EA))
+	while True:
+		task=tasks.get()
+		if task==None:
+			break
+		start,end,header=task
+		try:
+			#views of the block, nothing is copied or unpickled
+			motiondata,vsk=readFromMem(header)
+			labels,data=motiondata
+			for i in range(start,end):
+				frame=dict(zip(labels,data[i]))
+				out[i]=JointAngleCalc(frame,vsk)
+			done.put((start,None))
 		except Exception, e:
-			pass
-	return angles
+			done.put((start,repr(e)))
+		#the views are released so the block is unmapped
+		motiondata=labels=data=None
 
-def calcFramesMulti(header,result,index):
-	data,vsk=readFromMem(header)
-	angles=[]
+#Pool used by multiCalc, kept between calls
+pool=None
 
-	for frame in data:
-		angle = JointAngleCalc(frame,vsk)
-		angles.append(angle)
-	result.put([index,angles])
-	sys.exit()
+def getPool(nprocs=None):
+	"""
+	Returns the worker pool of multiCalc, which is started on the first call
+	and kept for the next trials. It is started again if nprocs changes
+	"""
+	global pool
+	if nprocs==None:
+		nprocs=max(multiprocessing.cpu_count()-1,1)
+	if pool==None or pool.nprocs!=nprocs:
+		if pool!=None:
+			pool.close()
+		pool=CalcPool(nprocs)
+	return pool
+
+def multiCalc(start,end,data,nprocs,vsk):
+	labels=data[0]
+	motiondata=data[1][start:end]
+	if type(vsk)!=type({}):
+		vsk=createVskDataDict(vsk[0],vsk[1])
+	return getPool(nprocs).calc(labels,motiondata,vsk)
 
 def singleCalc(start,end,data,vsk):
 
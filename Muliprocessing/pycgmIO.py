@@ -50,95 +50,88 @@ def createVskDataDict(labels,data):
 def splitVskDataDict(vsk):
 	return vsk.keys(),np.asarray(vsk.values())
 
+def memDirectory():
+	"""
+	Directory of the shared memory blocks. On Linux it is /dev/shm, which
+	is kept in memory, otherwise the temp directory
+	"""
+	if os.path.isdir('/dev/shm'):
+		return '/dev/shm'
+	return tempfile.gettempdir()
+
 def writeToMem(motiondata,static,vsk,counter,namePrefix="pycgm"):
-	#Get the binary from the obj
-	# p=pickle.dumps(obj)
-	motiondata_keys=json.dumps(motiondata[0])
-	motiondata_keys_size=len(motiondata_keys)
-
-	motiondata_data=motiondata[1].dumps()
-	motiondata_data_size=len(motiondata_data)
-
-	#Do this temporariliy because static should be gone
-	static = np.asarray([[0,0,0],[0,0,0]])
-	static_data_size=0
-	static_data=0
-	if type(static_data)!=type(None):
-		static_data=static.dumps()
-		static_data_size=len(static_data)
-
-	vsk_keys=0
-	vsk_keys_size=0
-	vsk_data=0
-	vsk_data_size=0
-	if type(vsk)!=type(None):
-		vsk_keys=json.dumps(vsk[0])
-		vsk_keys_size=len(vsk_keys)
-		vsk_data=vsk[1].dumps()
-		vsk_data_size=len(vsk_data)
-
-	#Get the size of the object to alocate in memory
-	# objsize=sys.getsizeof(p)
-	# objsize=len(p)
-	objsize=motiondata_keys_size+motiondata_data_size+static_data_size+vsk_keys_size+vsk_data_size
-	#Calculate the number of blocks in memory that need to be allocated
-	blocks=int(math.ceil(float(objsize)/mmap.PAGESIZE))
-	memsize=blocks*mmap.PAGESIZE
-	#Create a unique name
-	if platform.system()=='Linux':
-		filename=tempfile.gettempdir()+'/'+namePrefix+str(counter)+str(os.getpid())
-	else:
-		filename=tempfile.gettempdir()+'\\'+namePrefix+str(counter)+str(os.getpid())
-	# filename='./'+namePrefix+str(counter)+str(os.getpid())
-	#File descriptor for mmap
-	fd = os.open(filename, os.O_CREAT | os.O_TRUNC | os.O_RDWR)
-	#Make sure the memory is allocated
-	assert os.write(fd, '\x00' * memsize) == memsize
-	#Map the file to memory
-	buff = None
-	if platform.system()=='Linux':
-		buf = mmap.mmap(fd, memsize, mmap.MAP_SHARED,access=mmap.ACCESS_WRITE)
-	else:
-		buf = mmap.mmap(fd, memsize,access=mmap.ACCESS_WRITE)
-	#Put the data
-	buf.seek(0)
-	buf.write(motiondata_keys)
-	buf.write(motiondata_data)
-	if type(static_data)!=type(None):
-		buf.write(static_data)
+	"""
+	Puts the marker positions and the vsk in a named shared memory block
+	@param  motiondata Labels and (frames, markers, 3) array of the markers
+	@param  static Not used
+	@param  vsk Labels and values of the vsk, or None
+	@param  counter Number added to the name of the block
+	@return Header to give to readFromMem, a small dictionary with the
+	name of the block and the shape, dtype and labels of the arrays in it.
+	The process that writes the block removes it with freeMem
+	"""
+	labels=[str(label.rstrip()) for label in motiondata[0]]
+	data=np.asarray(motiondata[1],dtype=np.float64)
+	vsk_keys=[]
+	vsk_data=np.zeros(0)
 	if type(vsk)!=type(None):
-		buf.write(vsk_keys)
-		buf.write(vsk_data)
-	buf.seek(0)
+		vsk_keys=list(vsk[0])
+		vsk_data=np.asarray(vsk[1],dtype=np.float64)
+
+	#the vsk values are after the marker data, 8 byte aligned
+	memsize=max(data.nbytes+vsk_data.nbytes,1)
+	filename=os.path.join(memDirectory(),namePrefix+str(counter)+'_'+str(os.getpid()))
+	fd=os.open(filename,os.O_CREAT|os.O_TRUNC|os.O_RDWR,0o600)
+	try:
+		#sets the size without writing zeros to the file
+		os.ftruncate(fd,memsize)
+		buf=mmap.mmap(fd,memsize,access=mmap.ACCESS_WRITE)
+	finally:
+		os.close(fd)
+	shared=np.frombuffer(buf,dtype=np.float64,count=data.size).reshape(data.shape)
+	shared[...]=data
+	np.frombuffer(buf,dtype=np.float64,count=vsk_data.size,offset=data.nbytes)[:]=vsk_data
+	del shared
 	buf.close()
-	os.close(fd)
-	header={'filename':filename,'memsize':memsize,'objsize':
-		[motiondata_keys_size,motiondata_data_size,static_data_size,vsk_keys_size,vsk_data_size]}
+	header={'filename':filename,'memsize':memsize,'dtype':'float64',
+		'shape':list(data.shape),'labels':labels,'vsk_keys':vsk_keys}
 	return [header]
 
 def readFromMem(header):
+	"""
+	Attaches to a block written by writeToMem
+	@param  header Header returned by writeToMem
+	@return [motiondata,vsk] where motiondata is the labels and a read only
+	(frames, markers, 3) array that is a view of the shared memory, and vsk
+	is a dictionary or None. The block is not removed
+	"""
 	header=header[0]
-	temp=''
-	fd=os.open(header['filename'], os.O_RDONLY)
-	buf=mmap.mmap(fd, header['memsize'],access=mmap.ACCESS_READ)
-
-	motiondata_keys=json.loads(buf.read(header['objsize'][0]))
-	motiondata_data=np.loads(buf.read(header['objsize'][1]))
-	static_data=None
-	if header['objsize'][2]!=0:
-		static_data=np.loads(buf.read(header['objsize'][2]))
+	fd=os.open(header['filename'],os.O_RDONLY)
+	try:
+		buf=mmap.mmap(fd,header['memsize'],access=mmap.ACCESS_READ)
+	finally:
+		os.close(fd)
+	shape=tuple(header['shape'])
+	count=int(np.prod(shape))
+	data=np.frombuffer(buf,dtype=header['dtype'],count=count).reshape(shape)
 	vsk=None
-	if header['objsize'][3]!=0 and header['objsize'][4]!=0:
-		vsk_keys=json.loads(buf.read(header['objsize'][3]))
-		vsk_data=np.loads(buf.read(header['objsize'][4]))
-		vsk=createVskDataDict(vsk_keys,vsk_data)
-
-	motiondata=createMotionDataDict(motiondata_keys,motiondata_data)
+	if len(header['vsk_keys'])>0:
+		vsk_data=np.frombuffer(buf,dtype=header['dtype'],
+			count=len(header['vsk_keys']),offset=data.nbytes)
+		vsk=createVskDataDict(header['vsk_keys'],vsk_data)
+	return [[header['labels'],data],vsk]
+
+def freeMem(header):
+	"""
+	Removes a block written by writeToMem. Views that are already attached
+	stay valid until they are deleted
+	"""
 	try:
-		os.remove(header['filename'])
-	except Exception, e:
-		pass
-	return [motiondata,vsk]
+		os.remove(header[0]['filename'])
+	except OSError as e:
+		if e.errno!=errno.ENOENT:
+			raise
+
 def loadC3D(filename):
     #Calls the py c3d file
     reader = c3d.Reader(open(filename, 'rb'))
@@ -33,6 +33,17 @@ PROCESSOR_INTEL = 84
 PROCESSOR_DEC = 85
 PROCESSOR_MIPS = 86
 
+# number of bits set in each byte value, used to count the cameras that
+# observed a point from the camera-observation byte.
+CAMERA_COUNT = np.array([bin(i).count('1') for i in range(256)], np.int8)
+
+
+def _encode(value):
+    '''Return the bytes of a name, description or string parameter.'''
+    if isinstance(value, str):
+        return value.encode('utf-8')
+    return value
+
 
 class Header(object):
     '''Header information from a C3D file.
@@ -129,10 +140,10 @@ class Header(object):
                                  self.data_block,
                                  self.sample_per_frame,
                                  self.frame_rate,
-                                 '',
+                                 b'',
                                  self.long_event_labels and 0x3039 or 0x0,
                                  self.label_block,
-                                 ''))
+                                 b''))
 
     def __str__(self):
         '''Return a string representation of this Header's attributes.'''
@@ -214,8 +225,10 @@ class Param(object):
                  desc='',
                  bytes_per_element=1,
                  dimensions=None,
-                 bytes='',
-                 handle=None):
+                 bytes=b'',
+                 handle=None,
+                 buffer=None,
+                 offset=0):
         '''Set up a new parameter with at least a name.
 
         name : str
@@ -234,7 +247,14 @@ class Param(object):
         handle : file handle, optional
             If provided, the data for the parameter will be read from this
             file handle. The handle must be readable.
+        buffer : buffer, optional
+            If provided, the parameter is read from this buffer of the
+            parameter section, starting at offset. The data and description
+            are only copied out of the buffer when they are first used.
+        offset : int, optional
+            Position of the parameter in buffer, after its name.
         '''
+        self._buffer = None
         self.name = name
         self.desc = desc
         self.bytes_per_element = bytes_per_element
@@ -243,6 +263,34 @@ class Param(object):
 
         if handle:
             self.read(handle)
+        elif buffer is not None:
+            self.read_buffer(buffer, offset)
+
+    @property
+    def bytes(self):
+        '''Raw data for this parameter.'''
+        if self._buffer is not None:
+            self._load()
+        return self._bytes
+
+    @bytes.setter
+    def bytes(self, value):
+        if self._buffer is not None:
+            self._load()
+        self._bytes = value
+
+    @property
+    def desc(self):
+        '''Brief description of this parameter.'''
+        if self._buffer is not None:
+            self._load()
+        return self._desc
+
+    @desc.setter
+    def desc(self, value):
+        if self._buffer is not None:
+            self._load()
+        self._desc = value
 
     def __repr__(self):
         return '<Param: {}>'.format(self.desc)
@@ -280,15 +328,15 @@ class Param(object):
             An open, writable, binary file handle.
         '''
         handle.write(struct.pack('bb', len(self.name), group_id))
-        handle.write(self.name)
+        handle.write(_encode(self.name))
         handle.write(struct.pack('<h', self.binary_size() - 2 - len(self.name)))
         handle.write(struct.pack('b', self.bytes_per_element))
         handle.write(struct.pack('B', len(self.dimensions)))
         handle.write(struct.pack('B' * len(self.dimensions), *self.dimensions))
         if self.bytes:
-            handle.write(self.bytes)
+            handle.write(_encode(self.bytes))
         handle.write(struct.pack('B', len(self.desc)))
-        handle.write(self.desc)
+        handle.write(_encode(self.desc))
 
     def read(self, handle):
         '''Read binary data for this parameter from a file handle.
@@ -299,12 +347,32 @@ class Param(object):
         self.bytes_per_element, = struct.unpack('b', handle.read(1))
         dims, = struct.unpack('B', handle.read(1))
         self.dimensions = [struct.unpack('B', handle.read(1))[0] for _ in range(dims)]
-        self.bytes = ''
+        self.bytes = b''
         if self.total_bytes:
             self.bytes = handle.read(self.total_bytes)
         size, = struct.unpack('B', handle.read(1))
         self.desc = size and handle.read(size).decode('utf-8') or ''
 
+    def read_buffer(self, buffer, offset):
+        '''Read this parameter from a buffer of the parameter section.
+
+        Only the element size and the dimensions are unpacked here, the data
+        and the description are decoded from the buffer when first used.
+        '''
+        self.bytes_per_element, dims = struct.unpack_from('bB', buffer, offset)
+        self.dimensions = list(struct.unpack_from('B' * dims, buffer, offset + 2))
+        self._buffer = buffer
+        self._offset = offset + 2 + dims
+
+    def _load(self):
+        '''Decode the data and description of a parameter read by read_buffer.'''
+        buffer, offset = self._buffer, self._offset
+        self._buffer = None
+        end = offset + self.total_bytes
+        self._bytes = bytes(buffer[offset:end])
+        size, = struct.unpack_from('B', buffer, end)
+        self._desc = size and bytes(buffer[end + 1:end + 1 + size]).decode('utf-8') or ''
+
     def _as(self, fmt):
         '''Unpack the raw bytes of this param using the given struct format.'''
         return struct.unpack('<' + fmt, self.bytes)[0]
@@ -354,7 +422,7 @@ class Param(object):
         assert self.dimensions, \
             '{}: cannot get value as {} array!'.format(self.name, fmt)
         elems = array.array(fmt)
-        elems.fromstring(self.bytes)
+        elems.frombytes(self.bytes or b'')
         return np.array(elems).reshape(self.dimensions)
 
     @property
@@ -455,10 +523,10 @@ class Group(dict):
             An open, writable, binary file handle.
         '''
         handle.write(struct.pack('bb', len(self.name), -group_id))
-        handle.write(self.name)
+        handle.write(_encode(self.name))
         handle.write(struct.pack('<h', 3 + len(self.desc)))
         handle.write(struct.pack('B', len(self.desc)))
-        handle.write(self.desc)
+        handle.write(_encode(self.desc))
         for param in list(self.values()):
             param.write(group_id, handle)
 
@@ -695,6 +763,28 @@ class Manager(dict):
     def analog_frame_rate(self):
         return self.get_float('ANALOG:RATE')
 
+    def point_labels(self):
+        '''Return the names of the points.
+
+        Files with more than 255 points have the names of the others in
+        POINT:LABELS2, POINT:LABELS3, ...
+        '''
+        labels = []
+        param = self.get('POINT:LABELS')
+        i = 1
+        while param is not None:
+            labels.extend(label.rstrip() for label in param.string_array)
+            i += 1
+            param = self.get('POINT:LABELS{}'.format(i))
+        return labels[:self.points_per_frame()]
+
+    def analog_labels(self):
+        '''Return the names of the analog channels.'''
+        param = self.get('ANALOG:LABELS')
+        if param is None:
+            return ['A%03d' % i for i in range(self.analog_per_frame())]
+        return [label.strip() for label in param.string_array][:self.analog_per_frame()]
+
     def first_frame(self):
         # this is a hack for phasespace files ... should put it in a subclass.
         param = self.get('TRIAL:ACTUAL_START_FIELD')
@@ -753,31 +843,32 @@ class Reader(Manager):
                 format(processor))
 
         # read all parameter blocks as a single chunk to avoid block
-        # boundary issues.
-        bytes = self._handle.read(512 * parameter_blocks - 4)
-        while bytes:
-            buf = io.BytesIO(bytes)
-
-            chars_in_name, group_id = struct.unpack('bb', buf.read(2))
+        # boundary issues, and walk through it with an offset.
+        data = memoryview(self._handle.read(512 * parameter_blocks - 4))
+        offset = 0
+        while offset + 2 <= len(data):
+            chars_in_name, group_id = struct.unpack_from('bb', data, offset)
             if group_id == 0 or chars_in_name == 0:
                 # we've reached the end of the parameter section.
                 break
 
-            name = buf.read(abs(chars_in_name)).decode('utf-8').upper()
-            offset_to_next, = struct.unpack('<h', buf.read(2))
+            start = offset + 2 + abs(chars_in_name)
+            name = bytes(data[offset + 2:start]).decode('utf-8').upper()
+            offset_to_next, = struct.unpack_from('<h', data, start)
 
             if group_id > 0:
                 # we've just started reading a parameter. if its group doesn't
                 # exist, create a blank one. add the parameter to the group.
-                self.setdefault(group_id, Group()).add_param(name, handle=buf)
+                self.setdefault(group_id, Group()).add_param(
+                    name, buffer=data, offset=start + 2)
             else:
                 # we've just started reading a group. if a group with the
                 # appropriate id exists already (because we've already created
                 # it for a parameter), just set the name of the group.
                 # otherwise, add a new group.
                 group_id = abs(group_id)
-                size, = struct.unpack('B', buf.read(1))
-                desc = size and buf.read(size).decode('utf-8') or ''
+                size, = struct.unpack_from('B', data, start + 2)
+                desc = size and bytes(data[start + 3:start + 3 + size]).decode('utf-8') or ''
                 group = self.get(group_id)
                 if group is not None:
                     group.name = name
@@ -787,10 +878,44 @@ class Reader(Manager):
                     try: self.add_group(group_id, name, desc)
                     except: print("C3D Conflict of Information: ",group_id,name,desc)
 
-            bytes = bytes[2 + abs(chars_in_name) + offset_to_next:]
+            if offset_to_next <= 0:
+                # the last parameter of the section.
+                break
+            offset = start + offset_to_next
 
         self.check_metadata()
 
+    def _analog_format(self):
+        '''Return the data type, offsets, scales and general scale of the
+        analog channels.'''
+        apf = self.analog_per_frame()
+
+        # TODO: handle ANALOG:BITS parameter here!
+        p = self.get('ANALOG:FORMAT')
+        analog_unsigned = p and p.string_value.strip().upper() == 'UNSIGNED'
+        analog_dtype = np.int16
+        if self.scale_factor() < 0:
+            analog_dtype = np.float32
+        elif analog_unsigned:
+            analog_dtype = np.uint16
+
+        offsets = np.zeros((apf, ), int)
+        param = self.get('ANALOG:OFFSET')
+        if param is not None:
+            offsets = param.int16_array[:apf]
+
+        scales = np.ones((apf, ), float)
+        param = self.get('ANALOG:SCALE')
+        if param is not None:
+            scales = param.float_array[:apf]
+
+        gen_scale = 1.
+        param = self.get('ANALOG:GEN_SCALE')
+        if param is not None:
+            gen_scale = param.float_value
+
+        return analog_dtype, offsets, scales, gen_scale
+
     def read_frames(self, copy=True,onlyXYZ=False):
         '''Iterate over the data frames from our C3D file handle.
 
@@ -837,31 +962,9 @@ class Reader(Manager):
             dim=3
         points = np.zeros((ppf, dim), float)
 
-        # TODO: handle ANALOG:BITS parameter here!
-        p = self.get('ANALOG:FORMAT')
-        analog_unsigned = p and p.string_value.strip().upper() == 'UNSIGNED'
-        analog_dtype = np.int16
-        if is_float:
-            analog_dtype = np.float32
-        elif analog_unsigned:
-            analog_dtype = np.uint16
+        analog_dtype, offsets, scales, gen_scale = self._analog_format()
         analog = np.array([], float)
 
-        offsets = np.zeros((apf, ), int)
-        param = self.get('ANALOG:OFFSET')
-        if param is not None:
-            offsets = param.int16_array[:apf]
-
-        scales = np.ones((apf, ), float)
-        param = self.get('ANALOG:SCALE')
-        if param is not None:
-            scales = param.float_array[:apf]
-
-        gen_scale = 1.
-        param = self.get('ANALOG:GEN_SCALE')
-        if param is not None:
-            gen_scale = param.float_value
-
         self._handle.seek((self.header.data_block - 1) * 512)
         for frame_no in range(self.first_frame(), self.last_frame() + 1):
             raw = np.fromfile(self._handle, dtype=point_dtype,
@@ -880,7 +983,7 @@ class Reader(Manager):
                 points[valid, 3] = (c & 0xff).astype(float) * scale
 
                 # fifth value is number of bits set in camera-observation byte
-                points[valid, 4] = sum((c & (1 << k)) >> k for k in range(8, 17))
+                points[valid, 4] = CAMERA_COUNT[c >> 8]
 
             if self.header.analog_count > 0:
                 raw = np.fromfile(self._handle, dtype=analog_dtype,
@@ -892,6 +995,166 @@ class Reader(Manager):
             else:
                 yield frame_no, points, analog
 
+    def map_frames(self):
+        '''Memory-map the data block of our C3D file.
+
+        The data of every frame is at a fixed offset from the start of the
+        data block, so the file is mapped as an array with one row of raw
+        (unscaled) values per frame. Only the parts of the file that are
+        used are read from disk, so a range of frames can be decoded from a
+        large file without reading the other frames.
+
+        Returns
+        -------
+        A read-only numpy memmap of shape (frames, words), where each row has
+        the 4 values of every point followed by the analog samples of that
+        frame. Frames missing from a truncated file are left out.
+
+        Raises
+        ------
+        ValueError, if the handle is not a file on disk, such as an in-memory
+        buffer.
+        '''
+        scale = self.scale_factor()
+        point_dtype = np.dtype([np.int16, np.float32][scale < 0])
+        frame_words = 4 * self.header.point_count + self.header.analog_count
+        frame_bytes = frame_words * point_dtype.itemsize
+        offset = (self.header.data_block - 1) * 512
+
+        self._handle.seek(0, 2)
+        size = self._handle.tell() - offset
+        frames = self.last_frame() - self.first_frame() + 1
+        frames = max(min(frames, size // frame_bytes if frame_bytes else 0), 0)
+        if frames == 0:
+            return np.zeros((0, frame_words), point_dtype)
+        return np.memmap(self._handle, dtype=point_dtype, mode='r',
+                         offset=offset, shape=(frames, frame_words))
+
+    def _raw_frames(self, start=0, end=None):
+        '''Return the raw (frames, words) data of a range of frames.
+
+        The rows are slices of `map_frames()`, or are read from the handle
+        when it is not a file on disk.
+        '''
+        try:
+            data = self.map_frames()
+        except (AttributeError, IOError, ValueError):
+            # the handle is not a file on disk, read the frames instead.
+            data = None
+        start = max(start, 0)
+        if data is not None:
+            return data[start:end]
+
+        frame_words = 4 * self.header.point_count + self.header.analog_count
+        point_dtype = np.dtype([np.int16, np.float32][self.scale_factor() < 0])
+        frames = self.last_frame() - self.first_frame() + 1
+        if end is None or end > frames:
+            end = frames
+        count = max(end - start, 0)
+
+        self._handle.seek((self.header.data_block - 1) * 512 +
+                          start * frame_words * point_dtype.itemsize)
+        raw = np.frombuffer(self._handle.read(count * frame_words * point_dtype.itemsize),
+                            dtype=point_dtype)
+        # a truncated file has fewer frames than the header says.
+        count = len(raw) // frame_words
+        return raw[:count * frame_words].reshape((count, frame_words))
+
+    def read_analog(self, start=0, end=None):
+        '''Read the analog data of a range of frames from our C3D file handle.
+
+        The analog samples of all the frames are taken from the file as one
+        strided view, which skips the point data, and are scaled with array
+        operations, instead of one frame at a time as in `read_frames()`.
+
+        Arguments
+        ---------
+        start : int
+            Index of the first (point) frame to read, counting from 0 for the
+            first frame in the file. The default is 0.
+
+        end : int
+            Index after the last frame to read. The default is None, which
+            reads to the end of the file.
+
+        Returns
+        -------
+        An array of shape (samples, channels) with the analog values, with
+        the ANALOG:OFFSET, ANALOG:SCALE and ANALOG:GEN_SCALE parameters
+        applied. Each frame has `analog_frame_rate() / frame_rate()` samples
+        of every channel. The channel names are given by `analog_labels()`.
+        '''
+        apf = self.analog_per_frame()
+        if apf == 0 or self.header.analog_count == 0:
+            return np.zeros((0, apf), float)
+        analog_dtype, offsets, scales, gen_scale = self._analog_format()
+
+        raw = self._raw_frames(start, end)[:, 4 * self.header.point_count:]
+        # the analog words have the same size as the point words.
+        raw = raw.view(analog_dtype).astype(float).reshape((-1, apf))
+        return (raw - offsets) * scales * gen_scale
+
+    def read_points(self, start=0, end=None, residuals=False, cameras=False):
+        '''Read the point data of a range of frames from our C3D file handle.
+
+        All the frames are read from the file in a single call and decoded
+        with array operations, instead of one frame at a time as in
+        `read_frames()`. The analog data stored between the frames is skipped.
+
+        Arguments
+        ---------
+        start : int
+            Index of the first frame to read, counting from 0 for the first
+            frame in the file. The default is 0.
+
+        end : int
+            Index after the last frame to read. The default is None, which
+            reads to the end of the file.
+
+        residuals : bool
+            If True, also return the error estimate of each point.
+
+        cameras : bool
+            If True, also return the number of cameras that observed each
+            point.
+
+        Returns
+        -------
+        An array of shape (frames, points, 3) with the (x, y, z) coordinates
+        of each point, which are NaN where the point is invalid. If residuals
+        or cameras is True, a tuple of this array followed by the requested
+        (frames, points) arrays of error estimates and camera counts, which
+        are -1 where the point is invalid.
+        '''
+        ppf = self.points_per_frame()
+
+        scale = abs(self.scale_factor())
+        is_float = self.scale_factor() < 0
+        point_scale = [scale, 1][is_float]
+
+        raw = self._raw_frames(start, end)
+        raw = raw[:, :4 * ppf].reshape((len(raw), ppf, 4))
+
+        points = raw[:, :, :3].astype(float) * point_scale
+        valid = raw[:, :, 3] > -1
+        points[~valid] = np.nan
+        if not residuals and not cameras:
+            return points
+
+        result = [points]
+        c = np.where(valid, raw[:, :, 3], 0).astype(np.uint16)
+        if residuals:
+            # fourth value is floating-point (scaled) error estimate
+            error = (c & 0xff).astype(float) * scale
+            error[~valid] = -1
+            result.append(error)
+        if cameras:
+            # number of bits set in camera-observation byte
+            observed = CAMERA_COUNT[c >> 8]
+            observed[~valid] = -1
+            result.append(observed)
+        return tuple(result)
+
 
 class Writer(Manager):
     '''This class manages the task of writing metadata and frames to a C3D file.
@@ -920,7 +1183,7 @@ class Writer(Manager):
         '''Pad the file with 0s to the end of the next block boundary.'''
         extra = self._handle.tell() % 512
         if extra:
-            self._handle.write('\x00' * (512 - extra))
+            self._handle.write(b'\x00' * (512 - extra))
 
     def write_metadata(self):
         '''Write metadata for this file to our file handle.'''
@@ -940,7 +1203,7 @@ class Writer(Manager):
         # padding
         self._pad_block()
         while self._handle.tell() != 512 * (self.header.data_block - 1):
-            self._handle.write('\x00' * 512)
+            self._handle.write(b'\x00' * 512)
 
     def write_frames(self, frames):
         '''Write the given list of frame data to our file handle.
@@ -960,6 +1223,141 @@ class Writer(Manager):
             analog.tofile(self._handle)
         self._pad_block()
 
+    def add_point_groups(self, labels, frame_rate,
+                         descriptions=None,
+                         point_units='mm  ',
+                         ):
+        '''Add the POINT, ANALOG and TRIAL groups for a file of points only.
+
+        More parameters can be added to the groups before the file is
+        written with `write_points()`.
+
+        Arguments
+        ---------
+        labels : list of str
+            Name of each point, in the order of the point data. The names
+            after the first 255 are written to POINT:LABELS2, LABELS3, ...
+        frame_rate : float
+            The frame rate of the data.
+        descriptions : list of str, optional
+            Description of each point. The default is blank descriptions.
+        point_units : str
+            The units that the point numbers represent.
+
+        Returns
+        -------
+        The POINT `Group`.
+        '''
+        ppf = len(labels)
+        if ppf > 65535:
+            raise ValueError('{} points, at most 65535 can be written'.format(ppf))
+        width = max([len(label) for label in labels] + [1])
+        if descriptions is None:
+            descriptions = [''] * ppf
+        desc_width = max([len(desc) for desc in descriptions] + [1])
+
+        point_group = self.add_group(1, 'POINT', 'POINT group')
+        point_group.add_param('USED', desc='Number of 3d markers',
+                              bytes_per_element=2,
+                              bytes=struct.pack('<H', ppf))
+        point_group.add_param('FRAMES', desc='frame count',
+                              bytes_per_element=2,
+                              bytes=struct.pack('<H', 0))
+        point_group.add_param('DATA_START', desc='data block number',
+                              bytes_per_element=2,
+                              bytes=struct.pack('<H', 0))
+        point_group.add_param('SCALE', desc='3d scale factor',
+                              bytes_per_element=4,
+                              bytes=struct.pack('<f', -1.0))
+        point_group.add_param('RATE', desc='3d data capture rate',
+                              bytes_per_element=4,
+                              bytes=struct.pack('<f', frame_rate))
+        point_group.add_param('UNITS', desc='3d data units',
+                              bytes_per_element=-1,
+                              dimensions=[len(point_units)],
+                              bytes=point_units)
+        # a dimension is one byte, so the labels of points after the first
+        # 255 are in LABELS2, LABELS3, ... and the same for DESCRIPTIONS
+        for i in range(0, max(ppf, 1), 255):
+            suffix = str(i // 255 + 1) if i else ''
+            point_group.add_param('LABELS' + suffix, desc='labels',
+                                  bytes_per_element=-1,
+                                  dimensions=[width, len(labels[i:i+255])],
+                                  bytes=''.join(label.ljust(width) for label in labels[i:i+255]))
+            point_group.add_param('DESCRIPTIONS' + suffix, desc='descriptions',
+                                  bytes_per_element=-1,
+                                  dimensions=[desc_width, len(descriptions[i:i+255])],
+                                  bytes=''.join(desc.ljust(desc_width) for desc in descriptions[i:i+255]))
+
+        analog_group = self.add_group(2, 'ANALOG', 'ANALOG group')
+        analog_group.add_param('USED', desc='analog channel count',
+                               bytes_per_element=2,
+                               bytes=struct.pack('<H', 0))
+        analog_group.add_param('RATE', desc='analog frame rate',
+                               bytes_per_element=4,
+                               bytes=struct.pack('<f', 0))
+        analog_group.add_param('LABELS', desc='labels',
+                               bytes_per_element=-1,
+                               dimensions=[1, 0])
+        analog_group.add_param('DESCRIPTIONS', desc='descriptions',
+                               bytes_per_element=-1,
+                               dimensions=[1, 0])
+
+        trial_group = self.add_group(3, 'TRIAL', 'TRIAL group')
+        trial_group.add_param('ACTUAL_START_FIELD', desc='actual start frame',
+                              bytes_per_element=2,
+                              dimensions=[2],
+                              bytes=struct.pack('<I', 1))
+        trial_group.add_param('ACTUAL_END_FIELD', desc='actual end frame',
+                              bytes_per_element=2,
+                              dimensions=[2],
+                              bytes=struct.pack('<I', 0))
+        return point_group
+
+    def write_points(self, points, block=4096):
+        '''Write the metadata and an array of point data to our file handle.
+
+        The groups are added first with `add_point_groups()`. The frame
+        count and the position of the data are filled in here, and the
+        points are written as floats `block` frames at a time instead of
+        one frame at a time as in `write_frames()`.
+
+        Arguments
+        ---------
+        points : array
+            An array of shape (frames, points, 3) with the (x, y, z)
+            coordinates of each point. Points with a NaN coordinate are
+            written as invalid.
+        block : int
+            Number of frames converted and written in each call.
+        '''
+        points = np.asarray(points, dtype=float)
+        frame_count = len(points)
+        self['POINT:FRAMES'].bytes = struct.pack('<H', min(65535, frame_count))
+        self['TRIAL:ACTUAL_END_FIELD'].bytes = struct.pack('<I', frame_count)
+
+        # sync parameter information to header.
+        blocks = self.parameter_blocks()
+        self['POINT:DATA_START'].bytes = struct.pack('<H', 2 + blocks)
+
+        self.header.data_block = 2 + blocks
+        self.header.frame_rate = self.frame_rate()
+        self.header.last_frame = min(frame_count, 65535)
+        self.header.point_count = self.points_per_frame()
+        self.header.analog_count = 0
+        self.header.scale_factor = self.scale_factor()
+
+        self.write_metadata()
+        for start in range(0, frame_count, block):
+            p = points[start:start + block]
+            valid = ~np.isnan(p).any(axis=2)
+            # the fourth value is the (zero) residual, or -1 if invalid
+            raw = np.zeros(p.shape[:2] + (4,), dtype='<f4')
+            raw[:, :, :3][valid] = p[valid]
+            raw[:, :, 3][~valid] = -1
+            self._handle.write(raw.tobytes())
+        self._pad_block()
+
     def write_like_phasespace(self, frames, frame_count,
                               point_frame_rate=480.0,
                               analog_frame_rate=0.0,
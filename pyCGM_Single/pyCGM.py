@@ -205,27 +205,31 @@ def hipJointCenter(frame,pel_origin,pel_x,pel_y,pel_z,vsk=None):
     #Half of marker size
     mm = 7.0
 
-    MeanLegLength = vsk['MeanLegLength']
-    R_AsisToTrocanterMeasure = vsk['R_AsisToTrocanterMeasure']
-    L_AsisToTrocanterMeasure = vsk['L_AsisToTrocanterMeasure']
-    interAsisMeasure = vsk['InterAsisDistance']
-    C = ( MeanLegLength * 0.115 ) - 15.3
-    theta = 0.500000178813934
-    beta = 0.314000427722931
-    aa = interAsisMeasure/2.0
-    S = -1
-
-    # Hip Joint Center Calculation (ref. Davis_1991)
-    
-    # Left: Calculate the distance to translate along the pelvis axis
-    L_Xh = (-L_AsisToTrocanterMeasure - mm) * cos(beta) + C * cos(theta) * sin(beta)
-    L_Yh = S*(C*sin(theta)- aa)
-    L_Zh = (-L_AsisToTrocanterMeasure - mm) * sin(beta) - C * cos(theta) * cos(beta)
-    
-    # Right:  Calculate the distance to translate along the pelvis axis
-    R_Xh = (-R_AsisToTrocanterMeasure - mm) * cos(beta) + C * cos(theta) * sin(beta)
-    R_Yh = (C*sin(theta)- aa)
-    R_Zh = (-R_AsisToTrocanterMeasure - mm) * sin(beta) - C * cos(theta) * cos(beta)
+    if isinstance(vsk,SubjectModel):
+        L_Xh,L_Yh,L_Zh,R_Xh,R_Yh,R_Zh = vsk.hipOffsets
+    else:
+        MeanLegLength = vsk['MeanLegLength']
+        R_AsisToTrocanterMeasure = vsk['R_AsisToTrocanterMeasure']
+        L_AsisToTrocanterMeasure = vsk['L_AsisToTrocanterMeasure']
+        interAsisMeasure = vsk['InterAsisDistance']
+        C = ( MeanLegLength * 0.115 ) - 15.3
+        theta = 0.500000178813934
+        beta = 0.314000427722931
+        aa = interAsisMeasure/2.0
+        S = -1
+
+        # Hip Joint Center Calculation (ref. Davis_1991)
+    
+        # Left: Calculate the distance to translate along the pelvis axis
+        L_Xh = (-L_AsisToTrocanterMeasure - mm) * cos(beta) + C * cos(theta) * sin(beta)
+        L_Yh = S*(C*sin(theta)- aa)
+        L_Zh = (-L_AsisToTrocanterMeasure - mm) * sin(beta) - C * cos(theta) * cos(beta)
+    
+        # Right:  Calculate the distance to translate along the pelvis axis
+        R_Xh = (-R_AsisToTrocanterMeasure - mm) * cos(beta) + C * cos(theta) * sin(beta)
+        R_Yh = (C*sin(theta)- aa)
+        R_Zh = (-R_AsisToTrocanterMeasure - mm) * sin(beta) - C * cos(theta) * cos(beta)
+    
     
     # get the unit pelvis axis
     pelvis_xaxis = pel_x-pel_origin
@@ -378,11 +382,14 @@ def kneeJointCenter(frame,hip_JC,delta,vsk=None):
     
 
     #Get Global Values
-    mm = 7.0
-    R_kneeWidth = vsk['RightKneeWidth']
-    L_kneeWidth = vsk['LeftKneeWidth']
-    R_delta = (R_kneeWidth/2.0)+mm
-    L_delta = (L_kneeWidth/2.0)+mm
+    if isinstance(vsk,SubjectModel):
+        R_delta,L_delta = vsk.kneeDelta
+    else:
+        mm = 7.0
+        R_kneeWidth = vsk['RightKneeWidth']
+        L_kneeWidth = vsk['LeftKneeWidth']
+        R_delta = (R_kneeWidth/2.0)+mm
+        L_delta = (L_kneeWidth/2.0)+mm
     
     #REQUIRED MARKERS: 
     # RTHI
@@ -538,13 +545,19 @@ def ankleJointCenter(frame,knee_JC,delta,vsk=None):
     """
     
     #Get Global Values
-    R_ankleWidth = vsk['RightAnkleWidth']
-    L_ankleWidth = vsk['LeftAnkleWidth']
-    R_torsion = vsk['RightTibialTorsion']
-    L_torsion = vsk['LeftTibialTorsion']
-    mm = 7.0
-    R_delta = ((R_ankleWidth)/2.0)+mm
-    L_delta = ((L_ankleWidth)/2.0)+mm
+    if isinstance(vsk,SubjectModel):
+        R_delta,L_delta = vsk.ankleDelta
+        R_torsion_cos,R_torsion_sin,L_torsion_cos,L_torsion_sin = vsk.tibialTorsion
+    else:
+        R_ankleWidth = vsk['RightAnkleWidth']
+        L_ankleWidth = vsk['LeftAnkleWidth']
+        R_torsion = np.radians(vsk['RightTibialTorsion'])
+        L_torsion = np.radians(vsk['LeftTibialTorsion'])
+        mm = 7.0
+        R_delta = ((R_ankleWidth)/2.0)+mm
+        L_delta = ((L_ankleWidth)/2.0)+mm
+        R_torsion_cos,R_torsion_sin = math.cos(R_torsion),math.sin(R_torsion)
+        L_torsion_cos,L_torsion_sin = math.cos(L_torsion),math.sin(L_torsion)
  
     #REQUIRED MARKERS: 
     # tib_R
@@ -632,23 +645,21 @@ def ankleJointCenter(frame,knee_JC,delta,vsk=None):
     Laxis = [L_ankle_x_axis,L_ankle_y_axis,L_ankle_z_axis]
     
     # Rotate the axes about the tibia torsion.
-    R_torsion = np.radians(R_torsion)
-    L_torsion = np.radians(L_torsion)
-    
-    Raxis = [[math.cos(R_torsion)*Raxis[0][0]-math.sin(R_torsion)*Raxis[1][0],
-            math.cos(R_torsion)*Raxis[0][1]-math.sin(R_torsion)*Raxis[1][1],
-            math.cos(R_torsion)*Raxis[0][2]-math.sin(R_torsion)*Raxis[1][2]],
-            [math.sin(R_torsion)*Raxis[0][0]+math.cos(R_torsion)*Raxis[1][0],
-            math.sin(R_torsion)*Raxis[0][1]+math.cos(R_torsion)*Raxis[1][1],
-            math.sin(R_torsion)*Raxis[0][2]+math.cos(R_torsion)*Raxis[1][2]],
+    
+    Raxis = [[R_torsion_cos*Raxis[0][0]-R_torsion_sin*Raxis[1][0],
+            R_torsion_cos*Raxis[0][1]-R_torsion_sin*Raxis[1][1],
+            R_torsion_cos*Raxis[0][2]-R_torsion_sin*Raxis[1][2]],
+            [R_torsion_sin*Raxis[0][0]+R_torsion_cos*Raxis[1][0],
+            R_torsion_sin*Raxis[0][1]+R_torsion_cos*Raxis[1][1],
+            R_torsion_sin*Raxis[0][2]+R_torsion_cos*Raxis[1][2]],
             [Raxis[2][0],Raxis[2][1],Raxis[2][2]]]
         
-    Laxis = [[math.cos(L_torsion)*Laxis[0][0]-math.sin(L_torsion)*Laxis[1][0],
-            math.cos(L_torsion)*Laxis[0][1]-math.sin(L_torsion)*Laxis[1][1],
-            math.cos(L_torsion)*Laxis[0][2]-math.sin(L_torsion)*Laxis[1][2]],
-            [math.sin(L_torsion)*Laxis[0][0]+math.cos(L_torsion)*Laxis[1][0],
-            math.sin(L_torsion)*Laxis[0][1]+math.cos(L_torsion)*Laxis[1][1],
-            math.sin(L_torsion)*Laxis[0][2]+math.cos(L_torsion)*Laxis[1][2]],
+    Laxis = [[L_torsion_cos*Laxis[0][0]-L_torsion_sin*Laxis[1][0],
+            L_torsion_cos*Laxis[0][1]-L_torsion_sin*Laxis[1][1],
+            L_torsion_cos*Laxis[0][2]-L_torsion_sin*Laxis[1][2]],
+            [L_torsion_sin*Laxis[0][0]+L_torsion_cos*Laxis[1][0],
+            L_torsion_sin*Laxis[0][1]+L_torsion_cos*Laxis[1][1],
+            L_torsion_sin*Laxis[0][2]+L_torsion_cos*Laxis[1][2]],
             [Laxis[2][0],Laxis[2][1],Laxis[2][2]]]
     
     # Add the origin back to the vector 
@@ -838,26 +849,34 @@ def footJointCenter(frame,vsk,ankle_JC,knee_JC,delta):
     
     # Apply static offset angle to the incorrect foot axes 
     
-    # static offset angle are taken from static_info variable in radians.
-    R_alpha = vsk['RightStaticRotOff']
-    R_beta = vsk['RightStaticPlantFlex']
-    #R_gamma = static_info[0][2]
-    L_alpha = vsk['LeftStaticRotOff']
-    L_beta = vsk['LeftStaticPlantFlex']
-    #L_gamma = static_info[1][2]
+    if isinstance(vsk,SubjectModel):
+        (R_alpha_cos,R_alpha_sin,R_beta_cos,R_beta_sin,
+         L_alpha_cos,L_alpha_sin,L_beta_cos,L_beta_sin) = vsk.footOffsets
+    else:
+        # static offset angle are taken from static_info variable in radians.
+        R_alpha = vsk['RightStaticRotOff']
+        R_beta = vsk['RightStaticPlantFlex']
+        #R_gamma = static_info[0][2]
+        L_alpha = vsk['LeftStaticRotOff']
+        L_beta = vsk['LeftStaticPlantFlex']
+        #L_gamma = static_info[1][2]
  
-    R_alpha = np.around(math.degrees(R_alpha),decimals=5)
-    R_beta = np.around(math.degrees(R_beta),decimals=5)
-    #R_gamma = np.around(math.degrees(static_info[0][2]),decimals=5)
-    L_alpha = np.around(math.degrees(L_alpha),decimals=5)
-    L_beta = np.around(math.degrees(L_beta),decimals=5)
-    #L_gamma = np.around(math.degrees(static_info[1][2]),decimals=5)
-    
-    R_alpha = -math.radians(R_alpha)
-    R_beta = math.radians(R_beta)
-    #R_gamma = 0
-    L_alpha = math.radians(L_alpha)
-    L_beta = math.radians(L_beta)
+        R_alpha = np.around(math.degrees(R_alpha),decimals=5)
+        R_beta = np.around(math.degrees(R_beta),decimals=5)
+        #R_gamma = np.around(math.degrees(static_info[0][2]),decimals=5)
+        L_alpha = np.around(math.degrees(L_alpha),decimals=5)
+        L_beta = np.around(math.degrees(L_beta),decimals=5)
+        #L_gamma = np.around(math.degrees(static_info[1][2]),decimals=5)
+    
+        R_alpha = -math.radians(R_alpha)
+        R_beta = math.radians(R_beta)
+        #R_gamma = 0
+        L_alpha = math.radians(L_alpha)
+        L_beta = math.radians(L_beta)
+        R_alpha_cos,R_alpha_sin = math.cos(R_alpha),math.sin(R_alpha)
+        R_beta_cos,R_beta_sin = math.cos(R_beta),math.sin(R_beta)
+        L_alpha_cos,L_alpha_sin = math.cos(L_alpha),math.sin(L_alpha)
+        L_beta_cos,L_beta_sin = math.cos(L_beta),math.sin(L_beta)
     #L_gamma = 0
     
     R_axis = [[(R_foot_axis[0][0]),(R_foot_axis[0][1]),(R_foot_axis[0][2])],
@@ -871,41 +890,41 @@ def footJointCenter(frame,vsk,ankle_JC,knee_JC,delta):
     # rotate incorrect foot axis around y axis first.
     
     # right
-    R_rotmat = [[(math.cos(R_beta)*R_axis[0][0]+math.sin(R_beta)*R_axis[2][0]),
-                (math.cos(R_beta)*R_axis[0][1]+math.sin(R_beta)*R_axis[2][1]),
-                (math.cos(R_beta)*R_axis[0][2]+math.sin(R_beta)*R_axis[2][2])],
+    R_rotmat = [[(R_beta_cos*R_axis[0][0]+R_beta_sin*R_axis[2][0]),
+                (R_beta_cos*R_axis[0][1]+R_beta_sin*R_axis[2][1]),
+                (R_beta_cos*R_axis[0][2]+R_beta_sin*R_axis[2][2])],
                 [R_axis[1][0],R_axis[1][1],R_axis[1][2]],
-                [(-1*math.sin(R_beta)*R_axis[0][0]+math.cos(R_beta)*R_axis[2][0]),
-                (-1*math.sin(R_beta)*R_axis[0][1]+math.cos(R_beta)*R_axis[2][1]),
-                (-1*math.sin(R_beta)*R_axis[0][2]+math.cos(R_beta)*R_axis[2][2])]]
+                [(-1*R_beta_sin*R_axis[0][0]+R_beta_cos*R_axis[2][0]),
+                (-1*R_beta_sin*R_axis[0][1]+R_beta_cos*R_axis[2][1]),
+                (-1*R_beta_sin*R_axis[0][2]+R_beta_cos*R_axis[2][2])]]
     # left
-    L_rotmat = [[(math.cos(L_beta)*L_axis[0][0]+math.sin(L_beta)*L_axis[2][0]),
-                (math.cos(L_beta)*L_axis[0][1]+math.sin(L_beta)*L_axis[2][1]),
-                (math.cos(L_beta)*L_axis[0][2]+math.sin(L_beta)*L_axis[2][2])],
+    L_rotmat = [[(L_beta_cos*L_axis[0][0]+L_beta_sin*L_axis[2][0]),
+                (L_beta_cos*L_axis[0][1]+L_beta_sin*L_axis[2][1]),
+                (L_beta_cos*L_axis[0][2]+L_beta_sin*L_axis[2][2])],
                 [L_axis[1][0],L_axis[1][1],L_axis[1][2]],
-                [(-1*math.sin(L_beta)*L_axis[0][0]+math.cos(L_beta)*L_axis[2][0]),
-                (-1*math.sin(L_beta)*L_axis[0][1]+math.cos(L_beta)*L_axis[2][1]),
-                (-1*math.sin(L_beta)*L_axis[0][2]+math.cos(L_beta)*L_axis[2][2])]]
+                [(-1*L_beta_sin*L_axis[0][0]+L_beta_cos*L_axis[2][0]),
+                (-1*L_beta_sin*L_axis[0][1]+L_beta_cos*L_axis[2][1]),
+                (-1*L_beta_sin*L_axis[0][2]+L_beta_cos*L_axis[2][2])]]
                 
     # rotate incorrect foot axis around x axis next.
     
     # right
     R_rotmat = [[R_rotmat[0][0],R_rotmat[0][1],R_rotmat[0][2]],
-                [(math.cos(R_alpha)*R_rotmat[1][0]-math.sin(R_alpha)*R_rotmat[2][0]),
-                (math.cos(R_alpha)*R_rotmat[1][1]-math.sin(R_alpha)*R_rotmat[2][1]),
-                (math.cos(R_alpha)*R_rotmat[1][2]-math.sin(R_alpha)*R_rotmat[2][2])],
-                [(math.sin(R_alpha)*R_rotmat[1][0]+math.cos(R_alpha)*R_rotmat[2][0]),
-                (math.sin(R_alpha)*R_rotmat[1][1]+math.cos(R_alpha)*R_rotmat[2][1]),
-                (math.sin(R_alpha)*R_rotmat[1][2]+math.cos(R_alpha)*R_rotmat[2][2])]]
+                [(R_alpha_cos*R_rotmat[1][0]-R_alpha_sin*R_rotmat[2][0]),
+                (R_alpha_cos*R_rotmat[1][1]-R_alpha_sin*R_rotmat[2][1]),
+                (R_alpha_cos*R_rotmat[1][2]-R_alpha_sin*R_rotmat[2][2])],
+                [(R_alpha_sin*R_rotmat[1][0]+R_alpha_cos*R_rotmat[2][0]),
+                (R_alpha_sin*R_rotmat[1][1]+R_alpha_cos*R_rotmat[2][1]),
+                (R_alpha_sin*R_rotmat[1][2]+R_alpha_cos*R_rotmat[2][2])]]
     
     # left          
     L_rotmat = [[L_rotmat[0][0],L_rotmat[0][1],L_rotmat[0][2]],
-                [(math.cos(L_alpha)*L_rotmat[1][0]-math.sin(L_alpha)*L_rotmat[2][0]),
-                (math.cos(L_alpha)*L_rotmat[1][1]-math.sin(L_alpha)*L_rotmat[2][1]),
-                (math.cos(L_alpha)*L_rotmat[1][2]-math.sin(L_alpha)*L_rotmat[2][2])],
-                [(math.sin(L_alpha)*L_rotmat[1][0]+math.cos(L_alpha)*L_rotmat[2][0]),
-                (math.sin(L_alpha)*L_rotmat[1][1]+math.cos(L_alpha)*L_rotmat[2][1]),
-                (math.sin(L_alpha)*L_rotmat[1][2]+math.cos(L_alpha)*L_rotmat[2][2])]]
+                [(L_alpha_cos*L_rotmat[1][0]-L_alpha_sin*L_rotmat[2][0]),
+                (L_alpha_cos*L_rotmat[1][1]-L_alpha_sin*L_rotmat[2][1]),
+                (L_alpha_cos*L_rotmat[1][2]-L_alpha_sin*L_rotmat[2][2])],
+                [(L_alpha_sin*L_rotmat[1][0]+L_alpha_cos*L_rotmat[2][0]),
+                (L_alpha_sin*L_rotmat[1][1]+L_alpha_cos*L_rotmat[2][1]),
+                (L_alpha_sin*L_rotmat[1][2]+L_alpha_cos*L_rotmat[2][2])]]
     
     # Bring each x,y,z axis from rotation axes
     R_axis_x = R_rotmat[0]
@@ -976,8 +995,12 @@ def headJC(frame,vsk=None):
     """
     
     #Get Global Values
-    head_off = vsk['HeadOffset']
-    head_off = -1*head_off
+    if isinstance(vsk,SubjectModel):
+        head_off_cos,head_off_sin = vsk.headOffset
+    else:
+        head_off = vsk['HeadOffset']
+        head_off = -1*head_off
+        head_off_cos,head_off_sin = math.cos(head_off),math.sin(head_off)
     
     #Get the marker positions used for joint calculation
     LFHD = frame['LFHD']
@@ -1017,13 +1040,13 @@ def headJC(frame,vsk=None):
     x_vec = [x_vec[0]/x_vec_div,x_vec[1]/x_vec_div,x_vec[2]/x_vec_div]
     
     # rotate the head axis around y axis about head offset angle.
-    x_vec_rot = [x_vec[0]*math.cos(head_off)+z_vec[0]*math.sin(head_off),
-            x_vec[1]*math.cos(head_off)+z_vec[1]*math.sin(head_off),
-            x_vec[2]*math.cos(head_off)+z_vec[2]*math.sin(head_off)]
+    x_vec_rot = [x_vec[0]*head_off_cos+z_vec[0]*head_off_sin,
+            x_vec[1]*head_off_cos+z_vec[1]*head_off_sin,
+            x_vec[2]*head_off_cos+z_vec[2]*head_off_sin]
     y_vec_rot = [y_vec[0],y_vec[1],y_vec[2]]
-    z_vec_rot = [x_vec[0]*-1*math.sin(head_off)+z_vec[0]*math.cos(head_off),
-            x_vec[1]*-1*math.sin(head_off)+z_vec[1]*math.cos(head_off),
-            x_vec[2]*-1*math.sin(head_off)+z_vec[2]*math.cos(head_off)]
+    z_vec_rot = [x_vec[0]*-1*head_off_sin+z_vec[0]*head_off_cos,
+            x_vec[1]*-1*head_off_sin+z_vec[1]*head_off_cos,
+            x_vec[2]*-1*head_off_sin+z_vec[2]*head_off_cos]
 
     #Add the origin back to the vector to get it in the right position
     x_axis = [x_vec_rot[0]+origin[0],x_vec_rot[1]+origin[1],x_vec_rot[2]+origin[2]]
@@ -1248,11 +1271,14 @@ def findshoulderJC(frame,thorax,wand,vsk=None):
 
    
     #Get Subject Measurement Values
-    R_shoulderoffset = vsk['RightShoulderOffset']
-    L_shoulderoffset = vsk['LeftShoulderOffset']
-    mm = 7.0
-    R_delta =( R_shoulderoffset + mm ) 
-    L_delta =( L_shoulderoffset + mm ) 
+    if isinstance(vsk,SubjectModel):
+        R_delta,L_delta = vsk.shoulderDelta
+    else:
+        R_shoulderoffset = vsk['RightShoulderOffset']
+        L_shoulderoffset = vsk['LeftShoulderOffset']
+        mm = 7.0
+        R_delta =( R_shoulderoffset + mm ) 
+        L_delta =( L_shoulderoffset + mm ) 
 
     
     #REQUIRED MARKERS: 
@@ -1471,13 +1497,16 @@ def elbowJointCenter(frame,thorax,shoulderJC,wand,vsk=None):
     LWRB = frame['LWRB']
     
     
-    R_elbowwidth = vsk['RightElbowWidth']
-    L_elbowwidth = vsk['LeftElbowWidth']
-    R_elbowwidth = R_elbowwidth * -1
-    L_elbowwidth = L_elbowwidth 
     mm = 7.0
-    R_delta =( (R_elbowwidth/2.0)-mm )  
-    L_delta =( (L_elbowwidth/2.0)+mm )  
+    if isinstance(vsk,SubjectModel):
+        R_delta,L_delta = vsk.elbowDelta
+    else:
+        R_elbowwidth = vsk['RightElbowWidth']
+        L_elbowwidth = vsk['LeftElbowWidth']
+        R_elbowwidth = R_elbowwidth * -1
+        L_elbowwidth = L_elbowwidth 
+        R_delta =( (R_elbowwidth/2.0)-mm )  
+        L_delta =( (L_elbowwidth/2.0)+mm )  
     
 
     RWRI = [(RWRA[0]+RWRB[0])/2.0,(RWRA[1]+RWRB[1])/2.0,(RWRA[2]+RWRB[2])/2.0]
@@ -1611,10 +1640,13 @@ def elbowJointCenter(frame,thorax,shoulderJC,wand,vsk=None):
     L_radius = [x_axis,y_axis,z_axis]
     
     # calculate wrist joint center for humerus
-    R_wristThickness = vsk['RightWristWidth']
-    L_wristThickness = vsk['LeftWristWidth']
-    R_wristThickness = (R_wristThickness / 2 + mm ) 
-    L_wristThickness = (L_wristThickness / 2 + mm ) 
+    if isinstance(vsk,SubjectModel):
+        R_wristThickness,L_wristThickness = vsk.wristDelta
+    else:
+        R_wristThickness = vsk['RightWristWidth']
+        L_wristThickness = vsk['LeftWristWidth']
+        R_wristThickness = (R_wristThickness / 2 + mm ) 
+        L_wristThickness = (L_wristThickness / 2 + mm ) 
 
     RWJC = [RWRI[0]+R_wristThickness*R_radius[1][0],RWRI[1]+R_wristThickness*R_radius[1][1],RWRI[2]+R_wristThickness*R_radius[1][2]]
     LWJC = [LWRI[0]-L_wristThickness*L_radius[1][0],LWRI[1]-L_wristThickness*L_radius[1][1],LWRI[2]-L_wristThickness*L_radius[1][2]]
@@ -1895,12 +1927,15 @@ def handJointCenter(frame,elbowJC,wristJC,vsk=None):
     LWJC = wristJC[0][1]
     RWJC = wristJC[0][0]
     
-    mm = 7.0
-    R_handThickness = vsk['RightHandThickness']
-    L_handThickness = vsk['LeftHandThickness']
-    
-    R_delta =( R_handThickness/2 + mm )  
-    L_delta =( L_handThickness/2 + mm )  
+    if isinstance(vsk,SubjectModel):
+        R_delta,L_delta = vsk.handDelta
+    else:
+        mm = 7.0
+        R_handThickness = vsk['RightHandThickness']
+        L_handThickness = vsk['LeftHandThickness']
+        
+        R_delta =( R_handThickness/2 + mm )  
+        L_delta =( L_handThickness/2 + mm )  
     
     LHND = findJointC(LWRI,LWJC,LFIN,L_delta)
     RHND = findJointC(RWRI,RWJC,RFIN,R_delta)
@@ -1988,6 +2023,9 @@ def findJointC(a, b, c, delta):
     >>> findJointC(a,b,c,delta)
     array([396.25286248, 347.91367254, 518.63620527])
     """
+    a = np.asarray(a,dtype=float).tolist()
+    b = np.asarray(b,dtype=float).tolist()
+    c = np.asarray(c,dtype=float).tolist()
     # make the two vector using 3 markers, which is on the same plane.
     v1 = (a[0]-c[0],a[1]-c[1],a[2]-c[2])
     v2 = (b[0]-c[0],b[1]-c[1],b[2]-c[2])
@@ -2000,8 +2038,7 @@ def findJointC(a, b, c, delta):
     v3 = [v3[0]/v3_div,v3[1]/v3_div,v3[2]/v3_div]
     
     m = [(b[0]+c[0])/2,(b[1]+c[1])/2,(b[2]+c[2])/2]
-    length = np.subtract(b,m)
-    length = norm2d(length)
+    length = norm2d([b[0]-m[0],b[1]-m[1],b[2]-m[2]])
 
     theta = math.acos(delta/norm2d(v2))
 
@@ -2017,13 +2054,13 @@ def findJointC(a, b, c, delta):
     # then the orthogonal vector of the plane will be rotating axis.
     # joint center is determined by rotating the one vector of plane around rotating axis.
 
-    rot = np.matrix([[cs+ux**2.0*(1.0-cs),ux*uy*(1.0-cs)-uz*sn,ux*uz*(1.0-cs)+uy*sn],
-                    [uy*ux*(1.0-cs)+uz*sn,cs+uy**2.0*(1.0-cs),uy*uz*(1.0-cs)-ux*sn],
-                    [uz*ux*(1.0-cs)-uy*sn,uz*uy*(1.0-cs)+ux*sn,cs+uz**2.0*(1.0-cs)]])  
-    r = rot*(np.matrix(v2).transpose())   
-    r = r* length/np.linalg.norm(r)
+    # the rotation matrix is applied to v2 row by row (same as pycgmBatch.findJointC).
+    r = [(cs+ux**2.0*(1.0-cs))*v2[0]+(ux*uy*(1.0-cs)-uz*sn)*v2[1]+(ux*uz*(1.0-cs)+uy*sn)*v2[2],
+         (uy*ux*(1.0-cs)+uz*sn)*v2[0]+(cs+uy**2.0*(1.0-cs))*v2[1]+(uy*uz*(1.0-cs)-ux*sn)*v2[2],
+         (uz*ux*(1.0-cs)-uy*sn)*v2[0]+(uz*uy*(1.0-cs)+ux*sn)*v2[1]+(cs+uz**2.0*(1.0-cs))*v2[2]]
+    r_div = norm2d(r)
+    r = [r[0]*length/r_div,r[1]*length/r_div,r[2]*length/r_div]
 
-    r = [r[0,0],r[1,0],r[2,0]]
     mr = np.array([r[0]+m[0],r[1]+m[1],r[2]+m[2]])
 
     return mr
@@ -2147,6 +2184,11 @@ def getHeadangle(axisP,axisD):
     
     # alpha is abdcution angle. 
        
+    # the axes are indexed as lists of floats, which is much faster than
+    # indexing numpy arrays one element at a time
+    axisP = np.asarray(axisP,dtype=float).tolist()
+    axisD = np.asarray(axisD,dtype=float).tolist()
+    
     ang=((-1*axisD[2][0]*axisP[1][0])+(-1*axisD[2][1]*axisP[1][1])+(-1*axisD[2][2]*axisP[1][2]))
     alpha = np.nan
     if -1<=ang<=1:
@@ -2318,11 +2360,16 @@ def getangle(axisP,axisD):
     
     # alpha is abdcution angle. 
        
+    # the axes are indexed as lists of floats, which is much faster than
+    # indexing numpy arrays one element at a time
+    axisP = np.asarray(axisP,dtype=float).tolist()
+    axisD = np.asarray(axisD,dtype=float).tolist()
+    
     ang=((-1*axisD[2][0]*axisP[1][0])+(-1*axisD[2][1]*axisP[1][1])+(-1*axisD[2][2]*axisP[1][2]))
     alpha = np.nan
     if -1<=ang<=1:
 #       alpha = np.arcsin(ang)
-        alpha = np.arcsin(ang)
+        alpha = math.asin(ang)
 
     # check the abduction angle is in the area between -pi/2 and pi/2
     # beta is flextion angle
@@ -2330,12 +2377,12 @@ def getangle(axisP,axisD):
     
     if -1.57079633<alpha<1.57079633:
         
-        beta = np.arctan2(((axisD[2][0]*axisP[0][0])+(axisD[2][1]*axisP[0][1])+(axisD[2][2]*axisP[0][2])) , ((axisD[2][0]*axisP[2][0])+(axisD[2][1]*axisP[2][1])+(axisD[2][2]*axisP[2][2])))
-        gamma = np.arctan2(((axisD[1][0]*axisP[1][0])+(axisD[1][1]*axisP[1][1])+(axisD[1][2]*axisP[1][2])) , ((axisD[0][0]*axisP[1][0])+(axisD[0][1]*axisP[1][1])+(axisD[0][2]*axisP[1][2])))
+        beta = math.atan2(((axisD[2][0]*axisP[0][0])+(axisD[2][1]*axisP[0][1])+(axisD[2][2]*axisP[0][2])) , ((axisD[2][0]*axisP[2][0])+(axisD[2][1]*axisP[2][1])+(axisD[2][2]*axisP[2][2])))
+        gamma = math.atan2(((axisD[1][0]*axisP[1][0])+(axisD[1][1]*axisP[1][1])+(axisD[1][2]*axisP[1][2])) , ((axisD[0][0]*axisP[1][0])+(axisD[0][1]*axisP[1][1])+(axisD[0][2]*axisP[1][2])))
     
     else:
-        beta = np.arctan2(-1*((axisD[2][0]*axisP[0][0])+(axisD[2][1]*axisP[0][1])+(axisD[2][2]*axisP[0][2])) , ((axisD[2][0]*axisP[2][0])+(axisD[2][1]*axisP[2][1])+(axisD[2][2]*axisP[2][2])))
-        gamma = np.arctan2(-1*((axisD[1][0]*axisP[1][0])+(axisD[1][1]*axisP[1][1])+(axisD[1][2]*axisP[1][2])) , ((axisD[0][0]*axisP[1][0])+(axisD[0][1]*axisP[1][1])+(axisD[0][2]*axisP[1][2])))
+        beta = math.atan2(-1*((axisD[2][0]*axisP[0][0])+(axisD[2][1]*axisP[0][1])+(axisD[2][2]*axisP[0][2])) , ((axisD[2][0]*axisP[2][0])+(axisD[2][1]*axisP[2][1])+(axisD[2][2]*axisP[2][2])))
+        gamma = math.atan2(-1*((axisD[1][0]*axisP[1][0])+(axisD[1][1]*axisP[1][1])+(axisD[1][2]*axisP[1][2])) , ((axisD[0][0]*axisP[1][0])+(axisD[0][1]*axisP[1][1])+(axisD[0][2]*axisP[1][2])))
     
     angle = [180.0 * beta/ pi, 180.0 *alpha/ pi, 180.0 * gamma / pi ]
     
@@ -2520,7 +2567,138 @@ def rotmat(x=0,y=0,z=0):
     return Rxyz
 
     
-def JointAngleCalc(frame,vsk):
+def jointCenterKeys():
+    """Joint center names function
+
+    Returns the names of the joint center positions of JointAngleCalc,
+    in the order they are stored in a joint center array.
+
+    Returns
+    -------
+    keys : list
+        List of the 27 joint center names.
+
+    Examples
+    --------
+    >>> from .pyCGM import jointCenterKeys
+    >>> len(jointCenterKeys())
+    27
+    >>> jointCenterKeys()[:3]
+    ['Pelvis', 'RHip', 'LHip']
+    """
+    keys = ['Pelvis','RHip','LHip','RKnee','LKnee','RAnkle','LAnkle','RFoot','LFoot',
+            'RHEE','LHEE','C7','CLAV','STRN','T10','Front_Head','Back_Head','Head','Thorax',
+            'RShoulder','LShoulder','RHumerus','LHumerus','RRadius','LRadius','RHand','LHand']
+    return keys
+
+class SubjectModel(dict):
+    """Subject model class
+
+    Holds the subject measurements of a vsk dictionary (the output of
+    getStatic) together with the per-subject values that the joint center
+    functions derive from them: the hip joint center offsets, the marker
+    deltas, the cosine and sine of the tibial torsion, static foot and
+    head offsets and the global axes. These only depend on the subject, so
+    they are calculated once here instead of on every frame.
+
+    A SubjectModel is a dictionary, so it can be given anywhere a vsk
+    dictionary is used. The precomputed values are calculated when the
+    model is created, so it should be created again if the measurements
+    change.
+
+    Parameters
+    ----------
+    vsk : dict
+        Dictionary of the subject measurements.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from .pyCGM import SubjectModel
+    >>> vsk = {'MeanLegLength': 940.0, 'R_AsisToTrocanterMeasure': 72.512,
+    ...        'L_AsisToTrocanterMeasure': 72.512, 'InterAsisDistance': 215.908996582031,
+    ...        'RightKneeWidth': 105.0, 'LeftKneeWidth': 105.0,
+    ...        'RightAnkleWidth': 70.0, 'LeftAnkleWidth': 70.0,
+    ...        'RightTibialTorsion': 0.0, 'LeftTibialTorsion': 0.0,
+    ...        'RightStaticRotOff': 0.01, 'RightStaticPlantFlex': 0.27,
+    ...        'LeftStaticRotOff': 0.00, 'LeftStaticPlantFlex': 0.20,
+    ...        'HeadOffset': 0.25, 'RightShoulderOffset': 40.0,
+    ...        'LeftShoulderOffset': 40.0, 'RightElbowWidth': 74.0,
+    ...        'LeftElbowWidth': 74.0, 'RightWristWidth': 55.0,
+    ...        'LeftWristWidth': 55.0, 'RightHandThickness': 34.0,
+    ...        'LeftHandThickness': 34.0, 'GCS': [[1,0,0],[0,1,0],[0,0,1]]}
+    >>> model = SubjectModel(vsk)
+    >>> model['MeanLegLength']
+    940.0
+    >>> np.around(model.hipOffsets,8)
+    array([ -50.47037334,   63.46379375, -102.01625737,  -50.47037334,
+            -63.46379375, -102.01625737])
+    >>> model.kneeDelta
+    (59.5, 59.5)
+    >>> np.around(model.thoraxAxis,8)
+    array([[-1., -0.,  0.],
+           [ 0., -1.,  0.],
+           [ 0.,  0.,  1.]])
+    """
+    def __init__(self,*args,**kargs):
+        dict.__init__(self,*args,**kargs)
+        mm = 7.0
+
+        #hipJointCenter (ref. Davis_1991)
+        C = ( self['MeanLegLength'] * 0.115 ) - 15.3
+        theta = 0.500000178813934
+        beta = 0.314000427722931
+        aa = self['InterAsisDistance']/2.0
+        S = -1
+        L_AsisToTrocanterMeasure = self['L_AsisToTrocanterMeasure']
+        R_AsisToTrocanterMeasure = self['R_AsisToTrocanterMeasure']
+        self.hipOffsets = np.array([
+            (-L_AsisToTrocanterMeasure - mm) * cos(beta) + C * cos(theta) * sin(beta),
+            S*(C*sin(theta)- aa),
+            (-L_AsisToTrocanterMeasure - mm) * sin(beta) - C * cos(theta) * cos(beta),
+            (-R_AsisToTrocanterMeasure - mm) * cos(beta) + C * cos(theta) * sin(beta),
+            (C*sin(theta)- aa),
+            (-R_AsisToTrocanterMeasure - mm) * sin(beta) - C * cos(theta) * cos(beta)])
+
+        #kneeJointCenter and ankleJointCenter
+        self.kneeDelta = ((self['RightKneeWidth']/2.0)+mm,
+                          (self['LeftKneeWidth']/2.0)+mm)
+        self.ankleDelta = ((self['RightAnkleWidth']/2.0)+mm,
+                           (self['LeftAnkleWidth']/2.0)+mm)
+        R_torsion = np.radians(self['RightTibialTorsion'])
+        L_torsion = np.radians(self['LeftTibialTorsion'])
+        self.tibialTorsion = (math.cos(R_torsion),math.sin(R_torsion),
+                              math.cos(L_torsion),math.sin(L_torsion))
+
+        #footJointCenter
+        R_alpha = -math.radians(np.around(math.degrees(self['RightStaticRotOff']),decimals=5))
+        R_beta = math.radians(np.around(math.degrees(self['RightStaticPlantFlex']),decimals=5))
+        L_alpha = math.radians(np.around(math.degrees(self['LeftStaticRotOff']),decimals=5))
+        L_beta = math.radians(np.around(math.degrees(self['LeftStaticPlantFlex']),decimals=5))
+        self.footOffsets = (math.cos(R_alpha),math.sin(R_alpha),
+                            math.cos(R_beta),math.sin(R_beta),
+                            math.cos(L_alpha),math.sin(L_alpha),
+                            math.cos(L_beta),math.sin(L_beta))
+
+        #headJC
+        head_off = -1*self['HeadOffset']
+        self.headOffset = (math.cos(head_off),math.sin(head_off))
+
+        #upper body
+        self.shoulderDelta = (self['RightShoulderOffset'] + mm,
+                              self['LeftShoulderOffset'] + mm)
+        self.elbowDelta = ((self['RightElbowWidth'] * -1)/2.0 - mm,
+                           self['LeftElbowWidth']/2.0 + mm)
+        self.wristDelta = (self['RightWristWidth'] / 2 + mm,
+                           self['LeftWristWidth'] / 2 + mm)
+        self.handDelta = (self['RightHandThickness']/2 + mm,
+                          self['LeftHandThickness']/2 + mm)
+
+        #global axes of the head and thorax angles
+        self.globalAxis = np.vstack([np.subtract(axis,[0,0,0]) for axis in self['GCS']])
+        self.thoraxAxis = np.array(rotmat(x=0,y=0,z=180))
+
+def JointAngleCalc(frame,vsk,out=None,jcOut=None):
     """ Joint Angle Calculation function
     Calculates the Joint angles of plugingait and stores the data in array
     Stores
@@ -2561,6 +2739,12 @@ def JointAngleCalc(frame,vsk):
         Dictionaries of marker lists.  
     vsk : dict, optional
         A dictionary containing subject measurements from a VSK file.
+    out : array, optional
+        A 273 element array, usually a row of a (frames, 273) array owned by
+        the caller. The result is written into it and it is returned as r.
+    jcOut : array, optional
+        A (27, 3) array where the joint center positions are written,
+        in the order of jointCenterKeys.
     
     Returns
     -------
@@ -2613,9 +2797,7 @@ def JointAngleCalc(frame,vsk):
     global_Axis = vsk['GCS']
 
     #make the array which will be the input of findangle function
-    pelvis_Axis_mod = np.vstack([np.subtract(Pelvis_vectors[0],Pelvis_origin),
-                            np.subtract(Pelvis_vectors[1],Pelvis_origin),
-                            np.subtract(Pelvis_vectors[2],Pelvis_origin)])
+    pelvis_Axis_mod = np.subtract(Pelvis_vectors,Pelvis_origin)
     
 
     global_pelvis_angle = getangle(global_Axis,pelvis_Axis_mod)
@@ -2646,17 +2828,11 @@ def JointAngleCalc(frame,vsk):
     L_Knee_center_form = knee_JC[1]
 
     #make the array which will be the input of findangle function
-    hip_Axis = np.vstack([np.subtract(Hip_axis_form[0],Hip_center_form),
-                          np.subtract(Hip_axis_form[1],Hip_center_form),
-                          np.subtract(Hip_axis_form[2],Hip_center_form)])
+    hip_Axis = np.subtract(Hip_axis_form,Hip_center_form)
 
-    R_knee_Axis = np.vstack([np.subtract(R_Knee_axis_form[0],R_Knee_center_form),
-                           np.subtract(R_Knee_axis_form[1],R_Knee_center_form),
-                           np.subtract(R_Knee_axis_form[2],R_Knee_center_form)])
+    R_knee_Axis = np.subtract(R_Knee_axis_form,R_Knee_center_form)
     
-    L_knee_Axis = np.vstack([np.subtract(L_Knee_axis_form[0],L_Knee_center_form),
-                           np.subtract(L_Knee_axis_form[1],L_Knee_center_form),
-                           np.subtract(L_Knee_axis_form[2],L_Knee_center_form)])
+    L_knee_Axis = np.subtract(L_Knee_axis_form,L_Knee_center_form)
 
     R_pelvis_knee_angle = getangle(hip_Axis,R_knee_Axis)
     L_pelvis_knee_angle = getangle(hip_Axis,L_knee_Axis)
@@ -2684,13 +2860,9 @@ def JointAngleCalc(frame,vsk):
     
     #make the array which will be the input of findangle function
     # In case of knee axis I mentioned it before as R_knee_Axis and L_knee_Axis
-    R_ankle_Axis = np.vstack([np.subtract(R_Ankle_axis_form[0],R_Ankle_center_form),
-                              np.subtract(R_Ankle_axis_form[1],R_Ankle_center_form),
-                              np.subtract(R_Ankle_axis_form[2],R_Ankle_center_form)])
+    R_ankle_Axis = np.subtract(R_Ankle_axis_form,R_Ankle_center_form)
     
-    L_ankle_Axis = np.vstack([np.subtract(L_Ankle_axis_form[0],L_Ankle_center_form),
-                              np.subtract(L_Ankle_axis_form[1],L_Ankle_center_form),
-                              np.subtract(L_Ankle_axis_form[2],L_Ankle_center_form)])
+    L_ankle_Axis = np.subtract(L_Ankle_axis_form,L_Ankle_center_form)
               
     R_knee_ankle_angle = getangle(R_knee_Axis,R_ankle_Axis) 
     L_knee_ankle_angle = getangle(L_knee_Axis,L_ankle_Axis)
@@ -2723,13 +2895,9 @@ def JointAngleCalc(frame,vsk):
     L_Foot_axis_form = foot_JC[2][1]
     L_Foot_center_form = foot_JC[1]
     
-    R_foot_Axis = np.vstack([np.subtract(R_Foot_axis_form[0],R_Foot_center_form),
-                             np.subtract(R_Foot_axis_form[1],R_Foot_center_form),
-                             np.subtract(R_Foot_axis_form[2],R_Foot_center_form)])
+    R_foot_Axis = np.subtract(R_Foot_axis_form,R_Foot_center_form)
     
-    L_foot_Axis = np.vstack([np.subtract(L_Foot_axis_form[0],L_Foot_center_form),
-                             np.subtract(L_Foot_axis_form[1],L_Foot_center_form),
-                             np.subtract(L_Foot_axis_form[2],L_Foot_center_form)])         
+    L_foot_Axis = np.subtract(L_Foot_axis_form,L_Foot_center_form)         
     
 
     R_ankle_foot_angle = getangle(R_ankle_Axis,R_foot_Axis)
@@ -2781,13 +2949,12 @@ def JointAngleCalc(frame,vsk):
     #Global_axis_form = rotmat(x=0,y=0,z=180) #this is some weird fix to global axis
 
     #make the array which will be the input of findangle function
-    head_Axis_mod = np.vstack([np.subtract(Head_axis_form[0],Head_center_form),
-                             np.subtract(Head_axis_form[1],Head_center_form),
-                             np.subtract(Head_axis_form[2],Head_center_form)])
+    head_Axis_mod = np.subtract(Head_axis_form,Head_center_form)
 
-    global_Axis = np.vstack([np.subtract(Global_axis_form[0],Global_center_form),
-                             np.subtract(Global_axis_form[1],Global_center_form),
-                             np.subtract(Global_axis_form[2],Global_center_form)])
+    if isinstance(vsk,SubjectModel):
+        global_Axis = vsk.globalAxis
+    else:
+        global_Axis = np.subtract(Global_axis_form,Global_center_form)
     
     global_head_angle = getHeadangle(global_Axis,head_Axis_mod)
     
@@ -2814,16 +2981,15 @@ def JointAngleCalc(frame,vsk):
     Global_axis_form = [[0,1,0],[-1,0,0],[0,0,1]]
     Global_center_form = [0,0,0]
     #*******************************************************
-    Global_axis_form = rotmat(x=0,y=0,z=180) #this needs to be fixed for the global rotation
+    if isinstance(vsk,SubjectModel):
+        Global_axis_form = vsk.thoraxAxis
+    else:
+        Global_axis_form = rotmat(x=0,y=0,z=180) #this needs to be fixed for the global rotation
     
     #make the array which will be the input of findangle function
-    thorax_Axis_mod = np.vstack([np.subtract(Thorax_axis_form[0],Thorax_center_form),
-                                np.subtract(Thorax_axis_form[1],Thorax_center_form),
-                                np.subtract(Thorax_axis_form[2],Thorax_center_form)])
+    thorax_Axis_mod = np.subtract(Thorax_axis_form,Thorax_center_form)
 
-    global_Axis = np.vstack([np.subtract(Global_axis_form[0],Global_center_form),
-                             np.subtract(Global_axis_form[1],Global_center_form),
-                             np.subtract(Global_axis_form[2],Global_center_form)])
+    global_Axis = np.subtract(Global_axis_form,Global_center_form)
                              
    
     global_thorax_angle = getangle(global_Axis,thorax_Axis_mod)
@@ -2886,12 +3052,8 @@ def JointAngleCalc(frame,vsk):
     L_Humerus_center_form = humerus_JC[0][1]
   
     # make the array which will be the input of findangle function
-    R_humerus_Axis_mod = np.vstack([np.subtract(R_Humerus_axis_form[0],R_Humerus_center_form),
-                                   np.subtract(R_Humerus_axis_form[1],R_Humerus_center_form),
-                                   np.subtract(R_Humerus_axis_form[2],R_Humerus_center_form)])
-    L_humerus_Axis_mod = np.vstack([np.subtract(L_Humerus_axis_form[0],L_Humerus_center_form),
-                                    np.subtract(L_Humerus_axis_form[1],L_Humerus_center_form),
-                                    np.subtract(L_Humerus_axis_form[2],L_Humerus_center_form)])                              
+    R_humerus_Axis_mod = np.subtract(R_Humerus_axis_form,R_Humerus_center_form)
+    L_humerus_Axis_mod = np.subtract(L_Humerus_axis_form,L_Humerus_center_form)                              
 
     R_thorax_shoulder_angle = getangle_sho(thorax_Axis_mod,R_humerus_Axis_mod)
     L_thorax_shoulder_angle = getangle_sho(thorax_Axis_mod,L_humerus_Axis_mod)
@@ -2938,12 +3100,8 @@ def JointAngleCalc(frame,vsk):
     L_Radius_center_form = radius_JC[0][1]
         
     # make the array which will be the input of findangle function
-    R_radius_Axis_mod = np.vstack([np.subtract(R_Radius_axis_form[0],R_Radius_center_form),
-                                    np.subtract(R_Radius_axis_form[1],R_Radius_center_form),
-                                    np.subtract(R_Radius_axis_form[2],R_Radius_center_form)])
-    L_radius_Axis_mod = np.vstack([np.subtract(L_Radius_axis_form[0],L_Radius_center_form),
-                                    np.subtract(L_Radius_axis_form[1],L_Radius_center_form),
-                                    np.subtract(L_Radius_axis_form[2],L_Radius_center_form)])
+    R_radius_Axis_mod = np.subtract(R_Radius_axis_form,R_Radius_center_form)
+    L_radius_Axis_mod = np.subtract(L_Radius_axis_form,L_Radius_center_form)
 
     R_humerus_radius_angle = getangle(R_humerus_Axis_mod,R_radius_Axis_mod)
     L_humerus_radius_angle = getangle(L_humerus_Axis_mod,L_radius_Axis_mod)
@@ -2970,12 +3128,8 @@ def JointAngleCalc(frame,vsk):
     L_Hand_center_form = hand_JC[0][1]
     
     # make the array which will be the input of findangle function
-    R_hand_Axis_mod = np.vstack([np.subtract(R_Hand_axis_form[0],R_Hand_center_form),
-                                np.subtract(R_Hand_axis_form[1],R_Hand_center_form),
-                                np.subtract(R_Hand_axis_form[2],R_Hand_center_form)])
-    L_hand_Axis_mod = np.vstack([np.subtract(L_Hand_axis_form[0],L_Hand_center_form),
-                                np.subtract(L_Hand_axis_form[1],L_Hand_center_form),
-                                np.subtract(L_Hand_axis_form[2],L_Hand_center_form)])
+    R_hand_Axis_mod = np.subtract(R_Hand_axis_form,R_Hand_center_form)
+    L_hand_Axis_mod = np.subtract(L_Hand_axis_form,L_Hand_center_form)
                                    
     R_radius_hand_angle = getangle(R_radius_Axis_mod,R_hand_Axis_mod)
     L_radius_hand_angle = getangle(L_radius_Axis_mod,L_hand_Axis_mod)
@@ -2991,409 +3145,9 @@ def JointAngleCalc(frame,vsk):
         lwrtz = lwrtz + 360
 
 
-    # make each axis as same format to store
-    
-    # Pelvis
-        # origin
-    pel_origin = Pelvis_origin
-    pel_ox=pel_origin[0]
-    pel_oy=pel_origin[1]
-    pel_oz=pel_origin[2]
-        # xaxis
-    pel_x_axis = Pelvis_vectors[0]
-    pel_xx=pel_x_axis[0]
-    pel_xy=pel_x_axis[1]
-    pel_xz=pel_x_axis[2]  
-        # yaxis
-    pel_y_axis = Pelvis_vectors[1]
-    pel_yx=pel_y_axis[0]
-    pel_yy=pel_y_axis[1]
-    pel_yz=pel_y_axis[2]
-        # zaxis
-    pel_z_axis = Pelvis_vectors[2]
-    pel_zx=pel_z_axis[0]
-    pel_zy=pel_z_axis[1]
-    pel_zz=pel_z_axis[2]
-    
-    # Hip
-        # origin
-    hip_origin = Hip_center_form
-    hip_ox=hip_origin[0]
-    hip_oy=hip_origin[1]
-    hip_oz=hip_origin[2]
-        # xaxis
-    hip_x_axis = Hip_axis_form[0]
-    hip_xx=hip_x_axis[0]
-    hip_xy=hip_x_axis[1]
-    hip_xz=hip_x_axis[2]
-        # yaxis
-    hip_y_axis = Hip_axis_form[1]
-    hip_yx=hip_y_axis[0]
-    hip_yy=hip_y_axis[1]
-    hip_yz=hip_y_axis[2]
-        # zaxis
-    hip_z_axis = Hip_axis_form[2]
-    hip_zx=hip_z_axis[0]
-    hip_zy=hip_z_axis[1]
-    hip_zz=hip_z_axis[2]
-    
-    # R KNEE
-        # origin
-    rknee_origin = R_Knee_center_form
-    rknee_ox=rknee_origin[0]
-    rknee_oy=rknee_origin[1]
-    rknee_oz=rknee_origin[2]
-    
-        # xaxis
-    rknee_x_axis = R_Knee_axis_form[0]
-    rknee_xx=rknee_x_axis[0]
-    rknee_xy=rknee_x_axis[1]
-    rknee_xz=rknee_x_axis[2]
-        # yaxis
-    rknee_y_axis = R_Knee_axis_form[1]
-    rknee_yx=rknee_y_axis[0]
-    rknee_yy=rknee_y_axis[1]
-    rknee_yz=rknee_y_axis[2]
-        # zaxis
-    rknee_z_axis = R_Knee_axis_form[2]
-    rknee_zx=rknee_z_axis[0]
-    rknee_zy=rknee_z_axis[1]
-    rknee_zz=rknee_z_axis[2]
-    
-    # L KNEE
-        # origin
-    lknee_origin = L_Knee_center_form
-    lknee_ox=lknee_origin[0]
-    lknee_oy=lknee_origin[1]
-    lknee_oz=lknee_origin[2]
-        # xaxis
-    lknee_x_axis = L_Knee_axis_form[0]
-    lknee_xx=lknee_x_axis[0]
-    lknee_xy=lknee_x_axis[1]
-    lknee_xz=lknee_x_axis[2]
-        # yaxis
-    lknee_y_axis = L_Knee_axis_form[1]
-    lknee_yx=lknee_y_axis[0]
-    lknee_yy=lknee_y_axis[1]
-    lknee_yz=lknee_y_axis[2]
-        # zaxis
-    lknee_z_axis = L_Knee_axis_form[2]
-    lknee_zx=lknee_z_axis[0]
-    lknee_zy=lknee_z_axis[1]
-    lknee_zz=lknee_z_axis[2]
-    
-    # R ANKLE
-        # origin
-    rank_origin = R_Ankle_center_form
-    rank_ox=rank_origin[0]
-    rank_oy=rank_origin[1]
-    rank_oz=rank_origin[2]
-        # xaxis
-    rank_x_axis = R_Ankle_axis_form[0]
-    rank_xx=rank_x_axis[0]
-    rank_xy=rank_x_axis[1]
-    rank_xz=rank_x_axis[2]
-        # yaxis
-    rank_y_axis = R_Ankle_axis_form[1]
-    rank_yx=rank_y_axis[0]
-    rank_yy=rank_y_axis[1]
-    rank_yz=rank_y_axis[2]
-        # zaxis
-    rank_z_axis = R_Ankle_axis_form[2]
-    rank_zx=rank_z_axis[0]
-    rank_zy=rank_z_axis[1]
-    rank_zz=rank_z_axis[2]
-    
-    # L ANKLE
-        # origin
-    lank_origin = L_Ankle_center_form
-    lank_ox=lank_origin[0]
-    lank_oy=lank_origin[1]
-    lank_oz=lank_origin[2]
-        # xaxis
-    lank_x_axis = L_Ankle_axis_form[0]
-    lank_xx=lank_x_axis[0]
-    lank_xy=lank_x_axis[1]
-    lank_xz=lank_x_axis[2]
-        # yaxis
-    lank_y_axis = L_Ankle_axis_form[1]
-    lank_yx=lank_y_axis[0]
-    lank_yy=lank_y_axis[1]
-    lank_yz=lank_y_axis[2]
-        # zaxis
-    lank_z_axis = L_Ankle_axis_form[2]
-    lank_zx=lank_z_axis[0]
-    lank_zy=lank_z_axis[1]
-    lank_zz=lank_z_axis[2]
-    
-    # R FOOT
-        # origin
-    rfoot_origin = R_Foot_center_form
-    rfoot_ox=rfoot_origin[0]
-    rfoot_oy=rfoot_origin[1]
-    rfoot_oz=rfoot_origin[2]
-        # xaxis
-    rfoot_x_axis = R_Foot_axis_form[0]
-    rfoot_xx=rfoot_x_axis[0]
-    rfoot_xy=rfoot_x_axis[1]
-    rfoot_xz=rfoot_x_axis[2]
-        # yaxis
-    rfoot_y_axis = R_Foot_axis_form[1]
-    rfoot_yx=rfoot_y_axis[0]
-    rfoot_yy=rfoot_y_axis[1]
-    rfoot_yz=rfoot_y_axis[2]
-        # zaxis
-    rfoot_z_axis = R_Foot_axis_form[2]
-    rfoot_zx=rfoot_z_axis[0]
-    rfoot_zy=rfoot_z_axis[1]
-    rfoot_zz=rfoot_z_axis[2]
-    
-    # L FOOT
-        # origin
-    lfoot_origin = L_Foot_center_form
-    lfoot_ox=lfoot_origin[0]
-    lfoot_oy=lfoot_origin[1]
-    lfoot_oz=lfoot_origin[2]
-        # xaxis
-    lfoot_x_axis = L_Foot_axis_form[0]
-    lfoot_xx=lfoot_x_axis[0]
-    lfoot_xy=lfoot_x_axis[1]
-    lfoot_xz=lfoot_x_axis[2]
-        # yaxis
-    lfoot_y_axis = L_Foot_axis_form[1]
-    lfoot_yx=lfoot_y_axis[0]
-    lfoot_yy=lfoot_y_axis[1]
-    lfoot_yz=lfoot_y_axis[2]
-        # zaxis
-    lfoot_z_axis = L_Foot_axis_form[2]
-    lfoot_zx=lfoot_z_axis[0]
-    lfoot_zy=lfoot_z_axis[1]
-    lfoot_zz=lfoot_z_axis[2]
-    
-    # HEAD
-        # origin
-    head_origin = Head_center_form
-    head_ox=head_origin[0]
-    head_oy=head_origin[1]
-    head_oz=head_origin[2]
-        # xaxis
-    head_x_axis = Head_axis_form[0]
-    head_xx=head_x_axis[0]
-    head_xy=head_x_axis[1]
-    head_xz=head_x_axis[2]
-        # yaxis
-    head_y_axis = Head_axis_form[1]
-    head_yx=head_y_axis[0]
-    head_yy=head_y_axis[1]
-    head_yz=head_y_axis[2]
-        # zaxis
-    head_z_axis = Head_axis_form[2]
-    head_zx=head_z_axis[0]
-    head_zy=head_z_axis[1]
-    head_zz=head_z_axis[2]
-    
-    # THORAX
-        # origin
-    tho_origin = Thorax_center_form
-    tho_ox=tho_origin[0]
-    tho_oy=tho_origin[1]
-    tho_oz=tho_origin[2]
-        # xaxis
-    tho_x_axis = Thorax_axis_form[0]
-    tho_xx=tho_x_axis[0]
-    tho_xy=tho_x_axis[1]
-    tho_xz=tho_x_axis[2]
-        # yaxis
-    tho_y_axis = Thorax_axis_form[1]
-    tho_yx=tho_y_axis[0]
-    tho_yy=tho_y_axis[1]
-    tho_yz=tho_y_axis[2]
-        # zaxis
-    tho_z_axis = Thorax_axis_form[2]
-    tho_zx=tho_z_axis[0]
-    tho_zy=tho_z_axis[1]
-    tho_zz=tho_z_axis[2]
-    
-    # R CLAVICLE
-        # origin
-    rclav_origin = R_Clavicle_center_form
-    rclav_ox=rclav_origin[0]
-    rclav_oy=rclav_origin[1]
-    rclav_oz=rclav_origin[2]
-        # xaxis
-    rclav_x_axis = R_Clavicle_axis_form[0]
-    rclav_xx=rclav_x_axis[0]
-    rclav_xy=rclav_x_axis[1]
-    rclav_xz=rclav_x_axis[2]
-        # yaxis
-    rclav_y_axis = R_Clavicle_axis_form[1]
-    rclav_yx=rclav_y_axis[0]
-    rclav_yy=rclav_y_axis[1]
-    rclav_yz=rclav_y_axis[2]
-        # zaxis
-    rclav_z_axis = R_Clavicle_axis_form[2]
-    rclav_zx=rclav_z_axis[0]
-    rclav_zy=rclav_z_axis[1]
-    rclav_zz=rclav_z_axis[2]
-    
-    # L CLAVICLE
-        # origin
-    lclav_origin = L_Clavicle_center_form
-    lclav_ox=lclav_origin[0]
-    lclav_oy=lclav_origin[1]
-    lclav_oz=lclav_origin[2]
-        # xaxis
-    lclav_x_axis = L_Clavicle_axis_form[0]
-    lclav_xx=lclav_x_axis[0]
-    lclav_xy=lclav_x_axis[1]
-    lclav_xz=lclav_x_axis[2]
-        # yaxis
-    lclav_y_axis = L_Clavicle_axis_form[1]
-    lclav_yx=lclav_y_axis[0]
-    lclav_yy=lclav_y_axis[1]
-    lclav_yz=lclav_y_axis[2]
-        # zaxis
-    lclav_z_axis = L_Clavicle_axis_form[2]
-    lclav_zx=lclav_z_axis[0]
-    lclav_zy=lclav_z_axis[1]
-    lclav_zz=lclav_z_axis[2]
-    
-    # R HUMERUS
-        # origin
-    rhum_origin = R_Humerus_center_form
-    rhum_ox=rhum_origin[0]
-    rhum_oy=rhum_origin[1]
-    rhum_oz=rhum_origin[2]
-        # xaxis
-    rhum_x_axis = R_Humerus_axis_form[0]
-    rhum_xx=rhum_x_axis[0]
-    rhum_xy=rhum_x_axis[1]
-    rhum_xz=rhum_x_axis[2]
-        # yaxis
-    rhum_y_axis = R_Humerus_axis_form[1]
-    rhum_yx=rhum_y_axis[0]
-    rhum_yy=rhum_y_axis[1]
-    rhum_yz=rhum_y_axis[2]
-        # zaxis
-    rhum_z_axis = R_Humerus_axis_form[2]
-    rhum_zx=rhum_z_axis[0]
-    rhum_zy=rhum_z_axis[1]
-    rhum_zz=rhum_z_axis[2]
-    
-    # L HUMERUS
-        # origin
-    lhum_origin = L_Humerus_center_form
-    lhum_ox=lhum_origin[0]
-    lhum_oy=lhum_origin[1]
-    lhum_oz=lhum_origin[2]
-        # xaxis
-    lhum_x_axis = L_Humerus_axis_form[0]
-    lhum_xx=lhum_x_axis[0]
-    lhum_xy=lhum_x_axis[1]
-    lhum_xz=lhum_x_axis[2]
-        # yaxis
-    lhum_y_axis = L_Humerus_axis_form[1]
-    lhum_yx=lhum_y_axis[0]
-    lhum_yy=lhum_y_axis[1]
-    lhum_yz=lhum_y_axis[2]
-        # zaxis
-    lhum_z_axis = L_Humerus_axis_form[2]
-    lhum_zx=lhum_z_axis[0]
-    lhum_zy=lhum_z_axis[1]
-    lhum_zz=lhum_z_axis[2]
-    
-    # R RADIUS
-        # origin
-    rrad_origin = R_Radius_center_form
-    rrad_ox=rrad_origin[0]
-    rrad_oy=rrad_origin[1]
-    rrad_oz=rrad_origin[2]
-        # xaxis
-    rrad_x_axis = R_Radius_axis_form[0]
-    rrad_xx=rrad_x_axis[0]
-    rrad_xy=rrad_x_axis[1]
-    rrad_xz=rrad_x_axis[2]
-        # yaxis
-    rrad_y_axis = R_Radius_axis_form[1]
-    rrad_yx=rrad_y_axis[0]
-    rrad_yy=rrad_y_axis[1]
-    rrad_yz=rrad_y_axis[2]
-        # zaxis
-    rrad_z_axis = R_Radius_axis_form[2]
-    rrad_zx=rrad_z_axis[0]
-    rrad_zy=rrad_z_axis[1]
-    rrad_zz=rrad_z_axis[2]
-    
-    # L RADIUS
-        # origin
-    lrad_origin = L_Radius_center_form
-    lrad_ox=lrad_origin[0]
-    lrad_oy=lrad_origin[1]
-    lrad_oz=lrad_origin[2]
-        # xaxis
-    lrad_x_axis = L_Radius_axis_form[0]
-    lrad_xx=lrad_x_axis[0]
-    lrad_xy=lrad_x_axis[1]
-    lrad_xz=lrad_x_axis[2]
-        # yaxis
-    lrad_y_axis = L_Radius_axis_form[1]
-    lrad_yx=lrad_y_axis[0]
-    lrad_yy=lrad_y_axis[1]
-    lrad_yz=lrad_y_axis[2]
-        # zaxis
-    lrad_z_axis = L_Radius_axis_form[2]
-    lrad_zx=lrad_z_axis[0]
-    lrad_zy=lrad_z_axis[1]
-    lrad_zz=lrad_z_axis[2]
-    
-    # R HAND
-        # origin
-    rhand_origin = R_Hand_center_form
-    rhand_ox=rhand_origin[0]
-    rhand_oy=rhand_origin[1]
-    rhand_oz=rhand_origin[2]
-        # xaxis
-    rhand_x_axis= R_Hand_axis_form[0]
-    rhand_xx=rhand_x_axis[0]
-    rhand_xy=rhand_x_axis[1]
-    rhand_xz=rhand_x_axis[2]
-        # yaxis
-    rhand_y_axis= R_Hand_axis_form[1]
-    rhand_yx=rhand_y_axis[0]
-    rhand_yy=rhand_y_axis[1]
-    rhand_yz=rhand_y_axis[2]
-        # zaxis
-    rhand_z_axis= R_Hand_axis_form[2]
-    rhand_zx=rhand_z_axis[0]
-    rhand_zy=rhand_z_axis[1]
-    rhand_zz=rhand_z_axis[2]
-    
-    # L HAND
-        # origin
-    lhand_origin = L_Hand_center_form
-    lhand_ox=lhand_origin[0]
-    lhand_oy=lhand_origin[1]
-    lhand_oz=lhand_origin[2]
-        # xaxis
-    lhand_x_axis = L_Hand_axis_form[0]
-    lhand_xx=lhand_x_axis[0]
-    lhand_xy=lhand_x_axis[1]
-    lhand_xz=lhand_x_axis[2]
-        # yaxis
-    lhand_y_axis = L_Hand_axis_form[1]
-    lhand_yx=lhand_y_axis[0]
-    lhand_yy=lhand_y_axis[1]
-    lhand_yz=lhand_y_axis[2]
-        # zaxis
-    lhand_z_axis = L_Hand_axis_form[2]
-    lhand_zx=lhand_z_axis[0]
-    lhand_zy=lhand_z_axis[1]
-    lhand_zz=lhand_z_axis[2]
-    #-----------------------------------------------------
-    
     #Store everything in an array to send back to results of process 
 
-    r=[
+    angles=[
     pelx,pely,pelz,
     rhipx,rhipy,rhipz,
     lhipx,lhipy,lhipz,
@@ -3412,28 +3166,39 @@ def JointAngleCalc(frame,vsk):
     relbx,relby,relbz,
     lelbx,lelby,lelbz,
     rwrtx,rwrty,rwrtz,
-    lwrtx,lwrty,lwrtz,
-    pel_ox,pel_oy,pel_oz,pel_xx,pel_xy,pel_xz,pel_yx,pel_yy,pel_yz,pel_zx,pel_zy,pel_zz,
-    hip_ox,hip_oy,hip_oz,hip_xx,hip_xy,hip_xz,hip_yx,hip_yy,hip_yz,hip_zx,hip_zy,hip_zz,
-    rknee_ox,rknee_oy,rknee_oz,rknee_xx,rknee_xy,rknee_xz,rknee_yx,rknee_yy,rknee_yz,rknee_zx,rknee_zy,rknee_zz,
-    lknee_ox,lknee_oy,lknee_oz,lknee_xx,lknee_xy,lknee_xz,lknee_yx,lknee_yy,lknee_yz,lknee_zx,lknee_zy,lknee_zz,
-    rank_ox,rank_oy,rank_oz,rank_xx,rank_xy,rank_xz,rank_yx,rank_yy,rank_yz,rank_zx,rank_zy,rank_zz,
-    lank_ox,lank_oy,lank_oz,lank_xx,lank_xy,lank_xz,lank_yx,lank_yy,lank_yz,lank_zx,lank_zy,lank_zz,
-    rfoot_ox,rfoot_oy,rfoot_oz,rfoot_xx,rfoot_xy,rfoot_xz,rfoot_yx,rfoot_yy,rfoot_yz,rfoot_zx,rfoot_zy,rfoot_zz,
-    lfoot_ox,lfoot_oy,lfoot_oz,lfoot_xx,lfoot_xy,lfoot_xz,lfoot_yx,lfoot_yy,lfoot_yz,lfoot_zx,lfoot_zy,lfoot_zz,
-    head_ox,head_oy,head_oz,head_xx,head_xy,head_xz,head_yx,head_yy,head_yz,head_zx,head_zy,head_zz,
-    tho_ox,tho_oy,tho_oz,tho_xx,tho_xy,tho_xz,tho_yx,tho_yy,tho_yz,tho_zx,tho_zy,tho_zz,
-    rclav_ox,rclav_oy,rclav_oz,rclav_xx,rclav_xy,rclav_xz,rclav_yx,rclav_yy,rclav_yz,rclav_zx,rclav_zy,rclav_zz,
-    lclav_ox,lclav_oy,lclav_oz,lclav_xx,lclav_xy,lclav_xz,lclav_yx,lclav_yy,lclav_yz,lclav_zx,lclav_zy,lclav_zz,
-    rhum_ox,rhum_oy,rhum_oz,rhum_xx,rhum_xy,rhum_xz,rhum_yx,rhum_yy,rhum_yz,rhum_zx,rhum_zy,rhum_zz,
-    lhum_ox,lhum_oy,lhum_oz,lhum_xx,lhum_xy,lhum_xz,lhum_yx,lhum_yy,lhum_yz,lhum_zx,lhum_zy,lhum_zz,
-    rrad_ox,rrad_oy,rrad_oz,rrad_xx,rrad_xy,rrad_xz,rrad_yx,rrad_yy,rrad_yz,rrad_zx,rrad_zy,rrad_zz,
-    lrad_ox,lrad_oy,lrad_oz,lrad_xx,lrad_xy,lrad_xz,lrad_yx,lrad_yy,lrad_yz,lrad_zx,lrad_zy,lrad_zz,
-    rhand_ox,rhand_oy,rhand_oz,rhand_xx,rhand_xy,rhand_xz,rhand_yx,rhand_yy,rhand_yz,rhand_zx,rhand_zy,rhand_zz,
-    lhand_ox,lhand_oy,lhand_oz,lhand_xx,lhand_xy,lhand_xz,lhand_yx,lhand_yy,lhand_yz,lhand_zx,lhand_zy,lhand_zz
+    lwrtx,lwrty,lwrtz
     ]
 
-    r=np.array(r,dtype=np.float64)
+    # each axis is stored as its origin followed by the x, y and z axis
+    axes=[(Pelvis_origin,Pelvis_vectors),
+          (Hip_center_form,Hip_axis_form),
+          (R_Knee_center_form,R_Knee_axis_form),
+          (L_Knee_center_form,L_Knee_axis_form),
+          (R_Ankle_center_form,R_Ankle_axis_form),
+          (L_Ankle_center_form,L_Ankle_axis_form),
+          (R_Foot_center_form,R_Foot_axis_form),
+          (L_Foot_center_form,L_Foot_axis_form),
+          (Head_center_form,Head_axis_form),
+          (Thorax_center_form,Thorax_axis_form),
+          (R_Clavicle_center_form,R_Clavicle_axis_form),
+          (L_Clavicle_center_form,L_Clavicle_axis_form),
+          (R_Humerus_center_form,R_Humerus_axis_form),
+          (L_Humerus_center_form,L_Humerus_axis_form),
+          (R_Radius_center_form,R_Radius_axis_form),
+          (L_Radius_center_form,L_Radius_axis_form),
+          (R_Hand_center_form,R_Hand_axis_form),
+          (L_Hand_center_form,L_Hand_axis_form)]
+
+    if out is None:
+        out=np.empty(len(angles)+12*len(axes))
+    #write the row in place in the array given by the caller
+    out[:len(angles)]=angles
+    for k,(origin,axis) in enumerate(axes):
+        start=len(angles)+12*k
+        out[start:start+3]=origin
+        out[start+3:start+12]=np.ravel(axis)
+    r=out
+
     
     
     #Put temporary dictionary for joint centers to return for now, then modify later
@@ -3475,4 +3240,8 @@ def JointAngleCalc(frame,vsk):
     jc['RHand'] = kin_R_Hand_JC
     jc['LHand'] = kin_L_Hand_JC
     
+    if jcOut is not None:
+        for i,key in enumerate(jointCenterKeys()):
+            jcOut[i]=jc[key]
+    
     return r,jc
\ No newline at end of file
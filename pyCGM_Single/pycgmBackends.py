@@ -0,0 +1,451 @@
+#pyCGM
+
+# Copyright (c) 2015 Mathew Schwartz <umcadop@gmail.com>
+# Core Developers: Seungeun Yeon, Mathew Schwartz
+# Contributors Filipe Alves Caixeta, Robert Van-wesep
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+# Execution backends of calcAngles. Every backend splits the frames of a
+# trial into contiguous blocks with splitFrames and calculates each block
+# with calcBlock into its rows of one (frames, 273) array, so they all give
+# the same result and only differ in where the blocks are calculated.
+
+import sys
+import time
+import multiprocessing
+import numpy as np
+from .pyCGM import JointAngleCalc, SubjectModel, jointCenterKeys
+from .pycgmIO import MarkerSet
+from . import pycgmBatch
+
+#shared memory, needed by the processes backend, is new in Python 3.8
+try:
+    from multiprocessing import shared_memory
+except ImportError:
+    shared_memory=None
+
+#names of the backends can be unicode on Python 2
+stringTypes=(str,type(u''))
+
+#Number of values of a frame of the result and of the joint centers
+EA=19*3+72*3
+JC=len(jointCenterKeys())
+
+#time.perf_counter is not in Python 2
+clock=getattr(time,'perf_counter',time.time)
+
+def cpu_count():
+    """Returns the number of cpus, 1 if it is not known."""
+    try:
+        return multiprocessing.cpu_count()
+    except NotImplementedError:
+        return 1
+
+def splitFrames(nframes,parts):
+    """Frame block function
+
+    Splits the frames into contiguous blocks, as evenly as possible.
+
+    Parameters
+    ----------
+    nframes : int
+        Number of frames.
+    parts : int
+        Number of blocks.
+
+    Returns
+    -------
+    list
+        (start, end) of each block. Blocks are empty when there are more
+        blocks than frames.
+
+    Examples
+    --------
+    >>> from .pycgmBackends import splitFrames
+    >>> splitFrames(10,4)
+    [(0, 3), (3, 6), (6, 8), (8, 10)]
+    """
+    counts=[nframes//parts+(1 if i<nframes%parts else 0) for i in range(parts)]
+    ends=np.cumsum(counts).tolist()
+    return [(end-count,end) for count,end in zip(counts,ends)]
+
+def calcBlock(markers,vsk,start,end,out,jcOut,vectorize=False,blockSize=None):
+    """Block calculation function
+
+    Calculates the frames start to end of a trial into the same rows of
+    out and jcOut. This is what every backend runs for each block.
+
+    Parameters
+    ----------
+    markers : MarkerSet
+        Marker data of the trial.
+    vsk : dict
+        Subject measurements, the output of getStatic, or a SubjectModel.
+    start, end : int
+        Frames of the block.
+    out : array
+        (frames, 273) array of the trial.
+    jcOut : array
+        (frames, 27, 3) array of the joint centers of the trial.
+    vectorize : bool, optional
+        If True the block is calculated at once with pycgmBatch instead of
+        frame by frame.
+    blockSize : int, optional
+        If given, a vectorized block is calculated blockSize frames at a
+        time, so the temporary arrays of pycgmBatch stay in the cache.
+    """
+    if end<=start:
+        return
+    if vectorize:
+        step=blockSize or end-start
+        for i in range(start,end,step):
+            j=min(i+step,end)
+            pycgmBatch.JointAngleCalc(markers[i:j].markers(),vsk,out[i:j],jcOut[i:j])
+        return
+    if not isinstance(vsk,SubjectModel):
+        vsk=SubjectModel(vsk)
+    for i in range(start,end):
+        JointAngleCalc(markers[i],vsk,out[i],jcOut[i])
+
+class SerialBackend(object):
+    """Calculates all the frames in the calling thread.
+
+    Parameters
+    ----------
+    workers : int, optional
+        Not used, for the same arguments as the other backends.
+    """
+    name='serial'
+
+    def __init__(self,workers=None):
+        self.workers=1
+
+    def blocks(self,nframes):
+        """Returns the (start, end) blocks the frames are calculated in."""
+        return splitFrames(nframes,self.workers)
+
+    def run(self,markers,vsk,out,jcOut,vectorize=None):
+        """Calculates all the frames of markers into out and jcOut."""
+        for start,end in self.blocks(len(markers)):
+            calcBlock(markers,vsk,start,end,out,jcOut,vectorize)
+
+    def close(self):
+        """Frees the workers of the backend."""
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self,*args):
+        self.close()
+
+class ThreadBackend(SerialBackend):
+    """Calculates one block of frames in each thread of a thread pool.
+
+    Each thread calculates its contiguous block with the vectorized
+    functions of pycgmBatch, which spend most of their time in numpy
+    kernels that release the GIL, so the threads run on several cores
+    without starting processes. The markers are read through views and the
+    threads write into their rows of out and jcOut, so nothing is copied.
+    The pool is a multiprocessing.pool.ThreadPool, as Python 2 has no
+    concurrent.futures. It is started on the first run and kept until
+    close.
+
+    The result is the one of vectorize, which only differs from the frame
+    by frame one by floating point rounding. Calling calcAngles with
+    vectorize=False calculates the blocks frame by frame with the result
+    of the serial backend, but the threads then hold the GIL and only one
+    runs at a time.
+
+    Parameters
+    ----------
+    workers : int, optional
+        Number of threads. The default is the number of cpus.
+    vectorize : bool, optional
+        Whether the blocks are calculated with pycgmBatch when calcAngles
+        is not given vectorize. The default is True.
+    blockSize : int, optional
+        Number of frames each thread calculates at a time. The default is
+        4096.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from .pycgmBackends import ThreadBackend
+    >>> from .pyCGM_Helpers import getfilenames
+    >>> from . import pycgmCalc, pycgmIO, pycgmStatic
+    >>> fileNames = getfilenames(2)
+    >>> data = pycgmIO.MarkerSet(*pycgmIO.loadC3DArray(fileNames[1]))
+    >>> vsk = pycgmStatic.getStatic(data,pycgmIO.loadVSK(fileNames[2],False),False)
+    >>> serial = pycgmCalc.calcAngles(data,vsk=vsk,end=20,splitAnglesAxis=False,formatData=False)
+    >>> with ThreadBackend(3,blockSize=4) as backend:
+    ...     threads = pycgmCalc.calcAngles(data,vsk=vsk,end=20,splitAnglesAxis=False,
+    ...                                    formatData=False,backend=backend)
+    ...     model = pycgmCalc.calcAngles(data,vsk=pycgmCalc.SubjectModel(vsk),end=20,
+    ...                                  splitAnglesAxis=False,formatData=False,backend=backend)
+    ...     frames = pycgmCalc.calcAngles(data,vsk=vsk,end=20,splitAnglesAxis=False,
+    ...                                   formatData=False,backend=backend,vectorize=False)
+    >>> np.allclose(serial,threads,equal_nan=True), np.allclose(threads,model,equal_nan=True)
+    (True, True)
+    >>> np.testing.assert_array_equal(frames,serial)
+    """
+    name='threads'
+
+    def __init__(self,workers=None,vectorize=True,blockSize=4096):
+        self.workers=workers or cpu_count()
+        self.vectorize=vectorize
+        self.blockSize=blockSize
+        self.pool=None
+
+    def run(self,markers,vsk,out,jcOut,vectorize=None):
+        from multiprocessing.pool import ThreadPool
+        if self.pool is None:
+            self.pool=ThreadPool(self.workers)
+        if vectorize is None:
+            vectorize=self.vectorize
+        if not vectorize and not isinstance(vsk,SubjectModel):
+            vsk=SubjectModel(vsk)
+        results=[self.pool.apply_async(calcBlock,(markers,vsk,start,end,out,jcOut,vectorize,self.blockSize))
+                 for start,end in self.blocks(len(markers))]
+        for result in results:
+            result.get()
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool=None
+
+def _sharedArray(shape,name=None):
+    if name is None:
+        shm=shared_memory.SharedMemory(create=True,size=max(int(np.prod(shape))*8,1))
+    else:
+        shm=shared_memory.SharedMemory(name=name)
+    return shm,np.ndarray(shape,dtype=np.float64,buffer=shm.buf)
+
+def _processBlock(task):
+    names,labels,nframes,vsk,start,end,vectorize=task
+    shm=[]
+    arrays=[]
+    try:
+        for name,shape in zip(names,((nframes,len(labels),3),(nframes,EA),(nframes,JC,3))):
+            s,array=_sharedArray(shape,name)
+            shm.append(s)
+            arrays.append(array)
+        calcBlock(MarkerSet(labels,arrays[0]),vsk,start,end,arrays[1],arrays[2],vectorize)
+    finally:
+        #the views have to be gone before the memory is closed
+        del arrays[:]
+        for s in shm:
+            s.close()
+
+class ProcessBackend(SerialBackend):
+    """Calculates one block of frames in each process of a process pool.
+
+    The marker data is copied once into shared memory, and each process
+    writes its rows of the result into shared arrays that are copied into
+    out at the end, so only the names of the shared memory, the labels,
+    the vsk and the block are sent to the processes. The pool is started
+    on the first run and kept until close. Needs Python 3.8 or later.
+
+    Parameters
+    ----------
+    workers : int, optional
+        Number of processes. The default is the number of cpus.
+    """
+    name='processes'
+
+    def __init__(self,workers=None):
+        if shared_memory is None:
+            raise Exception("The processes backend needs Python 3.8 or later")
+        self.workers=workers or cpu_count()
+        self.pool=None
+
+    def run(self,markers,vsk,out,jcOut,vectorize=None):
+        from concurrent.futures import ProcessPoolExecutor
+        if self.pool is None:
+            self.pool=ProcessPoolExecutor(self.workers)
+        nframes=len(markers)
+        shm=[]
+        arrays=[]
+        try:
+            for shape in (markers.data.shape,(nframes,EA),(nframes,JC,3)):
+                s,array=_sharedArray(shape)
+                shm.append(s)
+                arrays.append(array)
+            arrays[0][...]=markers.data
+            names=[s.name for s in shm]
+            tasks=[(names,markers.labels,nframes,dict(vsk),start,end,vectorize)
+                   for start,end in self.blocks(nframes)]
+            list(self.pool.map(_processBlock,tasks))
+            out[...]=arrays[1]
+            jcOut[...]=arrays[2]
+        finally:
+            #the views have to be gone before the memory is closed
+            del arrays[:]
+            for s in shm:
+                s.close()
+                s.unlink()
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool=None
+
+class MPIBackend(SerialBackend):
+    """Calculates one block of frames on each rank of an MPI communicator.
+
+    Every rank calls calcAngles with the same trial, calculates its own
+    block and the blocks are exchanged with Allgatherv, so every rank gets
+    the whole result. Needs mpi4py.
+
+    Parameters
+    ----------
+    workers : int, optional
+        Not used, there is one block per rank.
+    comm : mpi4py communicator, optional
+        The default is MPI.COMM_WORLD.
+    """
+    name='mpi'
+
+    def __init__(self,workers=None,comm=None):
+        from mpi4py import MPI
+        self.MPI=MPI
+        self.comm=comm or MPI.COMM_WORLD
+        self.workers=self.comm.Get_size()
+
+    def run(self,markers,vsk,out,jcOut,vectorize=None):
+        blocks=self.blocks(len(markers))
+        start,end=blocks[self.comm.Get_rank()]
+        calcBlock(markers,vsk,start,end,out,jcOut,vectorize)
+        starts=np.array([block[0] for block in blocks])
+        counts=np.array([block[1]-block[0] for block in blocks])
+        for array,size in ((out,EA),(jcOut,JC*3)):
+            self.comm.Allgatherv(self.MPI.IN_PLACE,
+                                 [array,counts*size,starts*size,self.MPI.DOUBLE])
+
+BACKENDS={'serial':SerialBackend,'threads':ThreadBackend,
+          'processes':ProcessBackend,'mpi':MPIBackend}
+
+def getBackend(backend,workers=None):
+    """Backend function
+
+    Parameters
+    ----------
+    backend : str or backend
+        'serial', 'threads', 'processes' or 'mpi', or a backend object,
+        which is returned as it is so its pool can be used again.
+    workers : int, optional
+        Number of threads or processes.
+
+    Returns
+    -------
+    backend
+        The backend object.
+    """
+    if not isinstance(backend,stringTypes):
+        return backend
+    if backend not in BACKENDS:
+        raise Exception("Unknown backend "+backend+", it has to be one of "+", ".join(BACKENDS))
+    return BACKENDS[backend](workers)
+
+def benchmark(markers,vsk,threads=None,repeat=3,blockSize=4096):
+    """Thread scaling benchmark
+
+    Calculates all the frames of markers with the threads backend and the
+    vectorized functions for each number of threads and reports the time and the speed-up over one
+    thread.
+
+    Parameters
+    ----------
+    markers : MarkerSet
+        Marker data of the trial. Long trials give the steadiest times.
+    vsk : dict
+        Subject measurements, the output of getStatic.
+    threads : list, optional
+        Numbers of threads to run. The default is 1 to the number of cpus.
+    repeat : int, optional
+        Number of runs of each number of threads, the fastest is kept. The
+        default is 3.
+    blockSize : int, optional
+        Frames each thread calculates at a time, see ThreadBackend.
+
+    Returns
+    -------
+    list
+        (threads, seconds, frames per second, speed-up) of each number of
+        threads.
+
+    Examples
+    --------
+    >>> from .pycgmBackends import benchmark
+    >>> from .pyCGM_Helpers import getfilenames
+    >>> from . import pycgmIO, pycgmStatic
+    >>> fileNames = getfilenames(2)
+    >>> data = pycgmIO.MarkerSet(*pycgmIO.loadC3DArray(fileNames[1]))
+    >>> vsk = pycgmStatic.getStatic(data,pycgmIO.loadVSK(fileNames[2],False),False)
+    >>> [row[0] for row in benchmark(data,vsk,threads=[1,2],repeat=1)]
+    [1, 2]
+    """
+    if threads is None:
+        threads=range(1,cpu_count()+1)
+    nframes=len(markers)
+    out=np.empty((nframes,EA))
+    jcOut=np.empty((nframes,JC,3))
+    results=[]
+    for n in threads:
+        with ThreadBackend(n,blockSize=blockSize) as backend:
+            #the first run starts the threads and is not timed
+            backend.run(markers[:min(nframes,n)],vsk,out,jcOut)
+            best=float('inf')
+            for i in range(repeat):
+                start=clock()
+                backend.run(markers,vsk,out,jcOut)
+                best=min(best,clock()-start)
+        results.append((n,best,nframes/best,results[0][1]/best if results else 1.0))
+    return results
+
+if __name__ == '__main__':
+    #python -m pyCGM_Single.pycgmBackends [static c3d] [vsk] [frames] [threads]
+    from .pycgmIO import loadC3DArray, loadVSK
+    from .pycgmStatic import getStatic
+    from .pyCGM_Helpers import getfilenames
+
+    fileNames=getfilenames(2)
+    static_trial=fileNames[1]
+    vsk_file=fileNames[2]
+    nframes=100000
+    threads=None
+    if len(sys.argv)>2:
+        static_trial=sys.argv[1]
+        vsk_file=sys.argv[2]
+    if len(sys.argv)>3:
+        nframes=int(sys.argv[3])
+    if len(sys.argv)>4:
+        threads=range(1,int(sys.argv[4])+1)
+
+    labels,points=loadC3DArray(static_trial)
+    vsk=getStatic(MarkerSet(labels,points),loadVSK(vsk_file,False),flat_foot=False)
+    #the trial is repeated up to nframes to get a long trial
+    points=np.resize(points,(nframes,)+points.shape[1:])
+    print("%d frames, %d cpus" % (nframes,cpu_count()))
+    print("threads\ttime (s)\tframes/s\tspeed-up")
+    for n,seconds,rate,speedup in benchmark(MarkerSet(labels,points),vsk,threads):
+        print("%d\t%.3f\t\t%.0f\t\t%.2f" % (n,seconds,rate,speedup))
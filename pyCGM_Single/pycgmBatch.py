@@ -0,0 +1,2625 @@
+#pyCGM
+
+# Copyright (c) 2015 Mathew Schwartz <umcadop@gmail.com>
+# Core Developers: Seungeun Yeon, Mathew Schwartz
+# Contributors Filipe Alves Caixeta, Robert Van-wesep
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+# Whole trial (batched) version of the kinematics in pyCGM.py
+#
+# Every function in this file follows the function of the same name in pyCGM.py
+# step by step, but instead of a single frame it takes a stack of frames.
+# A frame here is a dictionary of marker names with an (N,3) array of x,y,z
+# positions for each marker, where N is the number of frames. Joint centers
+# are returned as (N,3) arrays and axes as (N,3,3) arrays where the rows are
+# the x, y and z axis (with the origin added back, as in pyCGM.py).
+
+import numpy as np
+from math import pi, sin, cos, radians, degrees
+from .pyCGM import rotmat, jointCenterKeys
+
+def norm(v):
+    """Stacked vector norm function
+
+    Calculates the length of every 3-dimensional vector in a stack.
+
+    Parameters
+    ----------
+    v : array
+        An (N,3) array of vectors.
+
+    Returns
+    -------
+    array
+        An (N,) array with the length of each vector.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from .pycgmBatch import norm
+    >>> v = np.array([[-212.5847224, 269.02502004, 73.80931846],
+    ...               [3.0, 4.0, 0.0]])
+    >>> np.around(norm(v),8)
+    array([350.73428845,   5.        ])
+    """
+    v = np.asarray(v)
+    return np.sqrt(v[...,0]*v[...,0]+v[...,1]*v[...,1]+v[...,2]*v[...,2])
+
+def unit(v):
+    """Stacked vector normalization function
+
+    Divides every 3-dimensional vector in a stack by its length.
+    Vectors containing NaN stay NaN.
+
+    Parameters
+    ----------
+    v : array
+        An (N,3) array of vectors.
+
+    Returns
+    -------
+    array
+        An (N,3) array of unit vectors.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from .pycgmBatch import unit
+    >>> v = np.array([[3.0, 4.0, 0.0],
+    ...               [0.0, 0.0, 2.0]])
+    >>> unit(v)
+    array([[0.6, 0.8, 0. ],
+           [0. , 0. , 1. ]])
+    """
+    v = np.asarray(v)
+    return v/norm(v)[...,np.newaxis]
+
+def cross(a, b):
+    """Stacked cross product function
+
+    Given stacks of vectors a and b, calculate the cross product of each pair.
+
+    Parameters
+    ----------
+    a : array
+        An (N,3) array of vectors.
+    b : array
+        An (N,3) array of vectors.
+
+    Returns
+    -------
+    c : array
+        An (N,3) array of the cross product of each a and b.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from .pycgmBatch import cross
+    >>> a = np.array([[6.25286248, 7.91367254, 18.63620527]])
+    >>> b = np.array([[3.49290439, 4.42038315, 19.23948238]])
+    >>> np.around(cross(a, b),8)
+    array([[ 6.98757956e+01, -5.52073543e+01, -1.65361000e-03]])
+    """
+    a = np.asarray(a)
+    b = np.asarray(b)
+    c = np.empty(np.broadcast(a, b).shape)
+    c[...,0] = a[...,1]*b[...,2] - a[...,2]*b[...,1]
+    c[...,1] = a[...,2]*b[...,0] - a[...,0]*b[...,2]
+    c[...,2] = a[...,0]*b[...,1] - a[...,1]*b[...,0]
+    return c
+
+def axisStack(x_axis,y_axis,z_axis):
+    """Stack axis function
+
+    Puts the x, y and z axis of a segment for every frame into a single array.
+
+    Parameters
+    ----------
+    x_axis, y_axis, z_axis : array
+        (N,3) arrays of the x, y and z axis of a segment.
+
+    Returns
+    -------
+    array
+        An (N,3,3) array where the rows of each frame are the x, y and z axis.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from .pycgmBatch import axisStack
+    >>> x = np.array([[1.0, 0.0, 0.0]])
+    >>> y = np.array([[0.0, 1.0, 0.0]])
+    >>> z = np.array([[0.0, 0.0, 1.0]])
+    >>> axisStack(x,y,z)
+    array([[[1., 0., 0.],
+            [0., 1., 0.],
+            [0., 0., 1.]]])
+    """
+    return np.stack([x_axis,y_axis,z_axis],axis=-2)
+
+def findJointC(a, b, c, delta):
+    """Calculate the Joint Center function for a stack of frames.
+
+    Same as findJointC in pyCGM.py, where the markers a, b, c and the
+    joint center all lie in the same plane, but calculated for every
+    frame at once. A frame with a missing (NaN) marker gives a NaN joint
+    center without affecting the other frames.
+
+    Parameters
+    ----------
+    a,b,c : array
+        (N,3) arrays of the x,y,z positions of markers a, b and c.
+        A single (3,) position is also accepted.
+    delta : float or array
+        The length from marker to joint center, retrieved from subject
+        measurement file. Either a single value or an (N,) array.
+
+    Returns
+    -------
+    mr : array
+        Returns the joint center x, y, z positions in an (N,3) array.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from .pycgmBatch import findJointC
+    >>> a = np.array([[468.14532471, 325.09780884, 673.12591553]])
+    >>> b = np.array([[355.90861996, 365.38260964, 940.6974861]])
+    >>> c = np.array([[452.35180664, 329.0609436, 524.77893066]])
+    >>> delta = 59.5
+    >>> findJointC(a,b,c,delta)
+    array([[396.25286248, 347.91367254, 518.63620527]])
+    >>> a = np.array([a[0], [np.nan, np.nan, np.nan]])
+    >>> b = np.array([b[0], b[0]])
+    >>> c = np.array([c[0], c[0]])
+    >>> findJointC(a,b,c,np.array([59.5, 59.5]))
+    array([[396.25286248, 347.91367254, 518.63620527],
+           [         nan,          nan,          nan]])
+    """
+    a = np.asarray(a,dtype=np.float64)
+    b = np.asarray(b,dtype=np.float64)
+    c = np.asarray(c,dtype=np.float64)
+
+    # make the two vector using 3 markers, which is on the same plane.
+    v1 = a-c
+    v2 = b-c
+
+    # v3 is cross vector of v1, v2
+    # and then it normalized.
+    v3 = unit(cross(v1,v2))
+
+    m = (b+c)/2
+    length = norm(b-m)
+
+    theta = np.arccos(delta/norm(v2))
+
+    cs = np.cos(theta*2)
+    sn = np.sin(theta*2)
+
+    ux = v3[...,0]
+    uy = v3[...,1]
+    uz = v3[...,2]
+
+    vx = v2[...,0]
+    vy = v2[...,1]
+    vz = v2[...,2]
+
+    # this rotation matrix is called Rodriques' rotation formula.
+    # joint center is determined by rotating the one vector of plane around rotating axis.
+    # the rotation matrix is applied to v2 row by row, so no (N,3,3) matrix is built.
+    r = np.empty(v2.shape)
+    r[...,0] = (cs+ux**2.0*(1.0-cs))*vx+(ux*uy*(1.0-cs)-uz*sn)*vy+(ux*uz*(1.0-cs)+uy*sn)*vz
+    r[...,1] = (uy*ux*(1.0-cs)+uz*sn)*vx+(cs+uy**2.0*(1.0-cs))*vy+(uy*uz*(1.0-cs)-ux*sn)*vz
+    r[...,2] = (uz*ux*(1.0-cs)-uy*sn)*vx+(uz*uy*(1.0-cs)+ux*sn)*vy+(cs+uz**2.0*(1.0-cs))*vz
+    r = r*(length/norm(r))[...,np.newaxis]
+
+    mr = r+m
+
+    return mr
+
+def axisDots(axisP,axisD):
+    """Axis dot product function
+
+    Calculates the dot product of every distal axis with every proximal axis,
+    which are the terms used by the angle calculation functions.
+
+    Parameters
+    ----------
+    axisP : array
+        (N,3,3) array of the unit vectors of the proximal axis.
+    axisD : array
+        (N,3,3) array of the unit vectors of the distal axis.
+
+    Returns
+    -------
+    M : array
+        An (N,3,3) array where M[:,i,j] is the dot product of axisD[:,i] and axisP[:,j].
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from .pycgmBatch import axisDots
+    >>> axisP = np.array([[[1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]]])
+    >>> axisD = np.array([[[0.0, 1.0, 0.0], [-1.0, 0.0, 0.0], [0.0, 0.0, 1.0]]])
+    >>> axisDots(axisP,axisD)
+    array([[[ 0.,  1.,  0.],
+            [-1.,  0.,  0.],
+            [ 0.,  0.,  1.]]])
+    """
+    axisP = np.asarray(axisP,dtype=np.float64)
+    axisD = np.asarray(axisD,dtype=np.float64)
+    #written out instead of einsum, whose summation order depends on the
+    #memory alignment, so a frame gets the same result in any array
+    D = axisD[...,:,np.newaxis,:]
+    P = axisP[...,np.newaxis,:,:]
+    return D[...,0]*P[...,0]+D[...,1]*P[...,1]+D[...,2]*P[...,2]
+
+def getPelangle(axisP,axisD):
+    """Pelvis angle calculation function for a stack of frames.
+
+    Same as getPelangle in pyCGM.py, using the inverse Euler rotation matrix in YXZ order.
+
+    Parameters
+    ----------
+    axisP : array
+        (N,3,3) array of the unit vectors of the proximal axis.
+    axisD : array
+        (N,3,3) array of the unit vectors of the distal axis.
+
+    Returns
+    -------
+    angle : array
+        Returns the alpha, beta, gamma angles in degrees in an (N,3) array.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from .pycgmBatch import getPelangle
+    >>> axisP = np.array([[[ 0.0464229, 0.99648672, 0.06970743],
+    ...                    [ 0.99734011, -0.04231089, -0.05935067],
+    ...                    [-0.05619277,  0.07227725, -0.99580037]]])
+    >>> axisD = np.array([[[-0.18067218, -0.98329158, -0.02225371],
+    ...                    [ 0.71383942, -0.1155303, -0.69071415],
+    ...                    [ 0.67660243, -0.1406784, 0.7227854 ]]])
+    >>> np.around(getPelangle(axisP,axisD),8)
+    array([[-175.65183483,   39.63221918,  -10.2668477 ]])
+    """
+    M = axisDots(axisP,axisD)
+
+    # this is the angle calculation which order is Y-X-Z
+    # alpha is abdcution angle.
+    # beta is flextion angle
+    # gamma is rotation angle
+    beta = np.arctan2(M[...,2,1],np.sqrt(M[...,2,0]**2+M[...,2,2]**2))
+    alpha = np.arctan2(M[...,2,0],M[...,2,2])
+    gamma = np.arctan2(M[...,0,1],M[...,1,1])
+
+    angle = np.stack([180.0 * alpha/ pi, 180.0 *beta/ pi, 180.0 * gamma/ pi],axis=-1)
+
+    return angle
+
+def getHeadangle(axisP,axisD):
+    """Head angle calculation function for a stack of frames.
+
+    Same as getHeadangle in pyCGM.py, using the inverse Euler rotation matrix in YXZ order.
+
+    Parameters
+    ----------
+    axisP : array
+        (N,3,3) array of the unit vectors of the proximal axis.
+    axisD : array
+        (N,3,3) array of the unit vectors of the distal axis.
+
+    Returns
+    -------
+    angle : array
+        Returns the alpha, beta, gamma angles in degrees in an (N,3) array.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from .pycgmBatch import getHeadangle
+    >>> axisP = np.array([[[ 0.04622308, 0.99669017, 0.06681337],
+    ...                    [ 0.99832942, -0.04490233, -0.03616371],
+    ...                    [-0.03304154, 0.06839803, -0.99711084]]])
+    >>> axisD = np.array([[[-0.18067218, -0.98329158, -0.02225371],
+    ...                    [ 0.71383942, -0.1155303, -0.69071415],
+    ...                    [ 0.67660243, -0.1406784, 0.7227854 ]]])
+    >>> np.around(getHeadangle(axisP,axisD),8)
+    array([[ 184.60662447,  -40.96933396, -190.3314651 ]])
+    """
+    M = axisDots(axisP,axisD)
+
+    # this is the angle calculation which order is Y-X-Z
+    # beta is flextion angle
+    # gamma is rotation angle
+    beta = np.arctan2(M[...,2,1],np.sqrt(M[...,0,1]**2+M[...,1,1]**2))
+    alpha = np.arctan2(-1*M[...,2,0],M[...,2,2])
+    gamma = np.arctan2(-1*M[...,0,1],M[...,1,1])
+
+    alpha = 180.0 * alpha/ pi
+    beta = 180.0 * beta/ pi
+    gamma = 180.0 * gamma/ pi
+
+    beta = -1*beta
+
+    alpha = np.where(alpha<0,alpha*-1,np.where((0<alpha)&(alpha<180),180+(180-alpha),alpha))
+
+    gamma = np.where(gamma>90.0,
+                     np.where(gamma>120,(gamma-180)*-1,(gamma+180)*-1),
+                     np.where(gamma<0,(gamma+180)*-1,(gamma*-1)-180.0))
+
+    angle = np.stack([alpha,beta,gamma],axis=-1)
+
+    return angle
+
+def getangle_sho(axisP,axisD):
+    """Shoulder angle calculation function for a stack of frames.
+
+    Same as getangle_sho in pyCGM.py, using the inverse Euler rotation matrix in XYZ order.
+
+    Parameters
+    ----------
+    axisP : array
+        (N,3,3) array of the unit vectors of the proximal axis.
+    axisD : array
+        (N,3,3) array of the unit vectors of the distal axis.
+
+    Returns
+    -------
+    angle : array
+        Returns the alpha, beta, gamma angles in degrees in an (N,3) array.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from .pycgmBatch import getangle_sho
+    >>> axisP = np.array([[[ 0.04622308, 0.99669017, 0.06681337],
+    ...                    [ 0.99832942, -0.04490233, -0.03616371],
+    ...                    [-0.03304154, 0.06839803, -0.99711084]]])
+    >>> axisD = np.array([[[-0.18067218, -0.98329158, -0.02225371],
+    ...                    [ 0.71383942, -0.1155303, -0.69071415],
+    ...                    [ 0.67660243, -0.1406784, 0.7227854 ]]])
+    >>> np.around(getangle_sho(axisP,axisD),8)
+    array([[  -3.47691643, -138.94109945,  172.61487606]])
+    """
+    M = axisDots(axisP,axisD)
+
+    # beta is flexion /extension
+    # gamma is adduction / abduction
+    # alpha is internal / external rotation
+    alpha = np.arcsin(M[...,2,0])
+    beta = np.arctan2(-1*M[...,2,1],M[...,2,2])
+    gamma = np.arctan2(-1*M[...,1,0],M[...,0,0])
+
+    angle = np.stack([180.0 * alpha/ pi, 180.0 *beta/ pi, 180.0 * gamma/ pi],axis=-1)
+
+    return angle
+
+def getangle_spi(axisP,axisD):
+    """Spine angle calculation function for a stack of frames.
+
+    Same as getangle_spi in pyCGM.py, using the inverse Euler rotation matrix in XZX order.
+
+    Parameters
+    ----------
+    axisP : array
+        (N,3,3) array of the unit vectors of the proximal axis.
+    axisD : array
+        (N,3,3) array of the unit vectors of the distal axis.
+
+    Returns
+    -------
+    angle : array
+        Returns the beta, gamma, alpha angles in degrees in an (N,3) array.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from .pycgmBatch import getangle_spi
+    >>> axisP = np.array([[[ 0.04622308, 0.99669017, 0.06681337],
+    ...                    [ 0.99832942, -0.04490233, -0.03616371],
+    ...                    [-0.03304154, 0.06839803, -0.99711084]]])
+    >>> axisD = np.array([[[-0.18067218, -0.98329158, -0.02225371],
+    ...                    [ 0.71383942, -0.1155303, -0.69071415],
+    ...                    [ 0.67660243, -0.1406784, 0.7227854 ]]])
+    >>> np.around(getangle_spi(axisP,axisD),8)
+    array([[ 2.97343443,  9.80121989, 41.08897018]])
+    """
+    M = axisDots(axisP,axisD)
+
+    # this angle calculation is for spine angle.
+    alpha = np.arcsin(M[...,1,2])
+    gamma = np.arcsin((-1*M[...,1,0]) / np.cos(alpha))
+    beta = np.arcsin((-1*M[...,0,2]) / np.cos(alpha))
+
+    angle = np.stack([180.0 * beta/ pi, 180.0 *gamma/ pi, 180.0 * alpha/ pi],axis=-1)
+
+    return angle
+
+def getangle(axisP,axisD):
+    """Normal angle calculation function for a stack of frames.
+
+    Same as getangle in pyCGM.py, using the inverse Euler rotation matrix in YXZ order.
+    Frames where the abduction angle is not between -pi/2 and pi/2 use the
+    same alternate branch as the single frame function.
+
+    Parameters
+    ----------
+    axisP : array
+        (N,3,3) array of the unit vectors of the proximal axis.
+    axisD : array
+        (N,3,3) array of the unit vectors of the distal axis.
+
+    Returns
+    -------
+    angle : array
+        Returns the beta, alpha, gamma angles in degrees in an (N,3) array.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from .pycgmBatch import getangle
+    >>> axisP = np.array([[[ 0.04622308, 0.99669017, 0.06681337],
+    ...                    [ 0.99832942, -0.04490233, -0.03616371],
+    ...                    [-0.03304154, 0.06839803, -0.99711084]]])
+    >>> axisD = np.array([[[-0.18067218, -0.98329158, -0.02225371],
+    ...                    [ 0.71383942, -0.1155303, -0.69071415],
+    ...                    [ 0.67660243, -0.1406784, 0.7227854 ]]])
+    >>> np.around(getangle(axisP,axisD),8)
+    array([[-175.39337553,  -40.96897739,  100.3314651 ]])
+
+    When rounding puts the sine of the abduction angle just outside [-1, 1]
+    the abduction angle is NaN, and the other two angles are taken from
+    the alternate branch, the same as the single frame function.
+
+    >>> from .pyCGM import getangle as getangleFrame
+    >>> axisP = np.array([np.eye(3), np.eye(3)])
+    >>> axisD = np.array([np.eye(3), [[1, 0, 0], [0, 1, 0], [0.1, -1.0000001, 0.2]]])
+    >>> np.around(getangle(axisP,axisD),8)
+    array([[  0.        ,  -0.        ,  90.        ],
+           [-26.56505118,          nan, -90.        ]])
+    >>> np.around(getangleFrame(axisP[1],axisD[1]),8)
+    array([-26.56505118,          nan, -90.        ])
+    """
+    M = axisDots(axisP,axisD)
+
+    # this is the angle calculation which order is Y-X-Z
+    # alpha is abdcution angle.
+    ang = -1*M[...,2,1]
+    alpha = np.where((-1<=ang)&(ang<=1),np.arcsin(np.clip(ang,-1,1)),np.nan)
+
+    # check the abduction angle is in the area between -pi/2 and pi/2
+    # beta is flextion angle
+    # gamma is rotation angle
+    inside = (-1.57079633<alpha)&(alpha<1.57079633)
+    sign = np.where(inside,1.0,-1.0)
+
+    beta = np.arctan2(sign*M[...,2,0],M[...,2,2])
+    gamma = np.arctan2(sign*M[...,1,1],M[...,0,1])
+
+    angle = np.stack([180.0 * beta/ pi, 180.0 *alpha/ pi, 180.0 * gamma / pi],axis=-1)
+
+    return angle
+
+# Lowerbody Coordinate System
+def pelvisJointCenter(frame):
+    """Make the Pelvis Axis function for a stack of frames.
+
+    Markers used: RASI,LASI,RPSI,LPSI (or SACR)
+
+    Parameters
+    ----------
+    frame : dict
+        Dictionary of marker names with (N,3) arrays of marker positions.
+
+    Returns
+    -------
+    pelvis : list
+        Returns the pelvis origin in an (N,3) array, the pelvis x, y, z axis
+        in an (N,3,3) array, and the sacrum in an (N,3) array.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from .pycgmBatch import pelvisJointCenter
+    >>> frame = {'RASI': np.array([[ 395.36532593,  428.09790039, 1036.82763672]]),
+    ...          'LASI': np.array([[ 183.18504333,  422.78927612, 1033.07299805]]),
+    ...          'RPSI': np.array([[ 341.41815186,  246.72117615, 1055.99145508]]),
+    ...          'LPSI': np.array([[ 255.79994202,  241.42199707, 1057.30065918]]) }
+    >>> [np.around(arr,8) for arr in pelvisJointCenter(frame)] #doctest: +NORMALIZE_WHITESPACE
+    [array([[ 289.27518463,  425.44358826, 1034.95031738]]),
+    array([[[ 289.25243803,  426.43632163, 1034.8321521 ],
+            [ 288.27565385,  425.41858059, 1034.93263018],
+            [ 289.25467091,  425.56129577, 1035.94315379]]]),
+    array([[ 298.60904694,  244.07158661, 1056.64605713]])]
+    """
+    RASI = frame['RASI']
+    LASI = frame['LASI']
+
+    #  If no sacrum, mean of posterior markers is used as the sacrum
+    if 'SACR' in frame:
+        sacrum = frame['SACR']
+    else:
+        sacrum = (frame['RPSI']+frame['LPSI'])/2
+
+    # Origin is Midpoint between RASI and LASI
+    origin = (RASI+LASI)/2
+
+    beta1 = origin-sacrum
+    beta2 = LASI-RASI
+
+    # Y_axis is normalized beta2
+    y_axis = unit(beta2)
+
+    # X_axis computed with a Gram-Schmidt orthogonalization procedure(ref. Kadaba 1990)
+    # and then normalized.
+    beta3_cal = beta1[:,0]*y_axis[:,0]+beta1[:,1]*y_axis[:,1]+beta1[:,2]*y_axis[:,2]
+    beta3 = beta1-beta3_cal[:,np.newaxis]*y_axis
+    x_axis = unit(beta3)
+
+    # Z-axis is cross product of x_axis and y_axis.
+    z_axis = cross(x_axis,y_axis)
+
+    # Add the origin back to the vector
+    pelvis_axis = axisStack(x_axis+origin,y_axis+origin,z_axis+origin)
+
+    return [origin,pelvis_axis,sacrum]
+
+def hipJointCenter(frame,pel_origin,pel_x,pel_y,pel_z,vsk=None):
+    """Calculate the hip joint center function for a stack of frames.
+
+    Hip Joint Center: Computed using Hip Joint Center Calculation (ref. Davis_1991)
+
+    Parameters
+    ----------
+    frame : dict
+        Dictionary of marker names with (N,3) arrays of marker positions.
+    pel_origin : array
+        (N,3) array of the pelvis origin.
+    pel_x, pel_y, pel_z : array
+        (N,3) arrays of the pelvis axes.
+    vsk : dict
+        A dictionary containing subject measurements from a VSK file.
+
+    Returns
+    -------
+    hip_JC : list
+        Returns the left hip joint center followed by the right hip joint
+        center, each an (N,3) array.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from .pycgmBatch import hipJointCenter
+    >>> frame = None
+    >>> vsk = {'MeanLegLength': 940.0, 'R_AsisToTrocanterMeasure': 72.512,
+    ...        'L_AsisToTrocanterMeasure': 72.512, 'InterAsisDistance': 215.908996582031}
+    >>> pel_origin = np.array([[ 251.60830688, 391.74131775, 1032.89349365]])
+    >>> pel_x = np.array([[251.74063624, 392.72694721, 1032.78850073]])
+    >>> pel_y = np.array([[250.61711554, 391.87232862, 1032.8741063]])
+    >>> pel_z = np.array([[251.60295336, 391.84795134, 1033.88777762]])
+    >>> np.around(hipJointCenter(frame,pel_origin,pel_x,pel_y,pel_z,vsk),8)
+    array([[[182.57097799, 339.43231799, 935.52900136]],
+    <BLANKLINE>
+           [[308.38050352, 322.80342433, 937.98979092]]])
+    """
+    #Half of marker size
+    mm = 7.0
+
+    MeanLegLength = vsk['MeanLegLength']
+    R_AsisToTrocanterMeasure = vsk['R_AsisToTrocanterMeasure']
+    L_AsisToTrocanterMeasure = vsk['L_AsisToTrocanterMeasure']
+    interAsisMeasure = vsk['InterAsisDistance']
+    C = ( MeanLegLength * 0.115 ) - 15.3
+    theta = 0.500000178813934
+    beta = 0.314000427722931
+    aa = interAsisMeasure/2.0
+    S = -1
+
+    # Hip Joint Center Calculation (ref. Davis_1991)
+
+    # Left: Calculate the distance to translate along the pelvis axis
+    L_Xh = (-L_AsisToTrocanterMeasure - mm) * cos(beta) + C * cos(theta) * sin(beta)
+    L_Yh = S*(C*sin(theta)- aa)
+    L_Zh = (-L_AsisToTrocanterMeasure - mm) * sin(beta) - C * cos(theta) * cos(beta)
+
+    # Right:  Calculate the distance to translate along the pelvis axis
+    R_Xh = (-R_AsisToTrocanterMeasure - mm) * cos(beta) + C * cos(theta) * sin(beta)
+    R_Yh = (C*sin(theta)- aa)
+    R_Zh = (-R_AsisToTrocanterMeasure - mm) * sin(beta) - C * cos(theta) * cos(beta)
+
+    # get the unit pelvis axis
+    pelvis_xaxis = pel_x-pel_origin
+    pelvis_yaxis = pel_y-pel_origin
+    pelvis_zaxis = pel_z-pel_origin
+
+    # multiply the distance to the unit pelvis axis
+    L_hipJC = pelvis_xaxis*L_Xh+pelvis_yaxis*L_Yh+pelvis_zaxis*L_Zh
+    R_hipJC = pelvis_xaxis*R_Xh+pelvis_yaxis*R_Yh+pelvis_zaxis*R_Zh
+
+    L_hipJC = L_hipJC+pel_origin
+    R_hipJC = R_hipJC+pel_origin
+
+    return [L_hipJC,R_hipJC]
+
+def hipAxisCenter(l_hip_jc,r_hip_jc,pelvis_axis):
+    """Calculate the hip joint axis function for a stack of frames.
+
+    Parameters
+    ----------
+    l_hip_jc, r_hip_jc : array
+        (N,3) arrays of the left and right hip joint centers.
+    pelvis_axis : list
+        The pelvis origin (N,3) and axis (N,3,3) from pelvisJointCenter.
+
+    Returns
+    -------
+    hipaxis_center, axis : list
+        Returns the hip axis center in an (N,3) array followed by the
+        hip x, y, z axis in an (N,3,3) array.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from .pycgmBatch import hipAxisCenter
+    >>> r_hip_jc = np.array([[182.57097863, 339.43231855, 935.529000126]])
+    >>> l_hip_jc = np.array([[308.38050472, 322.80342417, 937.98979061]])
+    >>> pelvis_axis = [np.array([[251.60830688, 391.74131775, 1032.89349365]]),
+    ...                np.array([[[251.74063624, 392.72694721, 1032.78850073],
+    ...                    [250.61711554, 391.87232862, 1032.8741063],
+    ...                    [251.60295336, 391.84795134, 1033.88777762]]])]
+    >>> [np.around(arr,8) for arr in hipAxisCenter(l_hip_jc,r_hip_jc,pelvis_axis)] #doctest: +NORMALIZE_WHITESPACE
+    [array([[245.47574168, 331.11787136, 936.75939537]]),
+    array([[[245.60807104, 332.10350082, 936.65440245],
+            [244.48455034, 331.24888223, 936.74000802],
+            [245.47038816, 331.22450495, 937.75367934]]])]
+    """
+    # Get shared hip axis, it is inbetween the two hip joint centers
+    hipaxis_center = (r_hip_jc+l_hip_jc)/2
+
+    #Translate pelvis axis to shared hip centre
+    # Add the origin back to the vector
+    axis = pelvis_axis[1]-pelvis_axis[0][:,np.newaxis,:]+hipaxis_center[:,np.newaxis,:]
+
+    return [hipaxis_center,axis]
+
+def kneeJointCenter(frame,hip_JC,delta,vsk=None):
+    """Calculate the knee joint center and axis function for a stack of frames.
+
+    Markers used: RTHI, LTHI, RKNE, LKNE, hip_JC
+    Subject Measurement values used: RightKneeWidth, LeftKneeWidth
+
+    Parameters
+    ----------
+    frame : dict
+        Dictionary of marker names with (N,3) arrays of marker positions.
+    hip_JC : list
+        The left and right hip joint centers, each an (N,3) array.
+    delta : float
+        The length from marker to joint center, retrieved from subject measurement file.
+    vsk : dict
+        A dictionary containing subject measurements from a VSK file.
+
+    Returns
+    -------
+    R, L, axis : list
+        Returns the right and left knee joint centers as (N,3) arrays,
+        followed by a list of the right and left knee axis as (N,3,3) arrays.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from .pycgmBatch import kneeJointCenter
+    >>> vsk = { 'RightKneeWidth' : 105.0, 'LeftKneeWidth' : 105.0 }
+    >>> frame = { 'RTHI': np.array([[426.50338745, 262.65310669, 673.66247559]]),
+    ...           'LTHI': np.array([[51.93867874, 320.01849365, 723.03186035]]),
+    ...           'RKNE': np.array([[416.98687744, 266.22558594, 524.04089355]]),
+    ...           'LKNE': np.array([[84.62355804, 286.69122314, 529.39819336]])}
+    >>> hip_JC = [np.array([[182.57097863, 339.43231855, 935.52900126]]),
+    ...           np.array([[309.38050472, 322.80342417, 937.98979061]])]
+    >>> delta = 0
+    >>> R, L, axis = kneeJointCenter(frame,hip_JC,delta,vsk)
+    >>> np.around(R,8)
+    array([[364.23805291, 292.33365632, 515.31276822]])
+    >>> np.around(axis[1],8)
+    array([[[143.65611281, 280.88685896, 524.63197541],
+            [142.56434499, 280.01777942, 524.86163553],
+            [143.64837987, 280.0465038 , 525.76940383]]])
+    """
+    #Get Global Values
+    mm = 7.0
+    R_kneeWidth = vsk['RightKneeWidth']
+    L_kneeWidth = vsk['LeftKneeWidth']
+    R_delta = (R_kneeWidth/2.0)+mm
+    L_delta = (L_kneeWidth/2.0)+mm
+
+    RTHI = frame['RTHI']
+    LTHI = frame['LTHI']
+    RKNE = frame['RKNE']
+    LKNE = frame['LKNE']
+
+    R_hip_JC = hip_JC[1]
+    L_hip_JC = hip_JC[0]
+
+    # Determine the position of kneeJointCenter using findJointC function
+    R = findJointC(RTHI,R_hip_JC,RKNE,R_delta)
+    L = findJointC(LTHI,L_hip_JC,LKNE,L_delta)
+
+    # Knee Axis Calculation(ref. Clinical Gait Analysis hand book, Baker2013)
+    #Right axis calculation
+    axis_z = R_hip_JC-R
+    axis_x = cross(axis_z,RKNE-R_hip_JC)
+    axis_y = cross(axis_z,axis_x)
+    Raxis = axisStack(unit(axis_x)+R,unit(axis_y)+R,unit(axis_z)+R)
+
+    #Left axis calculation
+    axis_z = L_hip_JC-L
+    axis_x = cross(LKNE-L_hip_JC,axis_z)
+    axis_y = cross(axis_z,axis_x)
+    Laxis = axisStack(unit(axis_x)+L,unit(axis_y)+L,unit(axis_z)+L)
+
+    return [R,L,[Raxis,Laxis]]
+
+def ankleJointCenter(frame,knee_JC,delta,vsk=None):
+    """Calculate the ankle joint center and axis function for a stack of frames.
+
+    Markers used: RTIB, LTIB, RANK, LANK, knee_JC
+    Subject Measurement values used: RightAnkleWidth, LeftAnkleWidth, RightTibialTorsion, LeftTibialTorsion
+
+    Parameters
+    ----------
+    frame : dict
+        Dictionary of marker names with (N,3) arrays of marker positions.
+    knee_JC : list
+        The output of kneeJointCenter.
+    delta : float
+        The length from marker to joint center, retrieved from subject measurement file.
+    vsk : dict
+        A dictionary containing subject measurements from a VSK file.
+
+    Returns
+    -------
+    R, L, axis : list
+        Returns the right and left ankle joint centers as (N,3) arrays,
+        followed by a list of the right and left ankle axis as (N,3,3) arrays.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from .pycgmBatch import ankleJointCenter
+    >>> vsk = { 'RightAnkleWidth' : 70.0, 'LeftAnkleWidth' : 70.0,
+    ...         'RightTibialTorsion': 0.0, 'LeftTibialTorsion' : 0.0}
+    >>> frame = { 'RTIB': np.array([[433.97537231, 211.93408203, 273.3008728]]),
+    ...           'LTIB': np.array([[50.04016495, 235.90718079, 364.32226562]]),
+    ...           'RANK': np.array([[422.77005005, 217.74053955, 92.86152649]]),
+    ...           'LANK': np.array([[58.57380676, 208.54806519, 86.16953278]]) }
+    >>> knee_JC = [np.array([[364.23805291, 292.33365632, 515.31276822]]),
+    ...            np.array([[143.55478579, 279.90370346, 524.78408753]])]
+    >>> delta = 0
+    >>> R, L, axis = ankleJointCenter(frame,knee_JC,delta,vsk)
+    >>> np.around(L,8)
+    array([[ 98.74901939, 219.46930221,  80.63068161]])
+    >>> np.around(axis[0],8)
+    array([[[394.52045511, 248.40656031,  87.70831811],
+            [393.10991383, 248.42739875,  87.60862329],
+            [393.73108308, 247.81729679,  88.72303989]]])
+    """
+    #Get Global Values
+    R_ankleWidth = vsk['RightAnkleWidth']
+    L_ankleWidth = vsk['LeftAnkleWidth']
+    R_torsion = vsk['RightTibialTorsion']
+    L_torsion = vsk['LeftTibialTorsion']
+    mm = 7.0
+    R_delta = ((R_ankleWidth)/2.0)+mm
+    L_delta = ((L_ankleWidth)/2.0)+mm
+
+    tib_R = frame['RTIB']
+    tib_L = frame['LTIB']
+    ank_R = frame['RANK']
+    ank_L = frame['LANK']
+
+    knee_JC_R = knee_JC[0]
+    knee_JC_L = knee_JC[1]
+
+    # Determine the position of ankleJointCenter using findJointC function
+    R = findJointC(tib_R, knee_JC_R, ank_R, R_delta)
+    L = findJointC(tib_L, knee_JC_L, ank_L, L_delta)
+
+    # Ankle Axis Calculation(ref. Clinical Gait Analysis hand book, Baker2013)
+    #Right axis calculation
+    axis_z = knee_JC_R-R
+    axis_x = cross(axis_z,tib_R-ank_R)
+    axis_y = cross(axis_z,axis_x)
+    R_x, R_y, R_z = unit(axis_x), unit(axis_y), unit(axis_z)
+
+    #Left axis calculation
+    axis_z = knee_JC_L-L
+    axis_x = cross(tib_L-ank_L,axis_z)
+    axis_y = cross(axis_z,axis_x)
+    L_x, L_y, L_z = unit(axis_x), unit(axis_y), unit(axis_z)
+
+    # Rotate the axes about the tibia torsion.
+    R_torsion = np.radians(R_torsion)
+    L_torsion = np.radians(L_torsion)
+
+    Raxis = axisStack(cos(R_torsion)*R_x-sin(R_torsion)*R_y+R,
+                      sin(R_torsion)*R_x+cos(R_torsion)*R_y+R,
+                      R_z+R)
+    Laxis = axisStack(cos(L_torsion)*L_x-sin(L_torsion)*L_y+L,
+                      sin(L_torsion)*L_x+cos(L_torsion)*L_y+L,
+                      L_z+L)
+
+    return [R,L,[Raxis,Laxis]]
+
+def footJointCenter(frame,vsk,ankle_JC,knee_JC,delta):
+    """Calculate the foot joint center and axis function for a stack of frames.
+
+    Markers used: RTOE, LTOE
+    Subject Measurement values used: RightStaticRotOff, RightStaticPlantFlex, LeftStaticRotOff, LeftStaticPlantFlex
+
+    Parameters
+    ----------
+    frame : dict
+        Dictionary of marker names with (N,3) arrays of marker positions.
+    vsk : dict
+        A dictionary containing subject measurements from a VSK file.
+    ankle_JC : list
+        The output of ankleJointCenter.
+    knee_JC : list
+        The output of kneeJointCenter.
+    delta
+        The length from marker to joint center, retrieved from subject measurement file.
+
+    Returns
+    -------
+    R, L, foot_axis : list
+        Returns the right and left foot origin as (N,3) arrays, followed
+        by a list of the right and left foot axis as (N,3,3) arrays.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from .pycgmBatch import footJointCenter
+    >>> vsk = { 'RightStaticRotOff' : 0.015683497632642047, 'LeftStaticRotOff': 0.009402910292403012,
+    ...         'RightStaticPlantFlex' : 0.2702417907002758, 'LeftStaticPlantFlex': 0.20251085737834015}
+    >>> frame = { 'RTOE': np.array([[442.81997681, 381.62280273, 42.66047668]]),
+    ...           'LTOE': np.array([[39.43652725, 382.44522095, 41.78911591]])}
+    >>> ankle_JC = [np.array([[393.76181608, 247.67829633, 87.73775041]]),
+    ...             np.array([[98.74901939, 219.46930221, 80.6306816]]),
+    ...             [np.array([[[394.4817575, 248.37201348, 87.715368],
+    ...                         [393.07114384, 248.39110006, 87.61575574],
+    ...                         [393.69314056, 247.78157916, 88.73002876]]]),
+    ...              np.array([[[98.47494966, 220.42553803, 80.52821783],
+    ...                         [97.79246671, 219.20927275, 80.76255901],
+    ...                         [98.84848169, 219.60345781, 81.61663775]]])]]
+    >>> R, L, axis = footJointCenter(frame,vsk,ankle_JC,None,0)
+    >>> np.around(axis[1],8)
+    array([[[ 39.56652626, 382.50901001,  42.77857597],
+            [ 38.49313328, 382.14606841,  41.93234851],
+            [ 39.74166341, 381.4931502 ,  41.81040459]]])
+    """
+    TOE_R = frame["RTOE"]
+    TOE_L = frame["LTOE"]
+
+    ankle_JC_R = ankle_JC[0]
+    ankle_JC_L = ankle_JC[1]
+    ankle_flexion_R = ankle_JC[2][0][:,1]
+    ankle_flexion_L = ankle_JC[2][1][:,1]
+
+    # Toe axis's origin is marker position of TOE
+    R = TOE_R
+    L = TOE_L
+
+    # HERE IS THE INCORRECT AXIS
+    # Right
+    # z axis is from TOE marker to AJC. and normalized it.
+    R_axis_z = unit(ankle_JC_R-TOE_R)
+    # bring the flexion axis of ankle axes from AnkleJointCenter function. and normalized it.
+    y_flex_R = unit(ankle_flexion_R-ankle_JC_R)
+    # x axis is calculated as a cross product of z axis and ankle flexion axis.
+    R_axis_x = unit(cross(y_flex_R,R_axis_z))
+    # y axis is then perpendicularly calculated from z axis and x axis. and normalized.
+    R_axis_y = unit(cross(R_axis_z,R_axis_x))
+
+    # Left
+    L_axis_z = unit(ankle_JC_L-TOE_L)
+    y_flex_L = unit(ankle_flexion_L-ankle_JC_L)
+    L_axis_x = unit(cross(y_flex_L,L_axis_z))
+    L_axis_y = unit(cross(L_axis_z,L_axis_x))
+
+    # Apply static offset angle to the incorrect foot axes
+    # static offset angle are taken from static_info variable in radians.
+    R_alpha = -radians(np.around(degrees(vsk['RightStaticRotOff']),decimals=5))
+    R_beta = radians(np.around(degrees(vsk['RightStaticPlantFlex']),decimals=5))
+    L_alpha = radians(np.around(degrees(vsk['LeftStaticRotOff']),decimals=5))
+    L_beta = radians(np.around(degrees(vsk['LeftStaticPlantFlex']),decimals=5))
+
+    # rotate incorrect foot axis around y axis first.
+    R_x = cos(R_beta)*R_axis_x+sin(R_beta)*R_axis_z
+    R_y = R_axis_y
+    R_z = -1*sin(R_beta)*R_axis_x+cos(R_beta)*R_axis_z
+
+    L_x = cos(L_beta)*L_axis_x+sin(L_beta)*L_axis_z
+    L_y = L_axis_y
+    L_z = -1*sin(L_beta)*L_axis_x+cos(L_beta)*L_axis_z
+
+    # rotate incorrect foot axis around x axis next.
+    R_axis = axisStack(R_x+R,
+                       cos(R_alpha)*R_y-sin(R_alpha)*R_z+R,
+                       sin(R_alpha)*R_y+cos(R_alpha)*R_z+R)
+    L_axis = axisStack(L_x+L,
+                       cos(L_alpha)*L_y-sin(L_alpha)*L_z+L,
+                       sin(L_alpha)*L_y+cos(L_alpha)*L_z+L)
+
+    return [R,L,[R_axis,L_axis]]
+
+# Upperbody Coordinate System
+def headJC(frame,vsk=None):
+    """Calculate the head joint axis function for a stack of frames.
+
+    Markers used: LFHD, RFHD, LBHD, RBHD
+    Subject Measurement values used: HeadOffset
+
+    Parameters
+    ----------
+    frame : dict
+        Dictionary of marker names with (N,3) arrays of marker positions.
+    vsk : dict
+        A dictionary containing subject measurements from a VSK file.
+
+    Returns
+    -------
+    head_axis, origin : list
+        Returns the head x, y, z axis as an (N,3,3) array followed by the
+        head origin as an (N,3) array.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from .pycgmBatch import headJC
+    >>> vsk = { 'HeadOffset': 0.2571990469310653 }
+    >>> frame = {'RFHD': np.array([[325.82983398, 402.55450439, 1722.49816895]]),
+    ...          'LFHD': np.array([[184.55158997, 409.68713379, 1721.34289551]]),
+    ...          'RBHD': np.array([[304.39898682, 242.91339111, 1694.97497559]]),
+    ...          'LBHD': np.array([[197.8621521, 251.28889465, 1696.90197754]])}
+    >>> [np.around(arr,8) for arr in headJC(frame,vsk)] #doctest: +NORMALIZE_WHITESPACE
+    [array([[[ 255.21685583,  407.11593888, 1721.82538439],
+            [ 254.19105385,  406.14680918, 1721.91767712],
+            [ 255.1903437 ,  406.21600904, 1722.91599129]]]),
+    array([[ 255.19071198,  406.12081909, 1721.92053223]])]
+    """
+    #Get Global Values
+    head_off = vsk['HeadOffset']
+    head_off = -1*head_off
+
+    LFHD = frame['LFHD']
+    RFHD = frame['RFHD']
+    LBHD = frame['LBHD']
+    RBHD = frame['RBHD']
+
+    #get the midpoints of the head to define the sides
+    front = (LFHD+RFHD)/2.0
+    back = (LBHD+RBHD)/2.0
+    left = (LFHD+LBHD)/2.0
+    right = (RFHD+RBHD)/2.0
+    origin = front
+
+    #Get the vectors from the sides with primary x axis facing front
+    x_vec = unit(front-back)
+    y_vec = unit(left-right)
+    z_vec = unit(cross(x_vec,y_vec))
+
+    # make sure all x,y,z axis is orthogonal each other by cross-product
+    y_vec = unit(cross(z_vec,x_vec))
+    x_vec = unit(cross(y_vec,z_vec))
+
+    # rotate the head axis around y axis about head offset angle.
+    x_vec_rot = x_vec*cos(head_off)+z_vec*sin(head_off)
+    y_vec_rot = y_vec
+    z_vec_rot = x_vec*-1*sin(head_off)+z_vec*cos(head_off)
+
+    #Add the origin back to the vector to get it in the right position
+    head_axis = axisStack(x_vec_rot+origin,y_vec_rot+origin,z_vec_rot+origin)
+
+    return [head_axis,origin]
+
+def thoraxJC(frame):
+    """Calculate the thorax joint axis function for a stack of frames.
+
+    Markers used: CLAV, C7, STRN, T10
+
+    Parameters
+    ----------
+    frame : dict
+        Dictionary of marker names with (N,3) arrays of marker positions.
+
+    Returns
+    -------
+    thorax_axis, origin : list
+        Returns the thorax x, y, z axis as an (N,3,3) array followed by the
+        thorax origin as an (N,3) array.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from .pycgmBatch import thoraxJC
+    >>> frame = {'C7': np.array([[256.78051758, 371.28042603, 1459.70300293]]),
+    ...          'T10': np.array([[228.64323425, 192.32041931, 1279.6418457]]),
+    ...          'CLAV': np.array([[256.78051758, 371.28042603, 1459.70300293]]),
+    ...          'STRN': np.array([[251.67492676, 414.10391235, 1292.08508301]])}
+    >>> [np.around(arr,8) for arr in thoraxJC(frame)] #doctest: +NORMALIZE_WHITESPACE
+    [array([[[ 256.34546332,  365.72239585, 1461.92089119],
+            [ 257.26637166,  364.696025  , 1462.23472346],
+            [ 256.18427318,  364.43288984, 1461.36304534]]]),
+    array([[ 256.27295428,  364.79605749, 1462.29053923]])]
+    """
+    #Set or get a marker size as mm
+    marker_size = (14.0) /2.0
+
+    CLAV = frame['CLAV']
+    C7 = frame['C7']
+    STRN = frame['STRN']
+    T10 = frame['T10']
+
+    #Get the midpoints of the upper and lower sections, as well as the front and back sections
+    upper = (CLAV+C7)/2.0
+    lower = (STRN+T10)/2.0
+    front = (CLAV+STRN)/2.0
+    back = (T10+C7)/2.0
+
+    #Get the direction of the primary axis Z (facing down)
+    z_vec = unit(lower-upper)
+
+    #The secondary axis X is from back to front
+    x_vec = unit(front-back)
+
+    # make sure all the axes are orthogonal each othe by cross-product
+    y_vec = unit(cross(z_vec,x_vec))
+    x_vec = unit(cross(y_vec,z_vec))
+    z_vec = unit(cross(x_vec,y_vec))
+
+    # move the axes about offset along the x axis.
+    offset = x_vec*marker_size
+
+    #Add the CLAV back to the vector to get it in the right position before translating it
+    origin = CLAV-offset
+
+    # Attach all the axes to the origin.
+    thorax_axis = axisStack(x_vec+origin,y_vec+origin,z_vec+origin)
+
+    return [thorax_axis,origin]
+
+def findwandmarker(frame,thorax):
+    """Calculate the wand marker function for a stack of frames.
+
+    Markers used: RSHO, LSHO
+
+    Parameters
+    ----------
+    frame : dict
+        Dictionary of marker names with (N,3) arrays of marker positions.
+    thorax : list
+        The output of thoraxJC.
+
+    Returns
+    -------
+    wand : list
+        Returns the right and left wand marker positions as (N,3) arrays.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from .pycgmBatch import findwandmarker
+    >>> frame = {'RSHO': np.array([[428.88496562, 270.552948, 1500.73010254]]),
+    ...          'LSHO': np.array([[68.24668121, 269.01049805, 1510.1072998]])}
+    >>> thorax = [np.array([[[256.23991128535846, 365.30496976939753, 1459.662169500559],
+    ...                      [257.1435863244796, 364.21960599061947, 1459.5889787129829],
+    ...                      [256.08430536580352, 354.32180498523223, 1458.6575930699294]]]),
+    ...           np.array([[256.14981023656401, 364.30906039339868, 1459.6553639290375]])]
+    >>> [np.around(arr,8) for arr in findwandmarker(frame,thorax)]
+    [array([[ 255.92550246,  364.32269503, 1460.6297869 ]]), array([[ 256.42380097,  364.27770361, 1460.61658494]])]
+    """
+    thorax_origin = thorax[1]
+    tho_axis_x = thorax[0][:,0]
+
+    RSHO = frame['RSHO']
+    LSHO = frame['LSHO']
+
+    # bring x axis from thorax axis
+    axis_x_vec = unit(tho_axis_x-thorax_origin)
+
+    RSHO_vec = unit(RSHO-thorax_origin)
+    LSHO_vec = unit(LSHO-thorax_origin)
+
+    R_wand = unit(cross(RSHO_vec,axis_x_vec))+thorax_origin
+    L_wand = unit(cross(axis_x_vec,LSHO_vec))+thorax_origin
+
+    return [R_wand,L_wand]
+
+def findshoulderJC(frame,thorax,wand,vsk=None):
+    """Calculate the Shoulder joint center function for a stack of frames.
+
+    Markers used: RSHO, LSHO
+    Subject Measurement values used: RightShoulderOffset, LeftShoulderOffset
+
+    Parameters
+    ----------
+    frame : dict
+        Dictionary of marker names with (N,3) arrays of marker positions.
+    thorax : list
+        The output of thoraxJC.
+    wand : list
+        The output of findwandmarker.
+    vsk : dict
+        A dictionary containing subject measurements from a VSK file.
+
+    Returns
+    -------
+    Sho_JC : list
+        Returns the right and left shoulder joint centers as (N,3) arrays.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from .pycgmBatch import findshoulderJC
+    >>> vsk = { 'RightShoulderOffset' : 40.0, 'LeftShoulderOffset' : 40.0 }
+    >>> frame = {'RSHO': np.array([[428.88496562, 270.552948, 1500.73010254]]),
+    ...          'LSHO': np.array([[68.24668121, 269.01049805, 1510.1072998]])}
+    >>> thorax = [None, np.array([[256.14981023656401, 364.30906039339868, 1459.6553639290375]])]
+    >>> wand = [np.array([[255.92550222678443, 364.32269504976051, 1460.6297868417887]]),
+    ...         np.array([[256.42380097331767, 364.27770361353487, 1460.6165849382387]])]
+    >>> findshoulderJC(frame,thorax,wand,vsk)
+    [array([[ 429.66971693,  275.06718208, 1453.95397769]]), array([[  64.51952733,  274.93442161, 1463.63133339]])]
+    """
+    thorax_origin = thorax[1]
+
+    #Get Subject Measurement Values
+    R_shoulderoffset = vsk['RightShoulderOffset']
+    L_shoulderoffset = vsk['LeftShoulderOffset']
+    mm = 7.0
+    R_delta =( R_shoulderoffset + mm )
+    L_delta =( L_shoulderoffset + mm )
+
+    RSHO = frame['RSHO']
+    LSHO = frame['LSHO']
+
+    R_Sho_JC = findJointC(wand[0],thorax_origin,RSHO,R_delta)
+    L_Sho_JC = findJointC(wand[1],thorax_origin,LSHO,L_delta)
+
+    return [R_Sho_JC,L_Sho_JC]
+
+def shoulderAxisCalc(frame,thorax,shoulderJC,wand):
+    """Calculate the Shoulder joint axis (Clavicle) function for a stack of frames.
+
+    Parameters
+    ----------
+    frame : dict
+        Dictionary of marker names with (N,3) arrays of marker positions.
+    thorax : list
+        The output of thoraxJC.
+    shoulderJC : list
+        The output of findshoulderJC.
+    wand : list
+        The output of findwandmarker.
+
+    Returns
+    -------
+    shoulderJC, axis : list
+        Returns the shoulder joint centers followed by a list of the
+        right and left shoulder axis as (N,3,3) arrays.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from .pycgmBatch import shoulderAxisCalc
+    >>> thorax = [None, np.array([[256.14981023656401, 364.30906039339868, 1459.6553639290375]])]
+    >>> shoulderJC = [np.array([[429.66951995, 275.06718615, 1453.953978131]]),
+    ...               np.array([[64.51952734, 274.93442161, 1463.6313334]])]
+    >>> wand = [np.array([[255.92550222678443, 364.32269504976051, 1460.6297868417887]]),
+    ...         np.array([[256.42380097331767, 364.27770361353487, 1460.6165849382387]])]
+    >>> np.around(shoulderAxisCalc(None,thorax,shoulderJC,wand)[1][0],8)
+    array([[[ 430.12731331,  275.95136619, 1454.04698829],
+            [ 429.68621685,  275.16323377, 1452.95874144],
+            [ 428.78061813,  275.52435188, 1453.98318503]]])
+    """
+    thorax_origin = thorax[1]
+
+    R_shoulderJC = shoulderJC[0]
+    L_shoulderJC = shoulderJC[1]
+
+    R_wand_direc = unit(wand[0]-thorax_origin)
+    L_wand_direc = unit(wand[1]-thorax_origin)
+
+    # Right
+    #Get the direction of the primary axis Z,X,Y
+    z_direc = unit(thorax_origin-R_shoulderJC)
+    y_direc = R_wand_direc*-1
+    x_direc = unit(cross(y_direc,z_direc))
+    y_direc = unit(cross(z_direc,x_direc))
+    R_axis = axisStack(x_direc+R_shoulderJC,y_direc+R_shoulderJC,z_direc+R_shoulderJC)
+
+    # Left
+    z_direc = unit(thorax_origin-L_shoulderJC)
+    y_direc = L_wand_direc
+    x_direc = unit(cross(y_direc,z_direc))
+    y_direc = unit(cross(z_direc,x_direc))
+    L_axis = axisStack(x_direc+L_shoulderJC,y_direc+L_shoulderJC,z_direc+L_shoulderJC)
+
+    return [shoulderJC,[R_axis,L_axis]]
+
+def elbowJointCenter(frame,thorax,shoulderJC,wand,vsk=None):
+    """Calculate the Elbow joint axis (Humerus) function for a stack of frames.
+
+    Markers used: RSHO, LSHO, RELB, LELB, RWRA ,RWRB, LWRA, LWRB
+    Subject Measurement values used: RightElbowWidth, LeftElbowWidth, RightWristWidth, LeftWristWidth
+
+    Parameters
+    ----------
+    frame : dict
+        Dictionary of marker names with (N,3) arrays of marker positions.
+    thorax : list
+        The output of thoraxJC.
+    shoulderJC : list
+        The output of findshoulderJC.
+    wand : list
+        The output of findwandmarker.
+    vsk : dict
+        A dictionary containing subject measurements from a VSK file.
+
+    Returns
+    -------
+    origin, axis, wrist_O : list
+        Returns the right and left elbow joint centers, a list of the right
+        and left humerus axis as (N,3,3) arrays, and the right and left
+        wrist joint centers.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from .pycgmBatch import elbowJointCenter
+    >>> frame = {'RSHO': np.array([[428.88496562, 270.552948, 1500.73010254]]),
+    ...          'LSHO': np.array([[68.24668121, 269.01049805, 1510.1072998]]),
+    ...          'RELB': np.array([[658.90338135, 326.07580566, 1285.28515625]]),
+    ...          'LELB': np.array([[-156.32162476, 335.2593313, 1287.39916992]]),
+    ...          'RWRA': np.array([[776.51898193,495.68103027, 1108.38464355]]),
+    ...          'RWRB': np.array([[830.9072876, 436.75341797, 1119.11901855]]),
+    ...          'LWRA': np.array([[-249.28146362, 525.32977295, 1117.09057617]]),
+    ...          'LWRB': np.array([[-311.77532959, 477.22512817, 1125.1619873]])}
+    >>> thorax = [np.array([[[256.23991128535846, 365.30496976939753, 1459.662169500559],
+    ...                      [257.1435863244796, 364.21960599061947, 1459.5889787129829],
+    ...                      [256.08430536580352, 354.32180498523223, 1458.6575930699294]]]),
+    ...           np.array([[256.14981023656401, 364.30906039339868, 1459.6553639290375]])]
+    >>> shoulderJC = [np.array([[429.66951995, 275.06718615, 1453.953978131]]),
+    ...               np.array([[64.51952734, 274.93442161, 1463.6313334]])]
+    >>> vsk = { 'RightElbowWidth': 74.0, 'LeftElbowWidth': 74.0,
+    ...         'RightWristWidth': 55.0, 'LeftWristWidth': 55.0}
+    >>> origin, axis, wrist_O = elbowJointCenter(frame,thorax,shoulderJC,None,vsk)
+    >>> np.around(origin,8)
+    array([[[ 633.66707588,  304.95542115, 1256.07799541]],
+    <BLANKLINE>
+           [[-129.16966701,  316.86794653, 1258.06440971]]])
+    >>> np.around(wrist_O[1],8)
+    array([[-272.45939135,  485.80149026, 1091.36664789]])
+    """
+    RELB = frame['RELB']
+    LELB = frame['LELB']
+    RWRA = frame['RWRA']
+    RWRB = frame['RWRB']
+    LWRA = frame['LWRA']
+    LWRB = frame['LWRB']
+
+    R_elbowwidth = vsk['RightElbowWidth']
+    L_elbowwidth = vsk['LeftElbowWidth']
+    R_elbowwidth = R_elbowwidth * -1
+    mm = 7.0
+    R_delta =( (R_elbowwidth/2.0)-mm )
+    L_delta =( (L_elbowwidth/2.0)+mm )
+
+    RWRI = (RWRA+RWRB)/2.0
+    LWRI = (LWRA+LWRB)/2.0
+
+    RSJC = shoulderJC[0]
+    LSJC = shoulderJC[1]
+
+    # make the construction vector for finding Elbow joint center
+    R_con_1 = unit(RSJC-RELB)
+    R_con_2 = unit(RWRI-RELB)
+    R_cons_vec = unit(cross(R_con_1,R_con_2))
+    R_cons_vec = R_cons_vec*500+RELB
+
+    L_con_1 = unit(LSJC-LELB)
+    L_con_2 = unit(LWRI-LELB)
+    L_cons_vec = unit(cross(L_con_1,L_con_2))
+    L_cons_vec = L_cons_vec*500+LELB
+
+    REJC = findJointC(R_cons_vec,RSJC,RELB,R_delta)
+    LEJC = findJointC(L_cons_vec,LSJC,LELB,L_delta)
+
+    # this is radius axis for humerus
+    # right
+    x_axis = unit(RWRA-RWRB)
+    z_axis = unit(REJC-RWRI)
+    R_radius_y = unit(cross(z_axis,x_axis))
+
+    # left
+    x_axis = unit(LWRA-LWRB)
+    z_axis = unit(LEJC-LWRI)
+    L_radius_y = unit(cross(z_axis,x_axis))
+
+    # calculate wrist joint center for humerus
+    R_wristThickness = vsk['RightWristWidth']
+    L_wristThickness = vsk['LeftWristWidth']
+    R_wristThickness = (R_wristThickness / 2 + mm )
+    L_wristThickness = (L_wristThickness / 2 + mm )
+
+    RWJC = RWRI+R_wristThickness*R_radius_y
+    LWJC = LWRI-L_wristThickness*L_radius_y
+
+    # recombine the humerus axis
+    #right
+    z_axis = unit(RSJC-REJC)
+    x_axis = unit(RWJC-REJC)
+    y_axis = unit(cross(x_axis,z_axis))
+    x_axis = unit(cross(y_axis,z_axis))
+    # attach each calulcated elbow axis to elbow joint center.
+    R_axis = axisStack(x_axis+REJC,y_axis+REJC,z_axis+REJC)
+
+    # left
+    z_axis = unit(LSJC-LEJC)
+    x_axis = unit(LWJC-LEJC)
+    y_axis = unit(cross(x_axis,z_axis))
+    x_axis = unit(cross(y_axis,z_axis))
+    L_axis = axisStack(x_axis+LEJC,y_axis+LEJC,z_axis+LEJC)
+
+    return [[REJC,LEJC],[R_axis,L_axis],[RWJC,LWJC]]
+
+def wristJointCenter(frame,shoulderJC,wand,elbowJC):
+    """Calculate the Wrist joint axis (Radius) function for a stack of frames.
+
+    Parameters
+    ----------
+    frame : dict
+        Dictionary of marker names with (N,3) arrays of marker positions.
+    shoulderJC : list
+        The output of findshoulderJC.
+    wand : list
+        The output of findwandmarker.
+    elbowJC : list
+        The output of elbowJointCenter.
+
+    Returns
+    -------
+    origin, axis : list
+        Returns the right and left wrist joint centers, followed by a list of
+        the right and left radius axis as (N,3,3) arrays.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from .pycgmBatch import wristJointCenter
+    >>> elbowJC = [[np.array([[633.66707587, 304.95542115, 1256.07799541]]),
+    ...             np.array([[-129.1695218, 316.8671644, 1258.06440717]])],
+    ...            [np.array([[[633.81070138699954, 303.96579004975194, 1256.07658506845],
+    ...                        [634.35247991784638, 305.05386589332528, 1256.7994730142241],
+    ...                        [632.95321803901493, 304.85083190737765, 1256.7704317504911]]]),
+    ...             np.array([[[-129.32391792749493, 315.88072913249465, 1258.0086629318362],
+    ...                        [-128.45117135279025, 316.79382333592832, 1257.37260287807],
+    ...                        [-128.49119037560905, 316.7203088419364, 1258.783373067024]]])],
+    ...            [np.array([[793.32814303250677, 451.29134788252043, 1084.4325513020426]]),
+    ...             np.array([[-272.4594189740742, 485.80152210947699, 1091.3666238350822]])]]
+    >>> np.around(wristJointCenter(None,None,None,elbowJC)[1][1],8)
+    array([[[-272.92507295,  485.01202419, 1090.9667996 ],
+            [-271.74106833,  485.72818103, 1090.67481935],
+            [-271.94256432,  485.19216661, 1091.96791174]]])
+    """
+    # Bring Elbow joint center, axes and Wrist Joint Center for calculating Radius Axes
+    REJC = elbowJC[0][0]
+    LEJC = elbowJC[0][1]
+
+    R_elbow_flex = elbowJC[1][0][:,1]-REJC
+    L_elbow_flex = elbowJC[1][1][:,1]-LEJC
+
+    RWJC = elbowJC[2][0]
+    LWJC = elbowJC[2][1]
+
+    # this is the axis of radius
+    # right
+    y_axis = unit(R_elbow_flex)
+    z_axis = unit(REJC-RWJC)
+    x_axis = unit(cross(y_axis,z_axis))
+    z_axis = unit(cross(x_axis,y_axis))
+    # Attach all the axes to wrist joint center.
+    R_axis = axisStack(x_axis+RWJC,y_axis+RWJC,z_axis+RWJC)
+
+    # left
+    y_axis = unit(L_elbow_flex)
+    z_axis = unit(LEJC-LWJC)
+    x_axis = unit(cross(y_axis,z_axis))
+    z_axis = unit(cross(x_axis,y_axis))
+    L_axis = axisStack(x_axis+LWJC,y_axis+LWJC,z_axis+LWJC)
+
+    return [[RWJC,LWJC],[R_axis,L_axis]]
+
+def handJointCenter(frame,elbowJC,wristJC,vsk=None):
+    """Calculate the Hand joint axis (Hand) function for a stack of frames.
+
+    Markers used: RWRA, RWRB, LWRA, LWRB, RFIN, LFIN
+    Subject Measurement values used: RightHandThickness, LeftHandThickness
+
+    Parameters
+    ----------
+    frame : dict
+        Dictionary of marker names with (N,3) arrays of marker positions.
+    elbowJC : list
+        The output of elbowJointCenter.
+    wristJC : list
+        The output of wristJointCenter.
+    vsk : dict
+        A dictionary containing subject measurements from a VSK file.
+
+    Returns
+    -------
+    origin, axis : list
+        Returns the right and left hand joint centers, followed by a list of
+        the right and left hand axis as (N,3,3) arrays.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from .pycgmBatch import handJointCenter
+    >>> frame = {'RWRA': np.array([[776.51898193,495.68103027, 1108.38464355]]),
+    ...          'RWRB': np.array([[830.9072876, 436.75341797, 1119.11901855]]),
+    ...          'LWRA': np.array([[-249.28146362, 525.32977295, 1117.09057617]]),
+    ...          'LWRB': np.array([[-311.77532959, 477.22512817, 1125.1619873]]),
+    ...          'RFIN': np.array([[863.71374512, 524.4475708, 1074.54248047]]),
+    ...          'LFIN': np.array([[-326.65890503, 558.34338379, 1091.04284668]])}
+    >>> wristJC = [[np.array([[793.32814303250677, 451.29134788252043, 1084.4325513020426]]),
+    ...             np.array([[-272.4594189740742, 485.80152210947699, 1091.3666238350822]])]]
+    >>> vsk = { 'RightHandThickness': 34.0, 'LeftHandThickness': 34.0}
+    >>> origin, axis = handJointCenter(frame,None,wristJC,vsk)
+    >>> np.around(origin[0],8)
+    array([[ 859.80614366,  517.28239823, 1051.97278945]])
+    >>> np.around(axis[1],8)
+    array([[[-324.61994077,  552.15893309, 1068.9839343 ],
+            [-325.33293185,  551.29292486, 1068.12272964],
+            [-323.93837401,  551.13058004, 1068.29259013]]])
+    """
+    RWRA = frame['RWRA']
+    RWRB = frame['RWRB']
+    LWRA = frame['LWRA']
+    LWRB = frame['LWRB']
+    RFIN = frame['RFIN']
+    LFIN = frame['LFIN']
+
+    RWRI = (RWRA+RWRB)/2.0
+    LWRI = (LWRA+LWRB)/2.0
+
+    LWJC = wristJC[0][1]
+    RWJC = wristJC[0][0]
+
+    mm = 7.0
+    R_handThickness = vsk['RightHandThickness']
+    L_handThickness = vsk['LeftHandThickness']
+
+    R_delta =( R_handThickness/2 + mm )
+    L_delta =( L_handThickness/2 + mm )
+
+    LHND = findJointC(LWRI,LWJC,LFIN,L_delta)
+    RHND = findJointC(RWRI,RWJC,RFIN,R_delta)
+
+    # Left
+    z_axis = unit(LWJC-LHND)
+    y_axis = unit(LWRI-LWRA)
+    x_axis = unit(cross(y_axis,z_axis))
+    y_axis = unit(cross(z_axis,x_axis))
+    L_axis = axisStack(x_axis+LHND,y_axis+LHND,z_axis+LHND)
+
+    # Right
+    z_axis = unit(RWJC-RHND)
+    y_axis = unit(RWRA-RWRI)
+    x_axis = unit(cross(y_axis,z_axis))
+    y_axis = unit(cross(z_axis,x_axis))
+    R_axis = axisStack(x_axis+RHND,y_axis+RHND,z_axis+RHND)
+
+    return [[RHND,LHND],[R_axis,L_axis]]
+
+def axisMod(axis,origin):
+    """Remove the origin from an axis function
+
+    Subtracts the origin from every axis of a segment, giving the unit vectors
+    that are the input of the angle calculation functions.
+
+    Parameters
+    ----------
+    axis : array
+        An (N,3,3) array of axes with the origin added.
+    origin : array
+        An (N,3) array of the origin of the axes.
+
+    Returns
+    -------
+    array
+        An (N,3,3) array of the axes without the origin.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from .pycgmBatch import axisMod
+    >>> axis = np.array([[[2.0, 1.0, 1.0], [1.0, 2.0, 1.0], [1.0, 1.0, 2.0]]])
+    >>> origin = np.array([[1.0, 1.0, 1.0]])
+    >>> axisMod(axis,origin)
+    array([[[1., 0., 0.],
+            [0., 1., 0.],
+            [0., 0., 1.]]])
+    """
+    return axis-origin[...,np.newaxis,:]
+
+def JointAngleCalc(frame,vsk,out=None,jcOut=None,outputs=None):
+    """Joint Angle Calculation function for a whole trial.
+
+    Calculates the same joint angles and axis as JointAngleCalc in pyCGM.py
+    for every frame at once.
+
+    Parameters
+    ----------
+    frame : dict
+        Dictionary of marker names with (N,3) arrays of marker positions
+        for all N frames of the trial.
+    vsk : dict
+        A dictionary containing subject measurements from a VSK file.
+    out : array, optional
+        An (N,273) array owned by the caller. The results are written into
+        it and it is returned as r.
+    jcOut : array, optional
+        An (N,27,3) array where the joint center positions are written,
+        in the order of pyCGM.jointCenterKeys.
+    outputs : list, optional
+        Names of the joint angles and axis that are needed, see segmentsNeeded.
+        Only the segments they depend on are calculated, and only the markers
+        of those segments have to be in frame. Everything else is NaN.
+        By default everything is calculated.
+
+    Returns
+    -------
+    r, jc : tuple
+        Returns an (N,273) array with the joint angles followed by the axis
+        of each frame, in the same order as JointAngleCalc in pyCGM.py,
+        followed by a dictionary of the joint center positions as (N,3) arrays.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from .pycgmBatch import JointAngleCalc
+    >>> from .pyCGM import JointAngleCalc as JointAngleCalcFrame
+    >>> frame = {'RASI': [ 395.36532593,  428.09790039, 1036.82763672],
+    ...          'LASI': [ 183.18504333,  422.78927612, 1033.07299805],
+    ...          'RPSI': [ 341.41815186,  246.72117615, 1055.99145508],
+    ...          'LPSI': [ 255.79994202,  241.42199707, 1057.30065918],
+    ...          'RTHI': [ 426.50338745,  262.65310669,  673.66247559],
+    ...          'LTHI': [  51.93867874,  320.01849365,  723.03186035],
+    ...          'RKNE': [ 416.98687744,  266.22558594,  524.04089355],
+    ...          'LKNE': [  84.62355804,  286.69122314,  529.39819336],
+    ...          'RTIB': [ 433.97537231,  211.93408203,  273.3008728 ],
+    ...          'LTIB': [  50.04016495,  235.90718079,  364.32226562],
+    ...          'RANK': [ 422.77005005,  217.74053955,   92.86152649],
+    ...          'LANK': [  58.57380676,  208.54806519,   86.16953278],
+    ...          'RTOE': [ 442.81997681,  381.62280273,   42.66047668],
+    ...          'LTOE': [  39.43652725,  382.44522095,   41.78911591],
+    ...          'RHEE': [ 374.01257324,  181.57929993,   49.50960922],
+    ...          'LHEE': [ 105.30126953,  180.2130127 ,   47.15660858],
+    ...          'RFHD': [ 325.82983398,  402.55450439, 1722.49816895],
+    ...          'LFHD': [ 184.55158997,  409.68713379, 1721.34289551],
+    ...          'RBHD': [ 304.39898682,  242.91339111, 1694.97497559],
+    ...          'LBHD': [ 197.8621521 ,  251.28889465, 1696.90197754],
+    ...          'C7':   [ 251.22903442,  165.50309753, 1469.80566406],
+    ...          'T10':  [ 228.64323425,  192.32041931, 1279.6418457 ],
+    ...          'CLAV': [ 256.78051758,  371.28042603, 1459.70300293],
+    ...          'STRN': [ 251.67492676,  414.10391235, 1292.08508301],
+    ...          'RSHO': [ 428.88496562,  270.552948  , 1500.73010254],
+    ...          'LSHO': [  68.24668121,  269.01049805, 1510.1072998 ],
+    ...          'RELB': [ 658.90338135,  326.07580566, 1285.28515625],
+    ...          'LELB': [-156.32162476,  335.2593313 , 1287.39916992],
+    ...          'RWRA': [ 776.51898193,  495.68103027, 1108.38464355],
+    ...          'RWRB': [ 830.9072876 ,  436.75341797, 1119.11901855],
+    ...          'LWRA': [-249.28146362,  525.32977295, 1117.09057617],
+    ...          'LWRB': [-311.77532959,  477.22512817, 1125.1619873 ],
+    ...          'RFIN': [ 863.71374512,  524.4475708 , 1074.54248047],
+    ...          'LFIN': [-326.65890503,  558.34338379, 1091.04284668]}
+    >>> vsk = {'MeanLegLength': 940.0, 'R_AsisToTrocanterMeasure': 72.512,
+    ...        'L_AsisToTrocanterMeasure': 72.512, 'InterAsisDistance': 215.908996582031,
+    ...        'RightKneeWidth': 105.0, 'LeftKneeWidth': 105.0,
+    ...        'RightAnkleWidth': 70.0, 'LeftAnkleWidth': 70.0,
+    ...        'RightTibialTorsion': 0.0, 'LeftTibialTorsion': 0.0,
+    ...        'RightStaticRotOff': 0.015683497632642047, 'LeftStaticRotOff': 0.009402910292403012,
+    ...        'RightStaticPlantFlex': 0.2702417907002758, 'LeftStaticPlantFlex': 0.20251085737834015,
+    ...        'HeadOffset': 0.2571990469310653, 'RightShoulderOffset': 40.0, 'LeftShoulderOffset': 40.0,
+    ...        'RightElbowWidth': 74.0, 'LeftElbowWidth': 74.0, 'RightWristWidth': 55.0, 'LeftWristWidth': 55.0,
+    ...        'RightHandThickness': 34.0, 'LeftHandThickness': 34.0,
+    ...        'GCS': [[1, 0, 0], [0, 1, 0], [0, 0, 1]]}
+    >>> frames = dict((key, np.array([frame[key], frame[key]])) for key in frame)
+    >>> r, jc = JointAngleCalc(frames, vsk)
+    >>> r.shape
+    (2, 273)
+    >>> expected = JointAngleCalcFrame(dict((key, np.array(frame[key])) for key in frame), vsk)[0]
+    >>> np.allclose(r[0], expected) and np.allclose(r[1], expected)
+    True
+    >>> np.around(jc['RHand'],8)
+    array([[ 859.80200381,  517.28260116, 1051.97344217],
+           [ 859.80200381,  517.28260116, 1051.97344217]])
+    >>> out = np.zeros((2,273))
+    >>> joints = np.zeros((2,27,3))
+    >>> r, jc = JointAngleCalc(frames, vsk, out=out, jcOut=joints)
+    >>> r is out
+    True
+    >>> np.around(joints[:,25],8)
+    array([[ 859.80200381,  517.28260116, 1051.97344217],
+           [ 859.80200381,  517.28260116, 1051.97344217]])
+
+    Only the lower body, without any upper body markers.
+
+    >>> lower = dict((key, frames[key]) for key in frames if key in
+    ...              ['RASI','LASI','RPSI','LPSI','RTHI','LTHI','RKNE','LKNE'])
+    >>> r, jc = JointAngleCalc(lower, vsk, outputs=['R Hip', 'HIPO'])
+    >>> np.allclose(r[:,3:6], expected[3:6]) and np.allclose(r[:,69:72], expected[69:72])
+    True
+    >>> np.isnan(r[:,27:57]).all()
+    True
+    """
+    with np.errstate(invalid='ignore',divide='ignore'):
+        return _jointAngleCalc(frame,vsk,out,jcOut,outputs)
+
+# Segments each segment needs to be calculated first
+segmentDepends = {
+    'pelvis': [],
+    'hip': ['pelvis'],
+    'knee': ['hip'],
+    'ankle': ['knee'],
+    'foot': ['ankle'],
+    'head': [],
+    'thorax': [],
+    'wand': ['thorax'],
+    'shoulder': ['wand'],
+    'clavicle': ['shoulder'],
+    'humerus': ['shoulder'],
+    'radius': ['humerus'],
+    'hand': ['radius'],
+    }
+
+# Segments each joint angle is calculated from
+angleSegments = {
+    'Pelvis': ['pelvis'],
+    'R Hip': ['hip','knee'], 'L Hip': ['hip','knee'],
+    'R Knee': ['knee','ankle'], 'L Knee': ['knee','ankle'],
+    'R Ankle': ['ankle','foot'], 'L Ankle': ['ankle','foot'],
+    'R Foot': ['foot'], 'L Foot': ['foot'],
+    'Head': ['head'],
+    'Thorax': ['thorax'],
+    'Neck': ['head','thorax'],
+    'Spine': ['pelvis','thorax'],
+    'R Shoulder': ['thorax','humerus'], 'L Shoulder': ['thorax','humerus'],
+    'R Elbow': ['humerus','radius'], 'L Elbow': ['humerus','radius'],
+    'R Wrist': ['radius','hand'], 'L Wrist': ['radius','hand'],
+    }
+
+# Segment of each axis name, without the side and the O/X/Y/Z suffix
+axisSegments = {
+    'PEL': 'pelvis', 'HIP': 'hip', 'KNE': 'knee', 'ANK': 'ankle', 'FOO': 'foot',
+    'HEA': 'head', 'THO': 'thorax', 'CLA': 'clavicle', 'HUM': 'humerus',
+    'RAD': 'radius', 'HAN': 'hand',
+    }
+
+def segmentsNeeded(outputs):
+    """Segment dependency function
+
+    Finds every segment that has to be calculated to get the requested
+    joint angles and axis, following the chains
+    pelvis, hip, knee, ankle, foot and thorax, wand, shoulder, elbow, wrist, hand.
+
+    Parameters
+    ----------
+    outputs : list
+        Joint angle names, such as 'R Hip', and axis names, such as 'HIPO'
+        or 'L KNEX', as used by pycgmIO.writeResult.
+
+    Returns
+    -------
+    needed : set
+        The names of the segments to calculate.
+
+    Examples
+    --------
+    >>> from .pycgmBatch import segmentsNeeded
+    >>> sorted(segmentsNeeded(['R Knee']))
+    ['ankle', 'hip', 'knee', 'pelvis']
+    >>> sorted(segmentsNeeded(['HIPO', 'R Elbow']))
+    ['hip', 'humerus', 'pelvis', 'radius', 'shoulder', 'thorax', 'wand']
+    """
+    needed = set()
+    todo = []
+    for name in outputs:
+        if name in angleSegments:
+            todo.extend(angleSegments[name])
+        elif name[-4:-1] in axisSegments and name[-1] in 'OXYZ' and name[:-4] in ('','R ','L '):
+            todo.append(axisSegments[name[-4:-1]])
+        else:
+            raise ValueError("Unknown joint angle or axis: %s" % name)
+
+    while len(todo) > 0:
+        segment = todo.pop()
+        if segment not in needed:
+            needed.add(segment)
+            todo.extend(segmentDepends[segment])
+
+    return needed
+
+def _jointAngleCalc(frame,vsk,out=None,jcOut=None,outputs=None):
+    if outputs is None:
+        needed = set(segmentDepends)
+    else:
+        needed = segmentsNeeded(outputs)
+
+    if len(frame) == 0:
+        raise ValueError("There are no markers or frames to calculate")
+    frame = dict((key,np.asarray(frame[key],dtype=np.float64)) for key in frame)
+    nframes = len(frame[next(iter(frame))])
+
+    if out is None:
+        r = np.empty((nframes,273))
+    else:
+        r = out
+    if outputs is not None:
+        # anything that is not calculated stays NaN
+        r[:] = np.nan
+
+    #need to update this based on the file
+    global_Axis = np.asarray(vsk['GCS'],dtype=np.float64)
+
+    # every segment is stored as origin, x axis, y axis, z axis
+    # from this column, in the same order as pyCGM.JointAngleCalc
+    axisColumns = {}
+    jc = {}
+
+    if 'pelvis' in needed:
+        #First Calculate Pelvis
+        pelvis_axis = pelvisJointCenter(frame)
+        Pelvis_origin = pelvis_axis[0]
+        Pelvis_vectors = pelvis_axis[1]
+
+        pelvis_Axis_mod = axisMod(Pelvis_vectors,Pelvis_origin)
+
+        ang = getangle(global_Axis,pelvis_Axis_mod)
+        r[:,0] = ang[:,0]
+        r[:,1] = ang[:,1]
+        r[:,2] = ang[:,2]
+
+        axisColumns[57] = (Pelvis_origin,Pelvis_vectors)
+        jc['Pelvis_axis'] = pelvis_axis
+        jc['Pelvis'] = Pelvis_origin
+
+    if 'hip' in needed:
+        # and then find hip JC
+        hip_JC = hipJointCenter(frame,Pelvis_origin,Pelvis_vectors[:,0],Pelvis_vectors[:,1],Pelvis_vectors[:,2],vsk=vsk)
+        hip_axis = hipAxisCenter(hip_JC[0],hip_JC[1],pelvis_axis)
+        hip_Axis = axisMod(hip_axis[1],hip_axis[0])
+
+        axisColumns[69] = (hip_axis[0],hip_axis[1])
+        jc['RHip'] = hip_JC[1]
+        jc['LHip'] = hip_JC[0]
+
+    if 'knee' in needed:
+        knee_JC = kneeJointCenter(frame,hip_JC,0,vsk=vsk)
+
+        R_knee_Axis = axisMod(knee_JC[2][0],knee_JC[0])
+        L_knee_Axis = axisMod(knee_JC[2][1],knee_JC[1])
+
+        ang = getangle(hip_Axis,R_knee_Axis)
+        r[:,3] = ang[:,0]*-1
+        r[:,4] = ang[:,1]
+        r[:,5] = ang[:,2]*-1+90
+
+        ang = getangle(hip_Axis,L_knee_Axis)
+        r[:,6] = ang[:,0]*-1
+        r[:,7] = ang[:,1]*-1
+        r[:,8] = ang[:,2]-90
+
+        axisColumns[81] = (knee_JC[0],knee_JC[2][0])
+        axisColumns[93] = (knee_JC[1],knee_JC[2][1])
+        jc['RKnee'] = knee_JC[0]
+        jc['LKnee'] = knee_JC[1]
+
+    if 'ankle' in needed:
+        ankle_JC = ankleJointCenter(frame,knee_JC,0,vsk=vsk)
+
+        R_ankle_Axis = axisMod(ankle_JC[2][0],ankle_JC[0])
+        L_ankle_Axis = axisMod(ankle_JC[2][1],ankle_JC[1])
+
+        ang = getangle(R_knee_Axis,R_ankle_Axis)
+        r[:,9] = ang[:,0]
+        r[:,10] = ang[:,1]
+        r[:,11] = ang[:,2]*-1+90
+
+        ang = getangle(L_knee_Axis,L_ankle_Axis)
+        r[:,12] = ang[:,0]
+        r[:,13] = ang[:,1]*-1
+        r[:,14] = ang[:,2]-90
+
+        axisColumns[105] = (ankle_JC[0],ankle_JC[2][0])
+        axisColumns[117] = (ankle_JC[1],ankle_JC[2][1])
+        jc['RAnkle'] = ankle_JC[0]
+        jc['LAnkle'] = ankle_JC[1]
+
+    if 'foot' in needed:
+        # ANKLE ANGLE
+        foot_JC = footJointCenter(frame,vsk,ankle_JC,knee_JC,0)
+
+        R_foot_Axis = axisMod(foot_JC[2][0],foot_JC[0])
+        L_foot_Axis = axisMod(foot_JC[2][1],foot_JC[1])
+
+        ang = getangle(R_ankle_Axis,R_foot_Axis)
+        r[:,15] = ang[:,0]*(-1)-90
+        r[:,16] = ang[:,2]*(-1)+90
+        r[:,17] = ang[:,1]
+
+        ang = getangle(L_ankle_Axis,L_foot_Axis)
+        r[:,18] = ang[:,0]*(-1)-90
+        r[:,19] = ang[:,2]-90
+        r[:,20] = ang[:,1]*(-1)
+
+        # ABSOLUTE FOOT ANGLE
+        ang = getangle(global_Axis,R_foot_Axis)
+        r[:,21] = ang[:,0]
+        r[:,22] = ang[:,2]-90
+        r[:,23] = ang[:,1]
+
+        ang = getangle(global_Axis,L_foot_Axis)
+        r[:,24] = ang[:,0]
+        r[:,25] = (ang[:,2]-90)*-1
+        r[:,26] = ang[:,1]*-1
+
+        axisColumns[129] = (foot_JC[0],foot_JC[2][0])
+        axisColumns[141] = (foot_JC[1],foot_JC[2][1])
+        jc['RFoot'] = foot_JC[0]
+        jc['LFoot'] = foot_JC[1]
+
+    if 'head' in needed:
+        #First Calculate HEAD
+        head_axis = headJC(frame,vsk=vsk)
+        head_Axis_mod = axisMod(head_axis[0],head_axis[1])
+
+        ang = getHeadangle(global_Axis,head_Axis_mod)
+        headx = ang[:,0]*-1
+        r[:,27] = np.where(headx<-180,headx+360,headx)
+        r[:,28] = ang[:,1]*-1
+        r[:,29] = np.where(ang[:,2]<-180,ang[:,2]-360,ang[:,2])
+
+        axisColumns[153] = (head_axis[1],head_axis[0])
+        jc['Front_Head'] = (frame['LFHD']+frame['RFHD'])/2
+        jc['Back_Head'] = (frame['LBHD']+frame['RBHD'])/2
+        jc['Head'] = head_axis[1]
+
+    if 'thorax' in needed:
+        # Calculate THORAX
+        thorax_axis = thoraxJC(frame)
+        thorax_Axis_mod = axisMod(thorax_axis[0],thorax_axis[1])
+
+        #this needs to be fixed for the global rotation
+        global_Axis_thorax = np.asarray(rotmat(x=0,y=0,z=180),dtype=np.float64)
+
+        ang = getangle(global_Axis_thorax,thorax_Axis_mod)
+        thox = ang[:,0]
+        r[:,30] = np.where(thox>0,thox-180,np.where(thox<0,thox+180,thox))
+        r[:,31] = ang[:,1]
+        r[:,32] = ang[:,2]+90
+
+        axisColumns[165] = (thorax_axis[1],thorax_axis[0])
+        jc['Thorax_axis'] = thorax_axis
+        jc['Thorax'] = thorax_axis[1]
+
+    if 'head' in needed and 'thorax' in needed:
+        # Calculate NECK
+        ang = getHeadangle(head_Axis_mod,thorax_Axis_mod)
+        r[:,33] = (ang[:,0]-180)*-1
+        r[:,34] = ang[:,1]
+        r[:,35] = ang[:,2]*-1
+
+    if 'pelvis' in needed and 'thorax' in needed:
+        # Calculate SPINE
+        ang = getangle_spi(pelvis_Axis_mod,thorax_Axis_mod)
+        r[:,36] = ang[:,0]
+        r[:,37] = ang[:,2]*-1
+        r[:,38] = ang[:,1]
+
+    if 'wand' in needed:
+        wand = findwandmarker(frame,thorax_axis)
+
+    if 'shoulder' in needed:
+        shoulder_JC = findshoulderJC(frame,thorax_axis,wand,vsk=vsk)
+        jc['RShoulder'] = shoulder_JC[0]
+        jc['LShoulder'] = shoulder_JC[1]
+
+    if 'clavicle' in needed:
+        shoulder_axis = shoulderAxisCalc(frame,thorax_axis,shoulder_JC,wand)
+        axisColumns[177] = (shoulder_axis[0][0],shoulder_axis[1][0])
+        axisColumns[189] = (shoulder_axis[0][1],shoulder_axis[1][1])
+
+    if 'humerus' in needed:
+        # Calculate SHOULDER
+        humerus_JC = elbowJointCenter(frame,thorax_axis,shoulder_JC,wand,vsk=vsk)
+
+        R_humerus_Axis_mod = axisMod(humerus_JC[1][0],humerus_JC[0][0])
+        L_humerus_Axis_mod = axisMod(humerus_JC[1][1],humerus_JC[0][1])
+
+        ang = getangle_sho(thorax_Axis_mod,R_humerus_Axis_mod)
+        rsho1 = ang[:,1]
+        rsho2 = ang[:,2]
+        rsho2 = np.where(rsho2<0,rsho2+180,np.where(rsho2>0,rsho2-180,rsho2))
+        rsho1 = np.where(rsho1>0,rsho1-180,np.where(rsho1<0,rsho1*-1-180,rsho1))
+        r[:,39] = ang[:,0]*-1
+        r[:,40] = rsho1*-1
+        r[:,41] = rsho2
+
+        ang = getangle_sho(thorax_Axis_mod,L_humerus_Axis_mod)
+        lsho1 = ang[:,1]
+        lsho1 = np.where(lsho1<0,lsho1+180,np.where(lsho1>0,lsho1-180,lsho1))
+        lshoz = (ang[:,2]-180)*-1
+        r[:,42] = ang[:,0]*-1
+        r[:,43] = lsho1
+        r[:,44] = np.where(lshoz>180,lshoz-360,lshoz)
+
+        axisColumns[201] = (humerus_JC[0][0],humerus_JC[1][0])
+        axisColumns[213] = (humerus_JC[0][1],humerus_JC[1][1])
+        jc['RHumerus'] = humerus_JC[0][0]
+        jc['LHumerus'] = humerus_JC[0][1]
+
+    if 'radius' in needed:
+        # Calculate ELBOW
+        radius_JC = wristJointCenter(frame,shoulder_JC,wand,humerus_JC)
+
+        R_radius_Axis_mod = axisMod(radius_JC[1][0],radius_JC[0][0])
+        L_radius_Axis_mod = axisMod(radius_JC[1][1],radius_JC[0][1])
+
+        ang = getangle(R_humerus_Axis_mod,R_radius_Axis_mod)
+        r[:,45] = ang[:,0]
+        r[:,46] = ang[:,1]
+        r[:,47] = ang[:,2]-90.0
+
+        ang = getangle(L_humerus_Axis_mod,L_radius_Axis_mod)
+        r[:,48] = ang[:,0]
+        r[:,49] = ang[:,1]
+        r[:,50] = ang[:,2]-90.0
+
+        axisColumns[225] = (radius_JC[0][0],radius_JC[1][0])
+        axisColumns[237] = (radius_JC[0][1],radius_JC[1][1])
+        jc['RRadius'] = radius_JC[0][0]
+        jc['LRadius'] = radius_JC[0][1]
+
+    if 'hand' in needed:
+        # Calculate WRIST
+        hand_JC = handJointCenter(frame,humerus_JC,radius_JC,vsk=vsk)
+
+        R_hand_Axis_mod = axisMod(hand_JC[1][0],hand_JC[0][0])
+        L_hand_Axis_mod = axisMod(hand_JC[1][1],hand_JC[0][1])
+
+        ang = getangle(R_radius_Axis_mod,R_hand_Axis_mod)
+        r[:,51] = ang[:,0]
+        r[:,52] = ang[:,1]
+        r[:,53] = ang[:,2]*-1+90
+
+        ang = getangle(L_radius_Axis_mod,L_hand_Axis_mod)
+        lwrtz = ang[:,2]-90
+        r[:,54] = ang[:,0]
+        r[:,55] = ang[:,1]*-1
+        r[:,56] = np.where(lwrtz<-180,lwrtz+360,lwrtz)
+
+        axisColumns[249] = (hand_JC[0][0],hand_JC[1][0])
+        axisColumns[261] = (hand_JC[0][1],hand_JC[1][1])
+        jc['RHand'] = hand_JC[0][0]
+        jc['LHand'] = hand_JC[0][1]
+
+    # make each axis as same format to store
+    for start in axisColumns:
+        origin,axis = axisColumns[start]
+        r[:,start:start+3] = origin
+        r[:,start+3:start+12] = axis.reshape(nframes,9)
+
+    # markers that are passed through as joint centers
+    for key in ['RHEE','LHEE','C7','CLAV','STRN','T10']:
+        if key in frame:
+            jc[key] = frame[key]
+
+    if jcOut is not None:
+        for i,key in enumerate(jointCenterKeys()):
+            if key in jc:
+                jcOut[:,i] = jc[key]
+            else:
+                jcOut[:,i] = np.nan
+
+    return r,jc
+
+def frameArrays(data):
+    """Convert frames to marker arrays function
+
+    Converts a list of frame dictionaries, as returned by pycgmIO.loadData,
+    into a single dictionary with an (N,3) array for each marker.
+    Markers which are missing in a frame are filled with NaN.
+
+    Parameters
+    ----------
+    data : list
+        List of dictionaries of marker names with x,y,z positions.
+
+    Returns
+    -------
+    dict
+        Dictionary of marker names with (N,3) arrays of marker positions.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from .pycgmBatch import frameArrays
+    >>> data = [{'RASI': np.array([1.0, 2.0, 3.0]), 'LASI': np.array([4.0, 5.0, 6.0])},
+    ...         {'RASI': np.array([7.0, 8.0, 9.0])}]
+    >>> arrays = frameArrays(data)
+    >>> arrays['RASI']
+    array([[1., 2., 3.],
+           [7., 8., 9.]])
+    >>> arrays['LASI']
+    array([[ 4.,  5.,  6.],
+           [nan, nan, nan]])
+    """
+    #imported here because pycgmIO imports pyCGM, which imports pycgmIO
+    from .pycgmIO import MarkerSet
+    return MarkerSet.fromFrames(data).markers()
+
+def markerArrays(labels,data):
+    """Convert a marker array to marker arrays function
+
+    Splits an (N,M,3) array of N frames of M markers, as returned by
+    pycgmIO.splitMotionDataDict, into a dictionary with an (N,3) array
+    for each marker. The arrays are views into data, no values are copied.
+
+    Parameters
+    ----------
+    labels : list
+        List of the M marker names.
+    data : array
+        An (N,M,3) array of marker positions.
+
+    Returns
+    -------
+    dict
+        Dictionary of marker names with (N,3) arrays of marker positions.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from .pycgmBatch import markerArrays
+    >>> data = np.arange(12.0).reshape(2,2,3)
+    >>> arrays = markerArrays(['RASI ', 'LASI'], data)
+    >>> arrays['RASI']
+    array([[0., 1., 2.],
+           [6., 7., 8.]])
+    >>> np.shares_memory(arrays['LASI'], data)
+    True
+    """
+    data = np.asarray(data,dtype=np.float64)
+    arrays = {}
+    for i,label in enumerate(labels):
+        arrays[str(label.rstrip())] = data[:,i,:]
+    return arrays
+
+# Static calibration (batched version of pycgmStatic)
+def nanAverage(values,axis=0):
+    """NaN-aware average function
+
+    Averages the values over the frames, skipping frames where the value is
+    NaN, e.g. because a marker is missing in the frame.
+
+    Parameters
+    ----------
+    values : array
+        Array of values with the frames along axis.
+    axis : int, optional
+        The axis of the frames. The default is 0.
+
+    Returns
+    -------
+    array or float
+        The average of the values that are not NaN. NaN if all the
+        values are NaN.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from .pycgmBatch import nanAverage
+    >>> nanAverage(np.array([1.0, np.nan, 3.0]))
+    2.0
+    >>> nanAverage(np.array([np.nan, np.nan]))
+    nan
+    """
+    values = np.asarray(values,dtype=np.float64)
+    count = np.sum(~np.isnan(values),axis=axis)
+    total = np.nansum(values,axis=axis)
+    with np.errstate(invalid='ignore',divide='ignore'):
+        return np.where(count>0,total/np.maximum(count,1),np.nan)[()]
+
+def IADcalculation(frame):
+    """Inter ASIS Distance (IAD) Calculation function for a stack of frames.
+
+    Markers used: RASI, LASI
+
+    Parameters
+    ----------
+    frame : dict
+        Dictionary of marker names with (N,3) arrays of marker positions.
+
+    Returns
+    -------
+    IAD : array
+        (N,) array of the distance between RASI and LASI.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from .pycgmBatch import IADcalculation
+    >>> frame = { 'LASI': np.array([[ 183.18504333,  422.78927612, 1033.07299805]]),
+    ...           'RASI': np.array([[ 395.36532593,  428.09790039, 1036.82763672]])}
+    >>> np.around(IADcalculation(frame),8)
+    array([212.27988866])
+    """
+    return norm(frame['RASI']-frame['LASI'])
+
+def uncorrect_footaxis(frame,ankle_JC):
+    """Calculate the anatomical uncorrect foot axis function for a stack of frames.
+
+    Markers used: RTOE, LTOE
+
+    Parameters
+    ----------
+    frame : dict
+        Dictionary of marker names with (N,3) arrays of marker positions.
+    ankle_JC : list
+        The output of ankleJointCenter.
+
+    Returns
+    -------
+    R, L, foot_axis : list
+        Returns the right and left foot origin as (N,3) arrays, followed
+        by a list of the right and left foot axis as (N,3,3) arrays.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from .pycgmBatch import uncorrect_footaxis
+    >>> frame = { 'RTOE': np.array([[442.81997681, 381.62280273, 42.66047668]]),
+    ...           'LTOE': np.array([[39.43652725, 382.44522095, 41.78911591]])}
+    >>> ankle_JC = [np.array([[393.76181608, 247.67829633, 87.73775041]]),
+    ...             np.array([[98.74901939, 219.46930221, 80.6306816]]),
+    ...             [np.array([[[394.4817575, 248.37201348, 87.715368],
+    ...                         [393.07114384, 248.39110006, 87.61575574],
+    ...                         [393.69314056, 247.78157916, 88.73002876]]]),
+    ...              np.array([[[98.47494966, 220.42553803, 80.52821783],
+    ...                         [97.79246671, 219.20927275, 80.76255901],
+    ...                         [98.84848169, 219.60345781, 81.61663775]]])]]
+    >>> R, L, axis = uncorrect_footaxis(frame,ankle_JC)
+    >>> np.around(axis[0],8)
+    array([[[442.93807347, 381.90040642,  43.61388602],
+            [441.882686  , 381.97104076,  42.67518049],
+            [442.49204525, 380.72744444,  42.96179781]]])
+    """
+    TOE_R = frame['RTOE']
+    TOE_L = frame['LTOE']
+
+    ankle_JC_R = ankle_JC[0]
+    ankle_JC_L = ankle_JC[1]
+    ankle_flexion_R = ankle_JC[2][0][:,1]
+    ankle_flexion_L = ankle_JC[2][1][:,1]
+
+    # Foot axis's origin is marker position of TOE
+    R = TOE_R
+    L = TOE_L
+
+    # z axis is from Toe to AJC, the y flexion axis comes from the ankle axis
+    R_axis_z = unit(ankle_JC_R-TOE_R)
+    y_flex_R = unit(ankle_flexion_R-ankle_JC_R)
+    R_axis_x = unit(cross(y_flex_R,R_axis_z))
+    R_axis_y = unit(cross(R_axis_z,R_axis_x))
+
+    L_axis_z = unit(ankle_JC_L-TOE_L)
+    y_flex_L = unit(ankle_flexion_L-ankle_JC_L)
+    L_axis_x = unit(cross(y_flex_L,L_axis_z))
+    L_axis_y = unit(cross(L_axis_z,L_axis_x))
+
+    R_foot_axis = axisStack(R_axis_x+R,R_axis_y+R,R_axis_z+R)
+    L_foot_axis = axisStack(L_axis_x+L,L_axis_y+L,L_axis_z+L)
+
+    return [R,L,[R_foot_axis,L_foot_axis]]
+
+def rotaxis_footflat(frame,ankle_JC,vsk=None):
+    """Calculate the anatomical correct foot axis for foot flat function for a stack of frames.
+
+    Markers used: RTOE, LTOE, RHEE, LHEE
+    Subject Measurement values used: RightSoleDelta, LeftSoleDelta
+
+    Parameters
+    ----------
+    frame : dict
+        Dictionary of marker names with (N,3) arrays of marker positions.
+    ankle_JC : list
+        The output of ankleJointCenter.
+    vsk : dict
+        A dictionary containing subject measurements from a VSK file.
+
+    Returns
+    -------
+    R, L, foot_axis : list
+        Returns the right and left foot origin as (N,3) arrays, followed
+        by a list of the right and left foot axis as (N,3,3) arrays.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from .pycgmBatch import rotaxis_footflat
+    >>> frame = { 'RHEE': np.array([[374.01257324, 181.57929993, 49.50960922]]),
+    ...           'LHEE': np.array([[105.30126953, 180.2130127, 47.15660858]]),
+    ...           'RTOE': np.array([[442.81997681, 381.62280273, 42.66047668]]),
+    ...           'LTOE': np.array([[39.43652725, 382.44522095, 41.78911591]])}
+    >>> ankle_JC = [np.array([[393.76181608, 247.67829633, 87.73775041]]),
+    ...             np.array([[98.74901939, 219.46930221, 80.6306816]]),
+    ...             [np.array([[[394.4817575, 248.37201348, 87.715368],
+    ...                         [393.07114384, 248.39110006, 87.61575574],
+    ...                         [393.69314056, 247.78157916, 88.73002876]]]),
+    ...              np.array([[[98.47494966, 220.42553803, 80.52821783],
+    ...                         [97.79246671, 219.20927275, 80.76255901],
+    ...                         [98.84848169, 219.60345781, 81.61663775]]])]]
+    >>> vsk = { 'RightSoleDelta': 0.45, 'LeftSoleDelta': 0.45 }
+    >>> R, L, axis = rotaxis_footflat(frame,ankle_JC,vsk)
+    >>> np.around(axis[1],8)
+    array([[[ 39.14565179, 382.3504861 ,  42.74117514],
+            [ 38.53126992, 382.15038888,  41.48320216],
+            [ 39.74620554, 381.49437955,  41.78911591]]])
+    """
+    R_sole_delta = vsk['RightSoleDelta']
+    L_sole_delta = vsk['LeftSoleDelta']
+
+    TOE_R = frame['RTOE']
+    TOE_L = frame['LTOE']
+    HEE_R = frame['RHEE']
+    HEE_L = frame['LHEE']
+    ankle_flexion_R = ankle_JC[2][0][:,1]
+    ankle_flexion_L = ankle_JC[2][1][:,1]
+
+    # Toe axis's origin is marker position of TOE
+    R = TOE_R
+    L = TOE_L
+
+    ankle_JC_R = ankle_JC[0]+[0,0,R_sole_delta]
+    ankle_JC_L = ankle_JC[1]+[0,0,L_sole_delta]
+
+    def footflat(TOE,HEE,ankle,ankle_flexion):
+        axis_z = unit(ankle-TOE)
+        # For foot flat, Z axis pointing same height of TOE marker from TOE to AJC
+        hee2_toe = HEE-TOE
+        hee2_toe[:,2] = TOE[:,2]-TOE[:,2]
+        hee2_toe = unit(hee2_toe)
+        A = unit(cross(hee2_toe,axis_z))
+        B = unit(cross(A,hee2_toe))
+        axis_z = unit(cross(B,A))
+
+        # Bring flexion axis from ankle axis.
+        y_flex = unit(ankle_flexion-ankle)
+        axis_x = unit(cross(y_flex,axis_z))
+        axis_y = unit(cross(axis_z,axis_x))
+        axis_z = unit(cross(axis_x,axis_y))
+        return axisStack(axis_x+TOE,axis_y+TOE,axis_z+TOE)
+
+    R_foot_axis = footflat(TOE_R,HEE_R,ankle_JC_R,ankle_flexion_R)
+    L_foot_axis = footflat(TOE_L,HEE_L,ankle_JC_L,ankle_flexion_L)
+
+    return [R,L,[R_foot_axis,L_foot_axis]]
+
+def rotaxis_nonfootflat(frame,ankle_JC):
+    """Calculate the anatomical correct foot axis for non foot flat function for a stack of frames.
+
+    Markers used: RTOE, LTOE, RHEE, LHEE
+
+    Parameters
+    ----------
+    frame : dict
+        Dictionary of marker names with (N,3) arrays of marker positions.
+    ankle_JC : list
+        The output of ankleJointCenter.
+
+    Returns
+    -------
+    R, L, foot_axis : list
+        Returns the right and left foot origin as (N,3) arrays, followed
+        by a list of the right and left foot axis as (N,3,3) arrays.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from .pycgmBatch import rotaxis_nonfootflat
+    >>> frame = { 'RHEE': np.array([[374.01257324, 181.57929993, 49.50960922]]),
+    ...           'LHEE': np.array([[105.30126953, 180.2130127, 47.15660858]]),
+    ...           'RTOE': np.array([[442.81997681, 381.62280273, 42.66047668]]),
+    ...           'LTOE': np.array([[39.43652725, 382.44522095, 41.78911591]])}
+    >>> ankle_JC = [np.array([[393.76181608, 247.67829633, 87.73775041]]),
+    ...             np.array([[98.74901939, 219.46930221, 80.6306816]]),
+    ...             [np.array([[[394.4817575, 248.37201348, 87.715368],
+    ...                         [393.07114384, 248.39110006, 87.61575574],
+    ...                         [393.69314056, 247.78157916, 88.73002876]]]),
+    ...              np.array([[[98.47494966, 220.42553803, 80.52821783],
+    ...                         [97.79246671, 219.20927275, 80.76255901],
+    ...                         [98.84848169, 219.60345781, 81.61663775]]])]]
+    >>> R, L, axis = rotaxis_nonfootflat(frame,ankle_JC)
+    >>> np.around(axis[0],8)
+    array([[[442.71651135, 381.69236202,  43.65267444],
+            [441.87997036, 381.94200709,  42.54007546],
+            [442.49488793, 380.67767307,  42.69283623]]])
+    """
+    TOE_R = frame['RTOE']
+    TOE_L = frame['LTOE']
+    HEE_R = frame['RHEE']
+    HEE_L = frame['LHEE']
+
+    ankle_JC_R = ankle_JC[0]
+    ankle_JC_L = ankle_JC[1]
+    ankle_flexion_R = ankle_JC[2][0][:,1]
+    ankle_flexion_L = ankle_JC[2][1][:,1]
+
+    # Toe axis's origin is marker position of TOE
+    R = TOE_R
+    L = TOE_L
+
+    # in case of non foot flat we just use the HEE marker
+    R_axis_z = unit(HEE_R-TOE_R)
+    y_flex_R = unit(ankle_flexion_R-ankle_JC_R)
+    R_axis_x = unit(cross(y_flex_R,R_axis_z))
+    R_axis_y = unit(cross(R_axis_z,R_axis_x))
+
+    L_axis_z = unit(HEE_L-TOE_L)
+    y_flex_L = unit(ankle_flexion_L-ankle_JC_L)
+    L_axis_x = unit(cross(y_flex_L,L_axis_z))
+    L_axis_y = unit(cross(L_axis_z,L_axis_x))
+
+    R_foot_axis = axisStack(R_axis_x+R,R_axis_y+R,R_axis_z+R)
+    L_foot_axis = axisStack(L_axis_x+L,L_axis_y+L,L_axis_z+L)
+
+    return [R,L,[R_foot_axis,L_foot_axis]]
+
+def axisRotation(axisP,axisD):
+    """Rotation matrix between two axes function
+
+    Calculates M = axisD . inverse(axisP) for a stack of frames. Frames
+    where axisP has NaN values give NaN instead of stopping the inversion
+    of the other frames.
+
+    Parameters
+    ----------
+    axisP : array
+        (3,3) or (N,3,3) array of the proximal axis.
+    axisD : array
+        (N,3,3) array of the distal axis.
+
+    Returns
+    -------
+    M : array
+        (N,3,3) array of the rotation matrices.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from .pycgmBatch import axisRotation
+    >>> axisP = np.array([[[0.0, 1.0, 0.0], [-1.0, 0.0, 0.0], [0.0, 0.0, 1.0]],
+    ...                   [[np.nan, 1.0, 0.0], [-1.0, 0.0, 0.0], [0.0, 0.0, 1.0]]])
+    >>> axisD = np.array([np.eye(3), np.eye(3)])
+    >>> axisRotation(axisP,axisD)
+    array([[[ 0., -1.,  0.],
+            [ 1.,  0.,  0.],
+            [ 0.,  0.,  1.]],
+    <BLANKLINE>
+           [[nan, nan, nan],
+            [nan, nan, nan],
+            [nan, nan, nan]]])
+    """
+    axisP = np.asarray(axisP,dtype=np.float64)
+    axisD = np.asarray(axisD,dtype=np.float64)
+    if axisP.ndim == 2:
+        return np.matmul(axisD,np.linalg.inv(axisP))
+
+    axisPi = np.full(axisP.shape,np.nan)
+    valid = np.all(np.isfinite(axisP),axis=(1,2))
+    axisPi[valid] = np.linalg.inv(axisP[valid])
+    return np.matmul(axisD,axisPi)
+
+def getankleangle(axisP,axisD):
+    """Static angle calculation function for a stack of frames.
+
+    Parameters
+    ----------
+    axisP : array
+        (N,3,3) array of the unit vectors of the proximal axis.
+    axisD : array
+        (N,3,3) array of the unit vectors of the distal axis.
+
+    Returns
+    -------
+    angle : array
+        (N,3) array of the alpha, beta, gamma angles in radians.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from .pycgmBatch import getankleangle
+    >>> axisP = np.array([[[ 0.59327576, 0.10572786, 0.15773334],
+    ...                    [-0.13176004, -0.10067464, -0.90325703],
+    ...                    [0.9399765, -0.04907387, 0.75029827]]])
+    >>> axisD = np.array([[[0.16701015, 0.69080381, -0.37358145],
+    ...                    [0.1433922, -0.3923507, 0.94383974],
+    ...                    [-0.15507695, -0.5313784, -0.60119402]]])
+    >>> np.around(getankleangle(axisP,axisD),8)
+    array([[0.47919763, 0.99019921, 1.51695461]])
+    """
+    # M is multiply of axisD and the inverse of axisP
+    M = axisRotation(axisP,axisD)
+
+    # This is the angle calculation in YXZ Euler angle
+    getA = M[:,2,1] / np.sqrt((M[:,2,0]*M[:,2,0])+(M[:,2,2]*M[:,2,2]))
+    getB = -1*M[:,2,0] / M[:,2,2]
+    getG = -1*M[:,0,1] / M[:,1,1]
+
+    return np.stack([np.arctan(getA),np.arctan(getB),np.arctan(getG)],axis=-1)
+
+def staticCalculation(frame,ankle_JC,knee_JC,flat_foot,vsk=None):
+    """Calculate the Static angle function for a stack of frames.
+
+    Calculates the offset angle between the anatomical uncorrect and
+    correct foot axis, which depends on the foot flat option.
+
+    Parameters
+    ----------
+    frame : dict
+        Dictionary of marker names with (N,3) arrays of marker positions.
+    ankle_JC : list
+        The output of ankleJointCenter.
+    knee_JC : list
+        The output of kneeJointCenter.
+    flat_foot : boolean
+        A boolean indicating if the feet are flat or not.
+    vsk : dict, optional
+        A dictionary containing subject measurements from a VSK file.
+
+    Returns
+    -------
+    angle : array
+        (N,2,3) array of the right and left offset angles in radians.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from .pycgmBatch import staticCalculation
+    >>> frame = {'RTOE': np.array([[427.95211792, 437.99603271,  41.77342987]]),
+    ...          'LTOE': np.array([[175.78988647, 379.49987793,  42.61193085]]),
+    ...          'RHEE': np.array([[406.46331787, 227.56491089,  48.75952911]]),
+    ...          'LHEE': np.array([[223.59848022, 173.42980957,  47.92973328]])}
+    >>> ankle_JC = [np.array([[393.76181608, 247.67829633, 87.73775041]]),
+    ...             np.array([[98.74901939, 219.46930221, 80.6306816]]),
+    ...             [np.array([[[394.4817575, 248.37201348, 87.715368],
+    ...                         [393.07114384, 248.39110006, 87.61575574],
+    ...                         [393.69314056, 247.78157916, 88.73002876]]]),
+    ...              np.array([[[98.47494966, 220.42553803, 80.52821783],
+    ...                         [97.79246671, 219.20927275, 80.76255901],
+    ...                         [98.84848169, 219.60345781, 81.61663775]]])]]
+    >>> vsk = { 'RightSoleDelta': 0.4532,'LeftSoleDelta': 0.4532 }
+    >>> np.around(staticCalculation(frame,ankle_JC,None,True,vsk),8)
+    array([[[-0.08036968,  0.23192796, -0.66672181],
+            [-0.67466613,  0.21812578, -0.30207993]]])
+    >>> np.around(staticCalculation(frame,ankle_JC,None,False,vsk),8)
+    array([[[-0.07971346,  0.19881323, -0.15319313],
+            [-0.67470483,  0.18594096,  0.12287455]]])
+    """
+    uncorrect_foot = uncorrect_footaxis(frame,ankle_JC)
+    RF1_R_Axis = axisMod(uncorrect_foot[2][0],uncorrect_foot[0])
+    RF1_L_Axis = axisMod(uncorrect_foot[2][1],uncorrect_foot[1])
+
+    if flat_foot == True:
+        correct_foot = rotaxis_footflat(frame,ankle_JC,vsk=vsk)
+    else:
+        correct_foot = rotaxis_nonfootflat(frame,ankle_JC)
+    RF2_R_Axis = axisMod(correct_foot[2][0],correct_foot[0])
+    RF2_L_Axis = axisMod(correct_foot[2][1],correct_foot[1])
+
+    R_AnkleFlex_angle = getankleangle(RF1_R_Axis,RF2_R_Axis)
+    L_AnkleFlex_angle = getankleangle(RF1_L_Axis,RF2_L_Axis)
+
+    return np.stack([R_AnkleFlex_angle,L_AnkleFlex_angle],axis=1)
+
+def staticCalculationHead(frame,head):
+    """Static Head Calculation function for a stack of frames.
+
+    Parameters
+    ----------
+    frame : dict
+        Dictionary of marker names with (N,3) arrays of marker positions.
+    head : list
+        The head axis (N,3,3) and head origin (N,3), the output of headJC.
+
+    Returns
+    -------
+    offset : array
+        (N,) array of the head offset angle in radians.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from .pycgmBatch import staticCalculationHead
+    >>> head = [np.array([[[100.33272997128863, 83.39303060995121, 1484.078302933558],
+    ...                    [98.9655145897623, 83.57884461044797, 1483.7681493301013],
+    ...                    [99.34535520789223, 82.64077714742746, 1484.7559501904173]]]),
+    ...         np.array([[99.58366584777832, 82.79330825805664, 1483.7968139648438]])]
+    >>> np.around(staticCalculationHead(None,head),8)
+    array([0.28546606])
+    """
+    axis = axisMod(head[0],head[1])
+    global_axis = [[0,1,0],[-1,0,0],[0,0,1]]
+
+    # get y angle from rotation matrix using inverse trigonometry.
+    M = axisRotation(global_axis,axis)
+    return np.arctan(M[:,0,2] / M[:,2,2])
+
+def staticOffsets(frame,vsk,flat_foot=False):
+    """Static offset calculation function
+
+    Calculates the static foot and head offset angles of every frame of a
+    static trial at once and averages them over the frames. Frames with
+    missing markers are skipped by the average.
+
+    Parameters
+    ----------
+    frame : dict
+        Dictionary of marker names with (N,3) arrays of marker positions.
+    vsk : dict
+        The subject measurements calculated so far by getStatic.
+    flat_foot : boolean, optional
+        A boolean indicating if the feet are flat or not.
+
+    Returns
+    -------
+    static, staticHead : tuple
+        The (2,3) right and left average foot offset angles and the
+        average head offset angle, in radians.
+    """
+    with np.errstate(invalid='ignore',divide='ignore'):
+        pelvis_origin,pelvis_axis,sacrum = pelvisJointCenter(frame)
+        hip_JC = hipJointCenter(frame,pelvis_origin,pelvis_axis[:,0],pelvis_axis[:,1],pelvis_axis[:,2],vsk)
+
+        # only the knee joint center is used by the static calibration
+        knee_JC = [findJointC(frame['RTHI'],hip_JC[1],frame['RKNE'],vsk['RightKneeWidth']/2.0+7.0),
+                   findJointC(frame['LTHI'],hip_JC[0],frame['LKNE'],vsk['LeftKneeWidth']/2.0+7.0)]
+        ankle_JC = ankleJointCenter(frame,knee_JC,0,vsk=vsk)
+        angle = staticCalculation(frame,ankle_JC,knee_JC,flat_foot,vsk)
+
+        # the static head axis is not rotated by a head offset
+        head = headJC(frame,{'HeadOffset':0.0})
+        headangle = staticCalculationHead(frame,head)
+
+    return nanAverage(angle),nanAverage(headangle)
@@ -0,0 +1,272 @@
+#pyCGM
+
+# Copyright (c) 2015 Mathew Schwartz <umcadop@gmail.com>
+# Core Developers: Seungeun Yeon, Mathew Schwartz
+# Contributors Filipe Alves Caixeta, Robert Van-wesep
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+# On disk cache of parsed trials, static calibrations and joint angles, so a
+# batch that is run again only calculates the trials that have changed.
+
+import os
+import json
+import hashlib
+import tempfile
+import numpy as np
+from ._about import __version__
+from . import pycgmIO
+from . import pycgmStatic
+from . import pycgmCalc
+
+#os.replace is not in python 2, where os.rename also replaces the file on posix
+replace=getattr(os,'replace',os.rename)
+
+def fileHash(filename,blockSize=1<<20):
+    """File content hash function
+
+    Parameters
+    ----------
+    filename : str
+        Path of the file.
+    blockSize : int, optional
+        Number of bytes read at a time. The default is 1 MB.
+
+    Returns
+    -------
+    str
+        The SHA-256 hash of the bytes of the file, as hexadecimal.
+    """
+    h=hashlib.sha256()
+    with open(filename,'rb') as f:
+        for block in iter(lambda: f.read(blockSize),b''):
+            h.update(block)
+    return h.hexdigest()
+
+def _loadJson(path):
+    with open(path) as f:
+        return json.load(f)
+
+def _loadArray(path):
+    return np.load(path,mmap_mode='r')
+
+def _loadStatic(path):
+    with np.load(path) as values:
+        return dict((key,values[key].tolist()) for key in values.files)
+
+class TrialCache(object):
+    """Cache of parsed trials, static calibrations and joint angles
+
+    The entries are files in a directory named by a hash of the content of
+    the input files, the options of the calculation and the pyCGM version,
+    so an entry is used again only if none of them have changed, whatever
+    the name or date of the files. The marker positions and the joint
+    angles are stored as .npy files that are memory-mapped when read, and
+    the static calibrations as .npz files. When the entries are larger than
+    maxSize, the least recently used ones are deleted. An entry that can
+    not be read is deleted and calculated again.
+
+    Parameters
+    ----------
+    directory : str
+        Directory of the cache. It is created if it does not exist.
+    maxSize : int, optional
+        Size in bytes the entries are kept under. The default is 1 GB.
+
+    Examples
+    --------
+    >>> import tempfile
+    >>> import numpy as np
+    >>> from .pycgmCache import TrialCache
+    >>> from .pyCGM_Helpers import getfilenames
+    >>> fileNames = getfilenames(2)
+    >>> cache = TrialCache(tempfile.mkdtemp())
+    >>> result = cache.calcAngles(fileNames[1],fileNames[1],fileNames[2])
+    >>> cache.misses, cache.hits
+    (3, 1)
+    >>> again = cache.calcAngles(fileNames[1],fileNames[1],fileNames[2])
+    >>> cache.hits, type(again).__name__, np.array_equal(again,result,equal_nan=True)
+    (2, 'memmap', True)
+    >>> vsk = cache.getStatic(fileNames[1],fileNames[2])
+    >>> cache.hits, np.around(vsk['RightStaticRotOff'],8)
+    (3, 0.0156835)
+
+    A trial without the finger markers, which are NaN as with loadData.
+
+    >>> import os
+    >>> from . import pycgmIO
+    >>> labels, points = pycgmIO.loadC3DArray(fileNames[1])
+    >>> keep = [i for i,label in enumerate(labels) if label not in ('RFIN','LFIN')]
+    >>> motion = os.path.join(tempfile.mkdtemp(),'nofingers.c3d')
+    >>> with open(motion,'wb') as handle:
+    ...     writer = pycgmIO.c3d.Writer(handle)
+    ...     group = writer.add_point_groups([labels[i] for i in keep],120.0)
+    ...     writer.write_points(points[:,keep])
+    >>> result = cache.calcAngles(motion,fileNames[1],fileNames[2])
+    >>> result.shape, np.isnan(result[:,:3]).any()
+    ((275, 273), False)
+    """
+    def __init__(self,directory,maxSize=1<<30):
+        self.directory=directory
+        self.maxSize=maxSize
+        self.hits=0
+        self.misses=0
+        pycgmIO.make_sure_path_exists(directory)
+
+    def key(self,kind,filenames,**options):
+        """Returns the name of the entry of kind for the files and options."""
+        h=hashlib.sha256()
+        h.update(kind.encode('utf-8'))
+        h.update(__version__.encode('utf-8'))
+        for filename in filenames:
+            h.update(fileHash(filename).encode('utf-8'))
+        h.update(json.dumps(options,sort_keys=True).encode('utf-8'))
+        return kind+'-'+h.hexdigest()
+
+    def loadMarkers(self,filename):
+        """Loads the marker positions of a c3d or csv file
+
+        The markers are the same as loadData(filename, markerSet=True),
+        the labeled markers with the missing ones of markerKeys as NaN.
+
+        Returns
+        -------
+        labels, points : tuple
+            The marker names and the (frames, markers, 3) array of their
+            positions, memory-mapped from the cache.
+        """
+        name=self.key('markerset',[filename])
+        labels=self._load(name+'.json',_loadJson)
+        points=self._load(name+'.npy',_loadArray)
+        if labels is not None and points is not None:
+            self.hits+=1
+            return labels,points
+        self.misses+=1
+        if filename.lower().endswith('.csv'):
+            labels,points,freq=pycgmIO.loadCSVArray(filename)
+            markers=pycgmIO._csvMarkerSet(labels,points)
+        else:
+            markers=pycgmIO._c3dMarkerSet(*pycgmIO.loadC3DArray(filename))
+        self._store(name+'.json',lambda f: f.write(json.dumps(markers.labels).encode('utf-8')))
+        self._store(name+'.npy',lambda f: np.save(f,markers.data))
+        self._evict(name)
+        return markers.labels,_loadArray(self._path(name+'.npy'))
+
+    def getStatic(self,staticfile,vskfile,flat_foot=False):
+        """Calculates the static calibration of a subject, see getStatic(vectorize=True)
+
+        Returns
+        -------
+        dict
+            The subject measurements and static offsets.
+        """
+        name=self.key('static',[staticfile,vskfile],flat_foot=flat_foot,vectorize=True)
+        vsk=self._load(name+'.npz',_loadStatic)
+        if vsk is not None:
+            self.hits+=1
+            return vsk
+        self.misses+=1
+        labels,points=self.loadMarkers(staticfile)
+        data=pycgmIO.MarkerSet(labels,points)
+        vsk=pycgmStatic.getStatic(data,pycgmIO.loadVSK(vskfile,False),flat_foot,vectorize=True)
+        self._store(name+'.npz',lambda f: np.savez(f,**vsk))
+        self._evict(name)
+        return vsk
+
+    def calcAngles(self,motionfile,staticfile,vskfile,start=None,end=None,flat_foot=False):
+        """Calculates the joint angles and axis of a trial, see calcAngles
+
+        Returns
+        -------
+        array
+            The (frames, 273) joint angles and axis from start to end,
+            memory-mapped from the cache.
+        """
+        name=self.key('angles',[motionfile,staticfile,vskfile],
+                      start=start,end=end,flat_foot=flat_foot)
+        result=self._load(name+'.npy',_loadArray)
+        if result is not None:
+            self.hits+=1
+            return result
+        self.misses+=1
+        vsk=self.getStatic(staticfile,vskfile,flat_foot)
+        labels,points=self.loadMarkers(motionfile)
+        result=pycgmCalc.calcAngles(pycgmIO.MarkerSet(labels,points),start=start,end=end,vsk=vsk,
+                                    splitAnglesAxis=False,formatData=False)
+        self._store(name+'.npy',lambda f: np.save(f,result))
+        self._evict(name)
+        return _loadArray(self._path(name+'.npy'))
+
+    def size(self):
+        """Returns the size in bytes of the entries of the cache."""
+        return sum(os.path.getsize(path) for path in self._entries())
+
+    def clear(self):
+        """Deletes all the entries of the cache."""
+        for path in self._entries():
+            os.remove(path)
+
+    def _path(self,name):
+        return os.path.join(self.directory,name)
+
+    def _exists(self,name):
+        path=self._path(name)
+        if not os.path.exists(path):
+            return False
+        #the modification time is the last use of the entry
+        os.utime(path,None)
+        return True
+
+    def _load(self,name,load):
+        #an entry that can not be read, such as one truncated by a full
+        #disk, is deleted so it is calculated again
+        if not self._exists(name):
+            return None
+        try:
+            return load(self._path(name))
+        except Exception:
+            os.remove(self._path(name))
+            return None
+
+    def _store(self,name,write):
+        #written under a temporary name first, so other processes never
+        #read a partly written entry
+        handle,tmp=tempfile.mkstemp(dir=self.directory,suffix='.tmp')
+        try:
+            with os.fdopen(handle,'wb') as f:
+                write(f)
+            replace(tmp,self._path(name))
+        except BaseException:
+            os.remove(tmp)
+            raise
+
+    def _entries(self):
+        return [self._path(name) for name in os.listdir(self.directory)
+                if not name.endswith('.tmp')]
+
+    def _evict(self,keep):
+        entries=[(os.path.getmtime(path),os.path.getsize(path),path) for path in self._entries()]
+        total=sum(size for mtime,size,path in entries)
+        for mtime,size,path in sorted(entries):
+            if total<=self.maxSize:
+                break
+            if os.path.basename(path).startswith(keep):
+                continue
+            os.remove(path)
+            total-=size
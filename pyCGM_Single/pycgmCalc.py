@@ -25,6 +25,9 @@
 
 from .pyCGM import *
 from .pycgmKinetics import getKinetics
+from .pycgmIO import MarkerSet
+from . import pycgmBatch
+from . import pycgmBackends
 import sys
 if sys.version_info[0]==2:
     pyver = 2
@@ -56,23 +59,61 @@ def calcAngles(data,**kargs):
         start   Position of the data to start the calculation
         end     Position of the data to end the calculation
         frame   Frame number if the calculation is only for one frame
-        cores   Number of processes to use on the calculation
+        cores   Number of processes to use on the calculation, the same
+                as workers
         vsk     Vsk file as a dictionary or label and data
         angles  If true it will return the angles
         axis    If true it will return the axis
         splitAnglesAxis     If true the function will return angles and axis as separete arrays. For false it will be the same array
-        multiprocessing     If true it will use multiprocessing
+        multiprocessing     If true it will use multiprocessing, the same as
+                            backend='processes', or backend='threads' before
+                            Python 3.8
+        backend 'serial', 'threads', 'processes' or 'mpi', or a backend of
+                pycgmBackends. The frames are split into one contiguous
+                block per worker and each block is calculated into its rows
+                of out, so every backend gives the same result. The
+                threads backend calculates its blocks with the vectorized
+                functions, which release the GIL, unless vectorize is
+                False, so its result is the one of vectorize. A backend
+                object keeps its pool between calls and has to be closed by
+                the caller. The joint centers are then returned as the
+                (frames, 27, 3) jcOut array
+        workers Number of threads or processes of the backend
+        vectorize   If true all the frames are calculated at once with the
+                    array functions in pycgmBatch instead of frame by frame.
+                    The joint centers are then returned as one dictionary
+                    of arrays instead of a list of dictionaries. If it is
+                    not given a backend uses its own default
+        out     A (frames, 273) array owned by the caller where the result
+                is written, one row per frame from start to end
+        jcOut   A (frames, 27, 3) array owned by the caller where the joint
+                centers are written, in the order of jointCenterKeys
+        outputs List of the joint angles and axis that are needed, with the
+                names used by writeResult, e.g. ['R Hip','L Knee','HIPO'].
+                Only the segments they depend on are calculated (this uses
+                the vectorize calculation) and the other columns are NaN.
+                It can not be used with backend, multiprocessing or workers
 
     By default the function will calculate all the data and return angles and axis as separete arrays
     """
+    nframes=len(data)
+    if type(data[0])!=type({}):
+        #labels and an array of all the frames
+        nframes=len(data[1])
     start=0
-    end=len(data)
+    end=nframes
     vsk=None
     returnangles=True
     returnaxis=True
     returnjoints=False
     splitAnglesAxis=True
     formatData=True
+    vectorize=None
+    out=None
+    jcOut=None
+    outputs=None
+    backend=None
+    workers=None
 
     #modified to work between python 2 and 3
     # used to rely on .has_key()
@@ -84,7 +125,7 @@ def calcAngles(data,**kargs):
         end=kargs['end']
         if start>end:
             raise Exception("Start can not be larger than end")
-        if end>len(data):
+        if end>nframes:
             raise Exception("Range cannot be larger than data length")
     if 'frame' in kargs:
         start=kargs['frame']
@@ -101,28 +142,40 @@ def calcAngles(data,**kargs):
         formatData=kargs['formatData']
     if 'returnjoints' in kargs:
         returnjoints=kargs['returnjoints']
+    if 'vectorize' in kargs:
+        vectorize=kargs['vectorize']
+    if 'out' in kargs:
+        out=kargs['out']
+    if 'jcOut' in kargs:
+        jcOut=kargs['jcOut']
+    if 'outputs' in kargs and kargs['outputs']!=None:
+        outputs=kargs['outputs']
+        vectorize=True
+    if 'multiprocessing' in kargs and kargs['multiprocessing']==True:
+        #without shared memory the threads are used instead of processes
+        backend='processes' if pycgmBackends.shared_memory is not None else 'threads'
+    if 'backend' in kargs and kargs['backend']!=None:
+        backend=kargs['backend']
+    if 'cores' in kargs:
+        workers=kargs['cores']
+    if 'workers' in kargs:
+        workers=kargs['workers']
+
+    if end<=start:
+        raise ValueError("There are no frames from start to end")
+    if outputs!=None and (backend!=None or workers!=None):
+        raise ValueError("outputs can not be used with a backend")
 
     r=None
-    r,jcs=Calc(start,end,data,vsk)
+    if backend!=None:
+        r,jcs=calcBackend(start,end,data,vsk,backend,workers,vectorize,out,jcOut)
+    else:
+        r,jcs=Calc(start,end,data,vsk,vectorize,out,jcOut,outputs)
 
     if formatData==True:
-        r=np.transpose(r)
-        angles=r[SJA:EJA]
-        axis=r[SA:EA]
-        angles=np.transpose(angles)
-        axis=np.transpose(axis)
-        
-        s=np.shape(angles)
-        if pyver == 2:
-            angles=np.reshape(angles,(s[0],s[1]/3,3))
-        else:
-            angles=np.reshape(angles,(s[0],s[1]//3,3))
-            
-        s=np.shape(axis)
-        if pyver == 2:
-            axis=np.reshape(axis,(s[0],s[1]/12,4,3))
-        else:
-            axis=np.reshape(axis,(s[0],s[1]//12,4,3))
+        #r is a (frames, 273) array, so these are views and not copies
+        angles=np.reshape(r[:,SJA:EJA],(len(r),(EJA-SJA)//3,3))
+        axis=np.reshape(r[:,SA:EA],(len(r),(EA-SA)//12,4,3))
             
         return [angles,axis]
 
@@ -141,26 +194,120 @@ def calcAngles(data,**kargs):
     else:
         return r,jcs
 
-def Calc(start,end,data,vsk):
+def calcChunks(chunks,**kargs):
+    """
+    Calculates the joint angles and axis of a trial one chunk of frames at
+    a time, for trials too long to be kept in memory
+    @param  chunks Iterable of chunks of motion data, such as the MarkerSets
+    of pycgmIO.iterData
+    @param  kargs Same as calcAngles, except start, end, frame and out
+    @return Generator of the (frames, 273) array of each chunk. The arrays
+    are all views of one array that is reused for every chunk, so a result
+    has to be written or copied before the next chunk is calculated
+
+    Each frame is calculated on its own, so the results are the same as a
+    calculation of the whole trial
+    """
+    for key in ('start','end','frame','out'):
+        kargs.pop(key,None)
+    kargs['splitAnglesAxis']=False
+    kargs['formatData']=False
+    kargs['returnjoints']=False
+    out=np.empty((0,EA))
+    for chunk in chunks:
+        if len(chunk)==0:
+            continue
+        if len(chunk)>len(out):
+            out=np.empty((len(chunk),EA))
+        yield calcAngles(chunk,out=out[:len(chunk)],**kargs)
+
+def Calc(start,end,data,vsk,vectorize=False,out=None,jcOut=None,outputs=None):
+    if vectorize==True:
+        return calcTrial(start,end,data,vsk,out,jcOut,outputs)
+
     d=data[start:end]
-    angles,jcs=calcFrames(d,vsk)
+    angles,jcs=calcFrames(d,vsk,out,jcOut)
     
     return angles,jcs
 
-def calcFrames(data,vsk):
-    angles=[]
+def calcBackend(start,end,data,vsk,backend,workers=None,vectorize=None,out=None,jcOut=None):
+    """
+    Calculates the joint angles and axis with a backend of pycgmBackends
+    @param  data Motion data as a MarkerSet, a vector of dictionaries or
+    labels and an array of shape (frames, markers, 3)
+    @param  backend Name of the backend or a backend object
+    @return (frames, 273) array of angles and axis and the (frames, 27, 3)
+    array of the joint centers
+    """
+    if isinstance(data,MarkerSet):
+        markers=data
+    elif type(data[0])!=type({}):
+        markers=MarkerSet(data[0],data[1])
+    else:
+        markers=MarkerSet.fromFrames(data)
+    markers=markers[start:end]
+    if not isinstance(vsk,dict):
+        vsk=createVskDataDict(vsk[0],vsk[1])
+    if out is None:
+        out=np.empty((len(markers),EA))
+    if jcOut is None:
+        jcOut=np.empty((len(markers),pycgmBackends.JC,3))
+
+    runner=pycgmBackends.getBackend(backend,workers)
+    try:
+        runner.run(markers,vsk,out,jcOut,vectorize)
+    finally:
+        #a backend given as an object is closed by the caller
+        if runner is not backend:
+            runner.close()
+    return out,jcOut
+
+def calcTrial(start,end,data,vsk,out=None,jcOut=None,outputs=None):
+    """
+    Calculates the joint angles and axis of all frames at once
+    @param  data Motion data as a MarkerSet, a vector of dictionaries or
+    labels and an array of shape (frames, markers, 3)
+    @return (frames, 273) array of angles and axis and a dictionary of
+    the joint centers as (frames, 3) arrays
+    """
+    if isinstance(data,MarkerSet):
+        frame=data[start:end].markers()
+    elif type(data[0])!=type({}):
+        frame=pycgmBatch.markerArrays(data[0],np.asarray(data[1])[start:end])
+    else:
+        frame=pycgmBatch.frameArrays(data[start:end])
+    if not isinstance(vsk,dict):
+        vsk=createVskDataDict(vsk[0],vsk[1])
+
+    return pycgmBatch.JointAngleCalc(frame,vsk,out,jcOut,outputs)
+
+def calcFrames(data,vsk,out=None,jcOut=None):
+    """
+    Calculates the joint angles and axis frame by frame
+    @param  out (frames, 273) array where each frame's row is written.
+    It is created when not given.
+    @param  jcOut optional (frames, 27, 3) array for the joint centers
+    @return the (frames, 273) array and a list of joint center dictionaries
+    """
     joints=[] #added this here for normal data
     if type(data[0])!=type({}):
         data=createMotionDataDict(data[0],data[1])
-    if type(vsk)!=type({}):
+    if not isinstance(vsk,dict):
         vsk=createVskDataDict(vsk[0],vsk[1])
+    if not isinstance(vsk,SubjectModel):
+        #the subject values are calculated once for all the frames
+        vsk=SubjectModel(vsk)
+    if out is None:
+        out=np.empty((len(data),EA))
 
     #just accept that the data is missing    
-    for frame in data:
-        angle,jcs = JointAngleCalc(frame,vsk)
-        angles.append(angle)
+    for i,frame in enumerate(data):
+        if jcOut is None:
+            angle,jcs = JointAngleCalc(frame,vsk,out[i])
+        else:
+            angle,jcs = JointAngleCalc(frame,vsk,out[i],jcOut[i])
         joints.append(jcs)
-    return angles, joints
+    return out, joints
 
     
             
\ No newline at end of file
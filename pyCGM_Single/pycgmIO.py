@@ -46,7 +46,11 @@ from math import *
 import numpy as np
 import xml.etree.ElementTree as ET
 import os
+import io
 import errno
+import itertools
+import json
+import struct
 
 #Used to split the arrays with angles and axis
 #Start Joint Angles
@@ -103,6 +107,159 @@ def markerKeys():
                'RWRA','RWRB','LWRA','LWRB','RFIN','LFIN']
     return marker_keys
 
+class MarkerSet(object):
+    """Marker data of a whole trial in a single array.
+
+    Holds the x,y,z positions of every marker in every frame in one
+    contiguous float64 array of shape (frames, markers, 3), with a
+    dictionary from marker name to column. Marker and frame access return
+    views into that array, so no values are copied.
+
+    For code that expects the list of frame dictionaries returned by
+    loadData, a MarkerSet behaves the same way: len() is the number of
+    frames, an integer index or iteration gives a frame dictionary, and a
+    slice gives a MarkerSet of those frames. A marker name index gives the
+    (frames, 3) array of that marker.
+
+    Parameters
+    ----------
+    labels : list
+        List of the marker names.
+    data : array
+        An (frames, markers, 3) array of marker positions.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from .pycgmIO import MarkerSet
+    >>> data = np.arange(18.0).reshape(3,2,3)
+    >>> markers = MarkerSet(['RASI','LASI'], data)
+    >>> len(markers)
+    3
+    >>> markers['LASI']
+    array([[ 3.,  4.,  5.],
+           [ 9., 10., 11.],
+           [15., 16., 17.]])
+    >>> markers[1]['RASI']
+    array([6., 7., 8.])
+    >>> np.shares_memory(markers['RASI'], markers.data)
+    True
+    >>> markers[1:].data.shape
+    (2, 2, 3)
+    """
+    def __init__(self, labels, data):
+        self.labels = [str(label.rstrip()) for label in labels]
+        self.index = dict((label,i) for i,label in enumerate(self.labels))
+        self.data = np.ascontiguousarray(data,dtype=np.float64)
+        if self.data.ndim != 3 or self.data.shape[1:] != (len(self.labels),3):
+            raise ValueError("Marker data must have the shape (frames, %d, 3)" % len(self.labels))
+
+    @classmethod
+    def fromFrames(cls, frames, labels=None):
+        """Creates a MarkerSet from a list of frame dictionaries.
+
+        Markers which are missing in a frame are NaN.
+
+        Parameters
+        ----------
+        frames : list
+            List of dictionaries of marker names with x,y,z positions,
+            as returned by loadData.
+        labels : list, optional
+            Marker names to keep. By default all the markers found in frames.
+
+        Returns
+        -------
+        MarkerSet
+
+        Examples
+        --------
+        >>> import numpy as np
+        >>> from .pycgmIO import MarkerSet
+        >>> frames = [{'RASI': [1.0, 2.0, 3.0], 'LASI': [4.0, 5.0, 6.0]},
+        ...           {'RASI': [7.0, 8.0, 9.0]}]
+        >>> MarkerSet.fromFrames(frames).data
+        array([[[ 1.,  2.,  3.],
+                [ 4.,  5.,  6.]],
+        <BLANKLINE>
+               [[ 7.,  8.,  9.],
+                [nan, nan, nan]]])
+        """
+        index = {}
+        if labels is None:
+            labels = []
+            for frame in frames:
+                #the frames of a trial usually have the same markers
+                if list(frame) == labels:
+                    continue
+                for key in frame:
+                    if key not in index:
+                        index[key] = len(labels)
+                        labels.append(key)
+        else:
+            labels = list(labels)
+            index = dict((label,j) for j,label in enumerate(labels))
+
+        data = np.empty((len(frames),len(labels),3))
+        data.fill(np.nan)
+        #the frames are copied in one pass, a whole frame at a time when
+        #its markers are in the order of labels
+        for i,frame in enumerate(frames):
+            if list(frame) == labels:
+                np.concatenate(list(frame.values()),out=data[i].reshape(-1))
+                continue
+            keys = [key for key in frame if key in index]
+            if keys:
+                columns = [index[key] for key in keys]
+                data[i,columns] = np.concatenate([frame[key] for key in keys]).reshape(-1,3)
+
+        return cls(labels,data)
+
+    def __len__(self):
+        return len(self.data)
+
+    def __contains__(self, label):
+        return label in self.index
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return self.marker(key)
+        if isinstance(key, slice):
+            return MarkerSet(self.labels,self.data[key])
+        return self.frameDict(key)
+
+    def __iter__(self):
+        for i in range(len(self.data)):
+            yield self.frameDict(i)
+
+    def keys(self):
+        """Returns the marker names."""
+        return list(self.labels)
+
+    def marker(self, label):
+        """Returns a (frames, 3) view of the positions of one marker."""
+        return self.data[:,self.index[label]]
+
+    def markers(self):
+        """Returns a dictionary of marker names with (frames, 3) views.
+
+        This is the input format of the functions in pycgmBatch.
+        """
+        return dict((label,self.data[:,i]) for i,label in enumerate(self.labels))
+
+    def frame(self, i):
+        """Returns a (markers, 3) view of the positions in one frame."""
+        return self.data[i]
+
+    def frameDict(self, i):
+        """Returns a dictionary of marker names with the x,y,z views of one frame."""
+        frame = self.data[i]
+        return dict((label,frame[j]) for j,label in enumerate(self.labels))
+
+    def frames(self):
+        """Returns the list of frame dictionaries, in the format of loadData."""
+        return list(self)
+
 def loadEZC3D(filename):
     #Relative import mod for python 2 and 3
     try: from . import c3dez
@@ -112,143 +269,321 @@ def loadEZC3D(filename):
     data = dataAsArray(dataclass.Data['Markers'])
     return [data,None,None]
 
-def loadC3D(filename):
+def loadC3D(filename,start=0,end=None):
 
     if useEZC3D == True:
         print("Using EZC3D")
         return loadEZC3D(filename)
 
-    reader = c3d.Reader(open(filename, 'rb'))
-    
-    labels = reader.get('POINT:LABELS').string_array
-    mydict = {}
-    mydictunlabeled ={}
-    data = []
-    dataunlabeled = []
-    prog_val = 1
-    counter = 0
-    data_length = reader.last_frame() - reader.first_frame()
-    markers=[str(label.rstrip()) for label in labels]
-    
-    for frame_no, points, analog in reader.read_frames(True,True):
-        for label, point in zip(markers, points):
-            #Create a dictionary with format LFHDX: 123 
-            if label[0]=='*':
-                if point[0]!=np.nan:
-                    mydictunlabeled[label]=point
-            else:
-                mydict[label] = point
-            
-        data.append(mydict)
-        dataunlabeled.append(mydictunlabeled)
-        mydict = {}
+    markers,points = loadC3DArray(filename,start,end)
+    labeled = [i for i,label in enumerate(markers) if not label.startswith('*')]
+    unlabeled = [i for i,label in enumerate(markers) if label.startswith('*')]
+    labels = [markers[i] for i in labeled]
+    unlabels = [markers[i] for i in unlabeled]
+
+    #each marker of a frame is a view of one array with all the frames
+    data = [dict(zip(labels,frame)) for frame in points[:,labeled]]
+    dataunlabeled = [dict(zip(unlabels,frame)) for frame in points[:,unlabeled]]
     return [data,dataunlabeled,markers]
 
+def loadC3DArray(filename,start=0,end=None):
+    """Loads the marker positions of a c3d file as a single array
+
+    The point data of all the frames is read in one call, without creating
+    a dictionary for each frame. The file is memory-mapped, so when a range
+    of frames is given only those frames are read from disk.
+
+    Parameters
+    ----------
+    filename : str
+        Name of the c3d file.
+    start, end : int, optional
+        Range of frames to read. By default all the frames.
+
+    Returns
+    -------
+    markers, points : tuple
+        List of the marker names and an (frames, markers, 3) array of their
+        positions. Invalid points are NaN.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from .pycgmIO import loadC3DArray
+    >>> from .pyCGM_Helpers import getfilenames
+    >>> markers, points = loadC3DArray(getfilenames(2)[1])
+    >>> points.shape
+    (275, 141, 3)
+    >>> markers[0], np.around(points[0,0],8)
+    ('LFHD', array([ 174.57492065,  324.51303101, 1728.94396973]))
+    >>> np.array_equal(loadC3DArray(getfilenames(2)[1],100,110)[1], points[100:110], equal_nan=True)
+    True
+    """
+    with open(filename, 'rb') as handle:
+        reader = c3d.Reader(handle)
+        labels = reader.point_labels()
+        points = reader.read_points(start,end)
+    markers=[str(label) for label in labels][:points.shape[1]]
+    return markers,points
+
+def loadC3DAnalog(filename,start=0,end=None):
+    """Loads the analog channels of a c3d file as a single array
+
+    The analog data, such as force plate channels, of all the frames is
+    read and scaled in one call.
+
+    Parameters
+    ----------
+    filename : str
+        Name of the c3d file.
+    start, end : int, optional
+        Range of (point) frames to read. By default all the frames.
+
+    Returns
+    -------
+    labels, analog, rate : tuple
+        List of the channel names, an (samples, channels) array of the
+        analog values and the analog sample rate in Hz.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from .pycgmIO import loadC3DAnalog
+    >>> from .pyCGM_Helpers import getfilenames
+    >>> labels, analog, rate = loadC3DAnalog(getfilenames(2)[1])
+    >>> labels[:3], analog.shape, rate
+    (['Fx1', 'Fy1', 'Fz1'], (275, 10), 100.0)
+    >>> np.around(analog[0,2],4)
+    -780.7631
+    """
+    with open(filename, 'rb') as handle:
+        reader = c3d.Reader(handle)
+        analog = reader.read_analog(start,end)
+        return reader.analog_labels(),analog,reader.analog_frame_rate()
+
 def loadCSV(filename):
-    if filename == '':
-        self.returnedData.emit(None)
-    import numpy as np
-    from numpy.compat import asbytes #probably not needed
-
-    fh = open(filename,'r')
-
-    fh=iter(fh)
-    delimiter=','
-
-    def rowToDict(row,labels):
-        dic={}
-        unlabeleddic={}
-        if pyver == 2: row=zip(row[0::3],row[1::3],row[2::3])
-        if pyver == 3: row=list(zip(row[0::3],row[1::3],row[2::3]))
-        empty=np.asarray([np.nan,np.nan,np.nan],dtype=np.float64)
-        for coordinates,label in zip(row,labels):
-            #unlabeled data goes to a different dictionary
-            if label[0]=="*":
-                try:
-                    unlabeleddic[label]=np.float64(coordinates)
-                except:
-                    pass
-            else:
-                try:
-                    dic[label]=np.float64(coordinates)
-                except:
-                    #Missing data from labeled marker is NaN
-                    dic[label]=empty.copy()
-        return dic,unlabeleddic
-
-    def split_line(line):
-        if pyver == 2: line = asbytes(line).strip(asbytes('\r\n'))
-        elif pyver == 3: line = line.strip('\r\n')
-        if line:
-            return line.split(delimiter)
-        else:
-            return []
+    labels,points,freq = loadCSVArray(filename)
+    labeled = [i for i,label in enumerate(labels) if label[0]!="*"]
+    unlabeled = [i for i,label in enumerate(labels) if label[0]=="*"]
+    names = [labels[i] for i in labeled]
+    unnames = [labels[i] for i in unlabeled]
+
+    #missing data from labeled markers is NaN, unlabeled markers are left out
+    motionData = [dict(zip(names,frame)) for frame in points[:,labeled]]
+    unlabeledMotionData = []
+    for frame in points[:,unlabeled]:
+        present = ~np.isnan(frame).any(axis=1)
+        unlabeledMotionData.append(dict((label,xyz) for label,xyz,p in zip(unnames,frame,present) if p))
 
-    def parseTrajectories(fh,framesNumber):
-        delimiter=','
-        if pyver == 2:
-            freq=np.float64(split_line(fh.next())[0])
-            labels=split_line(fh.next())[1::3]
-            fields=split_line(fh.next())
-        elif pyver == 3:
-            freq=np.float64(split_line(next(fh))[0])
-            labels=split_line(next(fh))[1::3]
-            fields=split_line(next(fh))
-        delimiter = asbytes(delimiter)
-        rows=[]
-        rowsUnlabeled=[]
-        if pyver == 2: first_line=fh.next()
-        elif pyver == 3: first_line=next(fh)
-        first_elements=split_line(first_line)[1:]
-        colunsNum=len(first_elements)
-        first_elements,first_elements_unlabeled=rowToDict(first_elements,labels)
-        rows.append(first_elements)
-        rowsUnlabeled.append(first_elements_unlabeled)
-
-        for row in fh:
-            row=split_line(row)[1:]
-            if len(row)!=colunsNum:
-                break
-            elements,unlabeled_elements=rowToDict(row,labels)
-            rows.append(elements)
-            rowsUnlabeled.append(unlabeled_elements)
-
-        return labels,rows,rowsUnlabeled,freq
-
-    ###############################################
-    ### Find the trajectories
-    framesNumber=0
-    for i in fh:
-        if i.startswith("TRAJECTORIES"):
-            #First elements with freq,labels,fields
-            if pyver == 2: rows=[fh.next(),fh.next(),fh.next()]
-            if pyver == 3: rows=[next(fh),next(fh),next(fh)]
-            for j in fh:
-                if j.startswith("\r\n"):
-                    break
-                framesNumber=framesNumber+1
-                rows.append(j)
-            break
-    rows=iter(rows)
-    labels,motionData,unlabeledMotionData,freq=parseTrajectories(rows,framesNumber)
-    
     return [motionData,unlabeledMotionData,labels]
 
-def loadData(filename,rawData=True):
-        
+def loadCSVArray(filename):
+    """Loads the trajectories of a Vicon csv file as a single array
+
+    The TRAJECTORIES block is found once and all of its rows are parsed
+    together into one array.
+
+    Parameters
+    ----------
+    filename : str
+        Name of the csv file.
+
+    Returns
+    -------
+    labels, points, freq : tuple
+        List of the marker names, an (frames, markers, 3) array of their
+        positions and the sampling frequency. A marker with a blank
+        coordinate is NaN in that frame. Unlabeled markers have names that
+        start with '*'.
+
+    Examples
+    --------
+    >>> import os, tempfile
+    >>> from .pycgmIO import loadCSVArray
+    >>> text = "TRAJECTORIES\\n100\\n,RASI,,,*1,,\\nField #,X,Y,Z,X,Y,Z\\n1,1,2,3,4,5,6\\n2,7,8,,,,\\n"
+    >>> handle, filename = tempfile.mkstemp(suffix='.csv')
+    >>> with os.fdopen(handle, 'w') as f:
+    ...     _ = f.write(text)
+    >>> labels, points, freq = loadCSVArray(filename)
+    >>> labels, freq
+    (['RASI', '*1'], 100.0)
+    >>> points #doctest: +NORMALIZE_WHITESPACE
+    array([[[ 1.,  2.,  3.], [ 4.,  5.,  6.]],
+           [[nan, nan, nan], [nan, nan, nan]]])
+    >>> os.remove(filename)
+    """
+    with open(filename,'r') as fh:
+        labels,freq = _csvHeader(fh,filename)
+        rows = fh.read().splitlines()
+    rows = rows[:_csvBlockLength(rows)]
+    return labels,_csvPoints(rows,labels),freq
+
+def _csvHeader(fh,filename):
+    """Moves fh to the first row of numbers of the TRAJECTORIES block and
+    returns the labels and the sampling frequency."""
+    for line in fh:
+        if line.startswith("TRAJECTORIES"):
+            #frequency, labels and fields before the rows of numbers
+            freq = np.float64(next(fh).rstrip('\r\n').split(',')[0])
+            labels = next(fh).rstrip('\r\n').split(',')[1::3]
+            next(fh)
+            return labels,freq
+    raise ValueError("No TRAJECTORIES in %s" % filename)
+
+def _csvBlockLength(rows,columns=None):
+    """Number of rows before the end of the TRAJECTORIES block, which ends
+    at the first row with a different number of columns."""
+    if columns is None:
+        columns = rows[0].count(',') if rows else 0
+    end = 0
+    while end<len(rows) and rows[end] and rows[end].count(',')==columns:
+        end += 1
+    return end
+
+def _csvPoints(rows,labels):
+    """Parses rows of the TRAJECTORIES block into an (frames, markers, 3) array."""
+    if len(rows)==0:
+        return np.zeros((0,len(labels),3))
+    #blank values become nan, so the whole block is parsed in one call
+    block = "\n"+"\n".join(rows)+"\n"
+    block = block.replace(",,",",nan,").replace(",,",",nan,")
+    block = block.replace("\n,","\nnan,").replace(",\n",",nan\n")
+    values = np.loadtxt(io.StringIO(block),delimiter=',',ndmin=2)[:,1:]
+    points = np.full((len(values),len(labels),3),np.nan)
+    n = min(values.shape[1]//3,len(labels))
+    points[:,:n] = values[:,:3*n].reshape((len(values),n,3))
+    #a marker is missing if any of its coordinates is missing
+    points[np.isnan(points).any(axis=2)] = np.nan
+    return points
+
+def _c3dMarkerSet(markers,points):
+    """MarkerSet of the labeled markers of a c3d file, with the missing
+    markers of markerKeys as NaN."""
+    labels = [label for label in markers if not label.startswith('*')]
+    labels += [key for key in markerKeys() if key not in labels]
+    data = np.full((len(points),len(labels),3),np.nan)
+    for i,label in enumerate(markers):
+        if label in labels:
+            data[:,labels.index(label)] = points[:,i]
+    return MarkerSet(labels,data)
+
+def _csvMarkerSet(labels,points):
+    """MarkerSet of the labeled markers of a csv file."""
+    labeled = [i for i,label in enumerate(labels) if label[0]!="*"]
+    return MarkerSet([labels[i] for i in labeled],points[:,labeled])
+
+def iterData(filename,chunk=1000,start=0,end=None):
+    """Loads the labeled marker data of a c3d or csv file in chunks
+
+    Reads a long trial a chunk of frames at a time, so the memory used
+    depends on the chunk size and not on the length of the trial. Each
+    chunk is a MarkerSet, which can be given to pycgmCalc.calcAngles or
+    pycgmCalc.calcChunks, and its results written with writeResult.
+
+    Parameters
+    ----------
+    filename : str
+        Name of the c3d or csv file.
+    chunk : int, optional
+        Number of frames in each chunk. The last chunk can be shorter.
+        The default is 1000.
+    start, end : int, optional
+        Range of frames to load. By default all the frames.
+
+    Yields
+    ------
+    MarkerSet
+        The marker positions of the next chunk of frames, with the same
+        markers as loadData(filename, markerSet=True).
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from .pycgmIO import iterData, loadData
+    >>> from .pyCGM_Helpers import getfilenames
+    >>> filename = getfilenames(2)[1]
+    >>> chunks = list(iterData(filename, chunk=100))
+    >>> [len(c) for c in chunks]
+    [100, 100, 75]
+    >>> whole = loadData(filename, markerSet=True) #doctest: +ELLIPSIS
+    SampleData...
+    >>> np.array_equal(np.concatenate([c.data for c in chunks]), whole.data, equal_nan=True)
+    True
+    """
+    if chunk<1:
+        raise ValueError("The chunk size must be at least 1")
+    start = max(start or 0,0)
+
+    if str(filename).endswith('.c3d'):
+        with open(filename,'rb') as handle:
+            reader = c3d.Reader(handle)
+            labels = reader.get('POINT:LABELS').string_array
+            markers = [str(label.rstrip()) for label in labels][:reader.points_per_frame()]
+            frames = reader.last_frame()-reader.first_frame()+1
+            if end is None or end>frames:
+                end = frames
+            for i in range(start,end,chunk):
+                points = reader.read_points(i,min(i+chunk,end))
+                if len(points)==0:
+                    break
+                yield _c3dMarkerSet(markers,points)
+
+    elif str(filename).endswith('.csv'):
+        with open(filename,'r') as fh:
+            labels,freq = _csvHeader(fh,filename)
+            columns = None
+            frame = 0
+            while end is None or frame<end:
+                rows = [line.rstrip('\r\n') for line in itertools.islice(fh,chunk)]
+                if columns is None and len(rows)>0:
+                    columns = rows[0].count(',')
+                n = _csvBlockLength(rows,columns)
+                #only the rows between start and end
+                first = min(max(start-frame,0),n)
+                last = n if end is None else min(max(end-frame,0),n)
+                if last>first:
+                    yield _csvMarkerSet(labels,_csvPoints(rows[first:last],labels))
+                frame += n
+                if n<len(rows) or len(rows)<chunk:
+                    break
+
+def loadData(filename,rawData=True,markerSet=False,start=0,end=None):
+        """
+        Loads the labeled marker data of a c3d or csv file
+        @param filename Name of the file
+        @param markerSet If true the data is returned as a MarkerSet
+        instead of a list of dictionaries for each frame
+        @param start,end Range of frames to load. For a c3d file only these
+        frames are read from the file
+        """
         print(filename)
+        if str(filename).endswith('.c3d') and markerSet==True and useEZC3D==False:
+                #straight from the array of points to a MarkerSet
+                markers,points = loadC3DArray(filename,start,end)
+                return _c3dMarkerSet(markers,points)
+
+        if str(filename).endswith('.csv') and markerSet==True:
+                labels,points,freq = loadCSVArray(filename)
+                return _csvMarkerSet(labels,points[start:end])
+
         if str(filename).endswith('.c3d'):
                 
-                data = loadC3D(filename)[0]
+                if useEZC3D==True:
+                        data = loadC3D(filename)[0][start:end]
+                else:
+                        data = loadC3D(filename,start,end)[0]
                 #add any missing keys
                 keys = markerKeys()
                 for frame in data:
                     for key in keys:
                         frame.setdefault(key,[np.nan,np.nan,np.nan])
-                return data
                 
         elif str(filename).endswith('.csv'):
-                return loadCSV(filename)[0]		
+                data = loadCSV(filename)[0][start:end]
+        
+        if markerSet==True:
+                return MarkerSet.fromFrames(data)
+        return data
 
 def dataAsArray(data):
     """
@@ -308,6 +643,93 @@ def writeKinetics(CoM_output,kinetics):
     """
     np.save(CoM_output,kinetics)
         
+def writeC3D(filename,result,markers=None,joints=None,rate=120.0):
+    """Writes the joint angles and joint centers into a c3d file
+
+    The 19 joint angles and the joint centers are stored as points, after
+    the markers when they are given, so the result can be opened by any
+    program that reads c3d files. The angle points are named as in Vicon
+    files ('PelvisAngles', 'RHipAngles', ...) and listed in the
+    POINT:ANGLES parameter. The frames are written in blocks with
+    Writer.write_points.
+
+    Parameters
+    ----------
+    filename : str
+        Name of the c3d file to write.
+    result : array
+        (frames, 273) joint angles and axis, as returned by calcAngles with
+        splitAnglesAxis=False and formatData=False.
+    markers : tuple, optional
+        Marker names and (frames, markers, 3) positions, as returned by
+        loadC3DArray, to write before the angles.
+    joints : array, optional
+        (frames, 27, 3) joint centers in the order of jointCenterKeys, or
+        the joint centers returned by calcAngles as a list of dictionaries
+        or a dictionary of arrays. Joint centers with the name of one of
+        the markers (e.g. 'C7') are the marker itself and are not repeated.
+    rate : float, optional
+        Frame rate of the data. The default is 120 Hz.
+
+    Examples
+    --------
+    >>> import os, tempfile
+    >>> import numpy as np
+    >>> from .pycgmIO import writeC3D, loadC3DArray
+    >>> from .pyCGM_Helpers import getfilenames
+    >>> markers, points = loadC3DArray(getfilenames(2)[1])
+    >>> result = np.arange(len(points)*273,dtype=float).reshape(len(points),273)
+    >>> filename = os.path.join(tempfile.mkdtemp(),'result.c3d')
+    >>> writeC3D(filename,result,(markers,points))
+    >>> labels, written = loadC3DArray(filename)
+    >>> labels[len(markers):len(markers)+3]
+    ['PelvisAngles', 'RHipAngles', 'LHipAngles']
+    >>> written[5,len(markers)+1]
+    array([1368., 1369., 1370.])
+    >>> np.array_equal(written[:,:len(markers)],points,equal_nan=True)
+    True
+    """
+    angleNames=['Pelvis','RHip','LHip','RKnee','LKnee','RAnkle','LAnkle',
+                'RFoot','LFoot','Head','Thorax','Neck','Spine','RShoulder',
+                'LShoulder','RElbow','LElbow','RWrist','LWrist']
+    angleLabels=[name+'Angles' for name in angleNames]
+    result=np.asarray(result)
+    nframes=len(result)
+
+    labels=[]
+    blocks=[]
+    if markers is not None:
+        labels.extend(markers[0])
+        blocks.append(np.asarray(markers[1]))
+    labels.extend(angleLabels)
+    blocks.append(np.reshape(result[:,SJA:EJA],(nframes,len(angleLabels),3)))
+    if joints is not None:
+        #pyCGM imports this module, so its names are not here when it loads
+        from .pyCGM import jointCenterKeys
+        keys=jointCenterKeys()
+        if isinstance(joints,dict):
+            joints=np.stack([joints[key] for key in keys],axis=1)
+        elif isinstance(joints,list):
+            joints=np.array([[frame[key] for key in keys] for frame in joints])
+        keep=[i for i,key in enumerate(keys) if key not in labels]
+        labels.extend([keys[i] for i in keep])
+        blocks.append(np.asarray(joints)[:,keep])
+    points=np.concatenate(blocks,axis=1)
+
+    with open(filename,'wb') as handle:
+        writer=c3d.Writer(handle)
+        group=writer.add_point_groups(labels,rate)
+        width=max(len(label) for label in angleLabels)
+        group.add_param('ANGLES',desc='angle labels',
+                        bytes_per_element=-1,
+                        dimensions=[width,len(angleLabels)],
+                        bytes=''.join(label.ljust(width) for label in angleLabels))
+        group.add_param('ANGLE_UNITS',desc='angle units',
+                        bytes_per_element=-1,
+                        dimensions=[3],
+                        bytes='deg')
+        writer.write_points(points)
+
 def writeResult(data,filename,**kargs):
         """
         Writes the result of the calculation into a csv file 
@@ -317,6 +739,16 @@ def writeResult(data,filename,**kargs):
                 delimiter Delimiter for the csv. By default it's using ','
                 angles True or false to save angles. Or a list of angles to save
                 axis True of false to save axis. Or a list of axis to save
+                append If true the rows are added to the end of an existing file,
+                without the header, to write a trial one chunk at a time. If
+                the file does not exist it is written with its header
+                firstFrame Frame number of the first row. By default 0
+                format 'csv' (default), 'npy', 'npz' or 'pycgm'. The extension
+                of the format is added to filename. The binary formats store
+                the same columns as the csv, as float64, with the frame number
+                first. 'npz' also stores the column labels, and 'pycgm' is a
+                binary file with the column labels in its header that can be
+                memory-mapped and appended to (see loadResult)
         Examples
         #save angles and axis
         writeResultNumPy(result,"outputfile0.csv")
@@ -326,6 +758,8 @@ def writeResult(data,filename,**kargs):
         writeResultNumPy(result,"outputfile4.csv",angles=False,axis=["R ANKZ","L ANKO","L ANKX"])
         #save only angles
         writeResultNumPy(result,"outputfile6.csv",axis=False)
+        #save angles and axis as outputfile7.pycgm
+        writeResult(result,"outputfile7",format='pycgm')
         """
         labelsAngs =['Pelvis','R Hip','L Hip','R Knee','L Knee','R Ankle',
                                 'L Ankle','R Foot','L Foot',
@@ -339,8 +773,24 @@ def writeResult(data,filename,**kargs):
         dataFilter=None
         delimiter=","
         filterData=[]
+        append=False
+        firstFrame=0
+        fmt='csv'
+        if 'append' in kargs:
+                append=kargs['append']
+        if 'format' in kargs and kargs['format']!=None:
+                fmt=kargs['format']
+                if fmt not in RESULT_FORMATS:
+                        raise Exception("Unknown result format "+str(fmt))
+                if append==True and fmt not in ('csv','pycgm'):
+                        raise Exception("Only csv and pycgm results can be appended")
+        if append==True and not os.path.exists(filename+RESULT_FORMATS[fmt]):
+                #nothing to append to, so the file is written with its header
+                append=False
         if 'delimiter' in kargs:
                 delimiter=kargs['delimiter']
+        if 'firstFrame' in kargs:
+                firstFrame=kargs['firstFrame']
         if 'angles' in kargs:
                 if kargs['angles']==True:
                         outputAngs=True
@@ -415,16 +865,120 @@ def writeResult(data,filename,**kargs):
             xyz="frame num,"+"X,Y,Z,"*(len(dataFilter[0])//3)
         header=header+labels+xyz
         #Creates the frame numbers
-        frames=np.arange(len(dataFilter),dtype=dataFilter[0].dtype)
+        frames=np.arange(firstFrame,firstFrame+len(dataFilter),dtype=dataFilter[0].dtype)
         #Put the frame numbers in the first dimension of the data
         dataFilter=np.column_stack((frames,dataFilter))
         start = 1500
         end = 3600
         #dataFilter = dataFilter[start:]
+        if fmt!='csv':
+                columns=['frame num']+[label+' '+xyz for label in labelsAngs+labelsAxis for xyz in 'XYZ']
+                _writeBinaryResult(dataFilter,columns,filename+RESULT_FORMATS[fmt],fmt,append)
+                return
+        if append==True:
+                with open(filename+'.csv','a') as f:
+                        np.savetxt(f, dataFilter, delimiter=delimiter,fmt="%.15f")
+                return
         np.savetxt(filename+'.csv', dataFilter, delimiter=delimiter,header=header,fmt="%.15f")
         #np.savetxt(filename, dataFilter, delimiter=delimiter,fmt="%.15f")
         #np.savez_compressed(filename,dataFilter)
 
+#Extension of each of the result formats of writeResult
+RESULT_FORMATS={'csv':'.csv','npy':'.npy','npz':'.npz','pycgm':'.pycgm'}
+#pycgm result files start with this, followed by the major and minor
+#version, the header length and the header, padded so the data is aligned
+RESULT_MAGIC=b'\x93PYCGM'
+RESULT_VERSION=(1,0)
+RESULT_ALIGN=64
+
+def _writeBinaryResult(data,columns,filename,fmt,append=False):
+        """Writes the table of writeResult in one of the binary formats."""
+        data=np.ascontiguousarray(data,dtype='<f8')
+        if fmt=='npy':
+                np.save(filename,data)
+        elif fmt=='npz':
+                np.savez(filename,data=data,columns=np.array(columns))
+        elif append==True:
+                #the number of frames is not in the header, so the rows
+                #can just be added to the end of the file
+                with open(filename,'ab') as f:
+                        f.write(data.tobytes())
+        else:
+                header=json.dumps({'dtype':'<f8','columns':columns}).encode('utf-8')
+                start=len(RESULT_MAGIC)+2+4
+                pad=-(start+len(header)+1)%RESULT_ALIGN
+                header=header+b' '*pad+b'\n'
+                with open(filename,'wb') as f:
+                        f.write(RESULT_MAGIC+struct.pack('<BBI',RESULT_VERSION[0],RESULT_VERSION[1],len(header)))
+                        f.write(header)
+                        f.write(data.tobytes())
+
+def loadResult(filename,mmap=True):
+        """Reads a result written by writeResult in a binary format
+
+        Parameters
+        ----------
+        filename : str
+            Path of a .pycgm, .npy or .npz file written by writeResult.
+        mmap : bool, optional
+            If True (default) the .pycgm and .npy data is memory-mapped
+            read only instead of read into memory.
+
+        Returns
+        -------
+        columns, data : tuple
+            The column labels, e.g. 'frame num', 'R Hip X' or 'PELO Z', and
+            the (frames, columns) array of the results. columns is None for
+            .npy files, which do not store the labels.
+
+        Examples
+        --------
+        >>> import os, tempfile
+        >>> import numpy as np
+        >>> from .pycgmIO import writeResult, loadResult
+        >>> tmp = tempfile.mkdtemp()
+        >>> result = np.arange(2*273,dtype=float).reshape(2,273)
+        >>> writeResult(result,os.path.join(tmp,'out'),angles=['R Hip'],axis=['PELO'],format='pycgm')
+        >>> columns, data = loadResult(os.path.join(tmp,'out.pycgm'))
+        >>> columns
+        ['frame num', 'R Hip X', 'R Hip Y', 'R Hip Z', 'PELO X', 'PELO Y', 'PELO Z']
+        >>> data
+        memmap([[  0.,   3.,   4.,   5.,  57.,  58.,  59.],
+                [  1., 276., 277., 278., 330., 331., 332.]])
+        >>> writeResult(result,os.path.join(tmp,'out'),angles=['R Hip'],axis=['PELO'],format='pycgm',append=True,firstFrame=2)
+        >>> loadResult(os.path.join(tmp,'out.pycgm'))[1][:,0]
+        memmap([0., 1., 2., 3.])
+        >>> writeResult(result,os.path.join(tmp,'out'),axis=False,format='npz')
+        >>> columns, data = loadResult(os.path.join(tmp,'out.npz'))
+        >>> data.shape, columns[-1]
+        ((2, 58), 'L Wrist Z')
+        """
+        if filename.endswith('.npy'):
+                return None,np.load(filename,mmap_mode='r' if mmap else None)
+        if filename.endswith('.npz'):
+                with np.load(filename) as f:
+                        return [str(i) for i in f['columns']],f['data']
+        with open(filename,'rb') as f:
+                if f.read(len(RESULT_MAGIC))!=RESULT_MAGIC:
+                        raise Exception(filename+" is not a pycgm result file")
+                major,minor,length=struct.unpack('<BBI',f.read(6))
+                if major!=RESULT_VERSION[0]:
+                        raise Exception("Unsupported pycgm result version %d.%d" % (major,minor))
+                header=json.loads(f.read(length).decode('utf-8'))
+                offset=f.tell()
+                f.seek(0,os.SEEK_END)
+                size=f.tell()
+                columns=header['columns']
+                dtype=np.dtype(header['dtype'])
+                frames=(size-offset)//(dtype.itemsize*len(columns))
+                shape=(frames,len(columns))
+                if mmap==True:
+                        if frames==0:
+                                return columns,np.empty(shape,dtype)
+                        return columns,np.memmap(filename,dtype,'r',offset,shape)
+                f.seek(offset)
+                return columns,np.fromfile(f,dtype,frames*len(columns)).reshape(shape)
+
 def smKeys():
     keys = ['Bodymass', 'Height', 'HeadOffset', 'InterAsisDistance', 'LeftAnkleWidth', 'LeftAsisTrocanterDistance',
             'LeftClavicleLength',
@@ -6,6 +6,8 @@ Created on Tue Jul 28 16:55:25 2015
 """
 import numpy as np
 from math import *
+from . import pycgmBatch
+from .pycgmIO import MarkerSet
 
 def rotmat(x=0,y=0,z=0):
     """Rotation Matrix function
@@ -97,7 +99,7 @@ def getDist(p0, p1):
     """
     return sqrt((p0[0] - p1[0])**2 + (p0[1] - p1[1])**2 + (p0[2] - p1[2])**2)
     
-def getStatic(motionData,vsk,flat_foot=False,GCS=None):
+def getStatic(motionData,vsk,flat_foot=False,GCS=None,vectorize=False):
     """ Get Static Offset function
     
     Calculate the static offset angle values and return the values in radians
@@ -114,6 +116,13 @@ def getStatic(motionData,vsk,flat_foot=False,GCS=None):
     GCS : array, optional
         An array containing the Global Coordinate System.
         If not provided, the default will be set to: [[1, 0, 0], [0, 1, 0], [0, 0, 1]].
+    vectorize : boolean, optional
+        If True all the frames are calculated at once with the array
+        functions in pycgmBatch, and frames with missing markers are
+        skipped by the averages instead of making them NaN.
+        motionData can then also be a dictionary of (N,3) marker arrays,
+        and a MarkerSet is used without copying its frames.
+        The default value is False.
     
     Returns
     -------
@@ -122,6 +131,7 @@ def getStatic(motionData,vsk,flat_foot=False,GCS=None):
     
     Examples
     --------
+    >>> import numpy as np
     >>> from .pycgmIO import loadC3D, loadVSK
     >>> from .pycgmStatic import getStatic
     >>> import os
@@ -139,11 +149,29 @@ def getStatic(motionData,vsk,flat_foot=False,GCS=None):
     105.0
     >>> result['LeftTibialTorsion']
     0.0
+    >>> batch = getStatic(data,vskData,flat_foot=False,vectorize=True)
+    >>> np.around([result['RightStaticPlantFlex'],batch['RightStaticPlantFlex']],8)
+    array([0.27024179, 0.27024179])
+    >>> np.around([result['HeadOffset'],batch['HeadOffset']],8)
+    array([0.25719905, 0.25719905])
+    >>> from .pycgmIO import MarkerSet
+    >>> markers = getStatic(MarkerSet.fromFrames(data),vskData,flat_foot=False,vectorize=True)
+    >>> markers['HeadOffset'] == batch['HeadOffset']
+    True
     """
     static_offset = []
     head_offset = []
     IAD = []
     calSM = {}
+    if vectorize==True:
+        #one (N,3) array for each marker
+        if isinstance(motionData,MarkerSet):
+            motionData=motionData.markers()
+        elif type(motionData)!=type({}):
+            motionData=pycgmBatch.frameArrays(motionData)
+        markers=list(motionData.keys())
+    else:
+        markers=list(motionData[0].keys())
     LeftLegLength = vsk['LeftLegLength']
     RightLegLength = vsk['RightLegLength']  
     calSM['MeanLegLength'] = (LeftLegLength+RightLegLength)/2
@@ -161,6 +189,8 @@ def getStatic(motionData,vsk,flat_foot=False,GCS=None):
         
     if vsk['InterAsisDistance'] != 0:
         calSM['InterAsisDistance'] = vsk['InterAsisDistance']
+    elif vectorize==True:
+        calSM['InterAsisDistance'] = pycgmBatch.nanAverage(pycgmBatch.IADcalculation(motionData))
     else:
         for frame in motionData:
             iadCalc = IADcalculation(frame)
@@ -178,7 +208,10 @@ def getStatic(motionData,vsk,flat_foot=False,GCS=None):
         calSM['LeftKneeWidth'] = 0
         
     if calSM['RightKneeWidth'] == 0:
-        if 'RMKN' in list(motionData[0].keys()):
+        if 'RMKN' in markers and vectorize==True:
+            calSM['RightKneeWidth'] = pycgmBatch.nanAverage(pycgmBatch.norm(motionData['RKNE']-motionData['RMKN']))
+            calSM['LeftKneeWidth'] = pycgmBatch.nanAverage(pycgmBatch.norm(motionData['LKNE']-motionData['LMKN']))
+        elif 'RMKN' in markers:
             #medial knee markers are available
             Rwidth = []
             Lwidth = []
@@ -207,7 +240,10 @@ def getStatic(motionData,vsk,flat_foot=False,GCS=None):
         calSM['LeftAnkleWidth'] = 0
         
     if calSM['RightAnkleWidth'] == 0:
-        if 'RMKN' in list(motionData[0].keys()):
+        if 'RMKN' in markers and vectorize==True:
+            calSM['RightAnkleWidth'] = pycgmBatch.nanAverage(pycgmBatch.norm(motionData['RMMA']-motionData['RANK']))
+            calSM['LeftAnkleWidth'] = pycgmBatch.nanAverage(pycgmBatch.norm(motionData['LMMA']-motionData['LANK']))
+        elif 'RMKN' in markers:
             #medial knee markers are available
             Rwidth = []
             Lwidth = []
@@ -247,21 +283,24 @@ def getStatic(motionData,vsk,flat_foot=False,GCS=None):
     calSM['RightHandThickness'] = vsk['RightHandThickness']
     calSM['LeftHandThickness'] = vsk['LeftHandThickness']
     
-    for frame in motionData:
-        pelvis_origin,pelvis_axis,sacrum = pelvisJointCenter(frame)
-        hip_JC = hipJointCenter(frame,pelvis_origin,pelvis_axis[0],pelvis_axis[1],pelvis_axis[2],calSM)
-        knee_JC = kneeJointCenter(frame,hip_JC,0,vsk=calSM)
-        ankle_JC = ankleJointCenter(frame,knee_JC,0,vsk=calSM)
-        angle = staticCalculation(frame,ankle_JC,knee_JC,flat_foot,calSM)
-        head = headJC(frame)
-        headangle = staticCalculationHead(frame,head)
-
-        static_offset.append(angle)
-        head_offset.append(headangle)
-        
-    
-    static=np.average(static_offset,axis=0)
-    staticHead=np.average(head_offset)
+    if vectorize==True:
+        #all the frames at once, with a NaN-aware average
+        static,staticHead = pycgmBatch.staticOffsets(motionData,calSM,flat_foot)
+    else:
+        for frame in motionData:
+            pelvis_origin,pelvis_axis,sacrum = pelvisJointCenter(frame)
+            hip_JC = hipJointCenter(frame,pelvis_origin,pelvis_axis[0],pelvis_axis[1],pelvis_axis[2],calSM)
+            knee_JC = kneeJointCenter(frame,hip_JC,0,vsk=calSM)
+            ankle_JC = ankleJointCenter(frame,knee_JC,0,vsk=calSM)
+            angle = staticCalculation(frame,ankle_JC,knee_JC,flat_foot,calSM)
+            head = headJC(frame)
+            headangle = staticCalculationHead(frame,head)
+
+            static_offset.append(angle)
+            head_offset.append(headangle)
+            
+        static=np.average(static_offset,axis=0)
+        staticHead=np.average(head_offset)
     
     calSM['RightStaticRotOff'] = static[0][0]*-1
     calSM['RightStaticPlantFlex'] = static[0][1]
@@ -2056,13 +2095,13 @@ def findJointC(a, b, c, delta):
     # In order to make a plane, at least 3 number of markers is required which means three physical markers on the segment can make a plane. 
     # then the orthogonal vector of the plane will be rotating axis.
     # joint center is determined by rotating the one vector of plane around rotating axis.
-    rot = np.matrix([[cs+ux**2.0*(1.0-cs),ux*uy*(1.0-cs)-uz*sn,ux*uz*(1.0-cs)+uy*sn],
-                    [uy*ux*(1.0-cs)+uz*sn,cs+uy**2.0*(1.0-cs),uy*uz*(1.0-cs)-ux*sn],
-                    [uz*ux*(1.0-cs)-uy*sn,uz*uy*(1.0-cs)+ux*sn,cs+uz**2.0*(1.0-cs)]])  
-    r = rot*(np.matrix(v2).transpose())   
-    r = r* length/np.linalg.norm(r)
+    # the rotation matrix is applied to v2 row by row (same as pycgmBatch.findJointC).
+    r = [(cs+ux**2.0*(1.0-cs))*v2[0]+(ux*uy*(1.0-cs)-uz*sn)*v2[1]+(ux*uz*(1.0-cs)+uy*sn)*v2[2],
+         (uy*ux*(1.0-cs)+uz*sn)*v2[0]+(cs+uy**2.0*(1.0-cs))*v2[1]+(uy*uz*(1.0-cs)-ux*sn)*v2[2],
+         (uz*ux*(1.0-cs)-uy*sn)*v2[0]+(uz*uy*(1.0-cs)+ux*sn)*v2[1]+(cs+uz**2.0*(1.0-cs))*v2[2]]
+    r_div = norm2d(r)
+    r = [r[0]*length/r_div,r[1]*length/r_div,r[2]*length/r_div]
 
-    r = [r[0,0],r[1,0],r[2,0]]
     mr = np.array([r[0]+m[0],r[1]+m[1],r[2]+m[2]])
 
     return mr
@@ -0,0 +1,238 @@
+#pyCGM
+
+# Copyright (c) 2015 Mathew Schwartz <umcadop@gmail.com>
+# Core Developers: Seungeun Yeon, Mathew Schwartz
+# Contributors Filipe Alves Caixeta, Robert Van-wesep
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+# Frame by frame (streaming) version of the kinematics in pyCGM.py, for
+# live data where the frames arrive one at a time.
+
+import sys
+import time
+import numpy as np
+from .pyCGM import JointAngleCalc, SubjectModel, jointCenterKeys
+from .pycgmIO import createVskDataDict
+from .pycgmCalc import SJA, EJA, SA, EA
+
+#time.perf_counter is not in python 2
+clock=getattr(time,'perf_counter',time.time)
+
+class StreamCalc(object):
+    """Streaming joint angle calculation class
+
+    Calculates the joint angles of one frame at a time with JointAngleCalc,
+    for data that arrives live instead of as a complete trial. The subject
+    model and the result arrays are created once when the stream is created
+    and are reused by every frame, and the time taken by each frame is
+    recorded so the latency of the calculation can be checked.
+
+    JointAngleCalc still creates its small temporary lists and arrays on
+    every frame, so a frame takes about 1 ms on one core. That keeps up
+    with live data at 250 Hz, but it is not a sub-millisecond latency.
+
+    Parameters
+    ----------
+    vsk : dict
+        Subject measurements, the output of getStatic. It can also be a
+        SubjectModel or the labels and data of a vsk.
+    labels : list, optional
+        Marker names of the rows of the frames given to push, when the
+        frames are (markers, 3) arrays instead of dictionaries.
+    history : int, optional
+        Number of the most recent frames that are kept for the latency.
+        The default is 10000.
+
+    Attributes
+    ----------
+    angles : array
+        (19, 3) joint angles of the last frame.
+    axis : array
+        (18, 4, 3) origin and axes of each segment of the last frame.
+    joints : array
+        (27, 3) joint centers of the last frame, in the order of
+        jointCenterKeys.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from .pycgmStream import StreamCalc
+    >>> from .pycgmIO import loadC3D, loadVSK
+    >>> from .pycgmStatic import getStatic
+    >>> from .pyCGM_Helpers import getfilenames
+    >>> fileNames = getfilenames(2)
+    >>> data = loadC3D(fileNames[1])[0]
+    >>> vsk = getStatic(data,loadVSK(fileNames[2],False),flat_foot=False)
+    >>> stream = StreamCalc(vsk)
+    >>> angles = stream.push(data[0])
+    >>> angles.shape
+    (19, 3)
+    >>> np.around(stream.joints[0],8)
+    array([ 246.152565  ,  353.26243591, 1031.71362305])
+    >>> angles = stream.push(data[1])
+    >>> len(stream)
+    2
+    >>> stream.latency().shape
+    (3,)
+    """
+    def __init__(self,vsk,labels=None,history=10000):
+        if not isinstance(vsk,dict):
+            vsk=createVskDataDict(vsk[0],vsk[1])
+        if not isinstance(vsk,SubjectModel):
+            vsk=SubjectModel(vsk)
+        self.vsk=vsk
+        self.labels=labels
+        self.frame={}
+
+        #result arrays that are written by every frame
+        self.out=np.empty(EA)
+        self.joints=np.empty((len(jointCenterKeys()),3))
+        self.angles=np.reshape(self.out[SJA:EJA],((EJA-SJA)//3,3))
+        self.axis=np.reshape(self.out[SA:EA],((EA-SA)//12,4,3))
+
+        self.times=np.zeros(history)
+        self.count=0
+
+    def __len__(self):
+        return self.count
+
+    def push(self,frame):
+        """Calculates the joint angles of the next frame
+
+        Parameters
+        ----------
+        frame : dict or array
+            Dictionary of marker positions, or a (markers, 3) array in
+            the order of labels.
+
+        Returns
+        -------
+        angles : array
+            (19, 3) joint angles. This is the angles attribute of the
+            stream, so it is overwritten by the next frame and has to be
+            copied if it is kept.
+        """
+        start=clock()
+        if self.labels is not None and not isinstance(frame,dict):
+            for i,label in enumerate(self.labels):
+                self.frame[label]=frame[i]
+            frame=self.frame
+        JointAngleCalc(frame,self.vsk,self.out,self.joints)
+        self.times[self.count%len(self.times)]=clock()-start
+        self.count+=1
+        return self.angles
+
+    def latency(self,percentiles=(50,95,99)):
+        """Latency percentiles function
+
+        Parameters
+        ----------
+        percentiles : list, optional
+            Percentiles to calculate. The default is (50, 95, 99).
+
+        Returns
+        -------
+        array
+            Calculation time per frame at each percentile, in milliseconds,
+            of the most recent frames. NaN if no frame was calculated.
+        """
+        n=min(self.count,len(self.times))
+        if n==0:
+            return np.full(len(percentiles),np.nan)
+        return np.percentile(self.times[:n],percentiles)*1000.0
+
+    def reset(self):
+        """Clears the recorded latency."""
+        self.count=0
+
+def benchmark(data,vsk,repeat=5,budget=4.0,percentile=99):
+    """Streaming latency benchmark
+
+    Pushes all the frames of data through a StreamCalc repeat times, the
+    way frames arrive from a live system, and reports the per-frame
+    latency. A live stream has to keep up with every frame, so the test is
+    on a tail percentile of the latency and not on the mean.
+
+    Parameters
+    ----------
+    data : list
+        List of frame dictionaries, as returned by loadData.
+    vsk : dict
+        Subject measurements, the output of getStatic.
+    repeat : int, optional
+        Number of times the frames are pushed. The default is 5.
+    budget : float, optional
+        Latency per frame, in milliseconds, that the stream has to sustain
+        at the percentile. The default is 4 ms, a frame at 250 Hz.
+    percentile : float, optional
+        Percentile of the latency that has to be under budget, 100 for the
+        maximum. The default is 99.
+
+    Returns
+    -------
+    latency, passed : tuple
+        The mean, 50th, 95th, 99th percentile, maximum and the percentile
+        of the latency in milliseconds, and whether that percentile is
+        under budget.
+    """
+    stream=StreamCalc(vsk,history=len(data)*repeat)
+    #the first frame is not timed, it loads all the code
+    stream.push(data[0])
+    stream.reset()
+    for i in range(repeat):
+        for frame in data:
+            stream.push(frame)
+    n=min(stream.count,len(stream.times))
+    latency=np.append(np.mean(stream.times[:n])*1000.0,stream.latency((50,95,99,100,percentile)))
+    return latency,latency[-1]<=budget
+
+if __name__ == '__main__':
+    #python -m pyCGM_Single.pycgmStream [static c3d] [vsk] [repeat] [budget ms] [percentile]
+    from .pycgmIO import loadData, loadVSK
+    from .pycgmStatic import getStatic
+    from .pyCGM_Helpers import getfilenames
+
+    fileNames=getfilenames(2)
+    static_trial=fileNames[1]
+    vsk_file=fileNames[2]
+    repeat=5
+    budget=4.0
+    percentile=99
+    if len(sys.argv)>2:
+        static_trial=sys.argv[1]
+        vsk_file=sys.argv[2]
+    if len(sys.argv)>3:
+        repeat=int(sys.argv[3])
+    if len(sys.argv)>4:
+        budget=float(sys.argv[4])
+    if len(sys.argv)>5:
+        percentile=float(sys.argv[5])
+
+    data=loadData(static_trial)
+    vsk=getStatic(data,loadVSK(vsk_file,False),flat_foot=False)
+    latency,passed=benchmark(data,vsk,repeat,budget,percentile)
+    print("%d frames x %d" % (len(data),repeat))
+    print("latency per frame (ms): mean %.3f  p50 %.3f  p95 %.3f  p99 %.3f  max %.3f" % tuple(latency[:5]))
+    print("sustained rate: %.0f Hz (mean), %.0f Hz (p%g)" % (1000.0/latency[0],1000.0/latency[-1],percentile))
+    if passed:
+        print("p%g %.3f ms, under the %g ms budget per frame" % (percentile,latency[-1],budget))
+    else:
+        print("p%g %.3f ms, over the %g ms budget per frame" % (percentile,latency[-1],budget))
+        sys.exit(1)
@@ -34,18 +34,29 @@ import getopt
 from . import pycgmStatic
 from . import pycgmIO
 from . import pycgmCalc
+from . import pycgmCache
 
 def main(argv):
     """
     Take in motion data file, time span
     returns output file of angles
     pyCGM.py -i <motionFile> -o <outputfile> -s <start> -e <end> 
+    -c <chunk> calculates and writes the trial <chunk> frames at a time,
+    so long trials are not loaded into memory all at once
+    -f <format> writes the output as csv (default), npy, npz or pycgm, or
+    as c3d with the markers, the joint angles and the joint centers
+    --cache <directory> keeps the parsed trials, the static calibration and
+    the angles in directory, so running the same files again is not
+    calculated again. It can not be used with -c
     """
     flat_foot = False
     global vskdata
     start,end = None,None
+    chunk = None
+    fmt = 'csv'
+    cache = None
     try:
-        opts, args = getopt.getopt(argv,"h:i:o:s:e:v:x",["ifile=","ofile=","start=","end=","vskfile=","staticinput="])
+        opts, args = getopt.getopt(argv,"h:i:o:s:e:v:xc:f:",["ifile=","ofile=","start=","end=","vskfile=","staticinput=","chunk=","format=","cache="])
     except getopt.GetoptError:
         print('pyCGM.py -i <motionFile> -o <outputfile> -s <start> -e <end>')
         sys.exit(2)
@@ -66,27 +77,72 @@ def main(argv):
                 inputvsk = arg
         elif opt in ("-x","--staticinput"):
                 staticfile = arg
+        elif opt in ("-c","--chunk"):
+                chunk = int(arg)
+        elif opt == "--cache":
+                cache = pycgmCache.TrialCache(arg)
+        elif opt in ("-f","--format"):
+                fmt = arg
+                if fmt not in pycgmIO.RESULT_FORMATS and fmt != 'c3d':
+                        print('Output format has to be one of '+', '.join(list(pycgmIO.RESULT_FORMATS)+['c3d']))
+                        sys.exit(2)
 
 #TODO -x is not working for input
     
     filename = './'+inputfile
-    motionData  = pycgmIO.loadData(filename) 
-    if len(motionData) == 0 or motionData == None:
-        print("No Data Loaded")
-        sys.exit()
+    if chunk != None and fmt not in ('csv','pycgm'):
+        print('Chunked output has to be csv or pycgm')
+        sys.exit(2)
+    if chunk != None and cache != None:
+        print('--cache can not be used with -c')
+        sys.exit(2)
+    if fmt == 'c3d' and cache != None:
+        print('c3d output can not be used with --cache')
+        sys.exit(2)
+    if chunk == None and cache == None:
+        motionData  = pycgmIO.loadData(filename) 
+        if len(motionData) == 0 or motionData == None:
+            print("No Data Loaded")
+            sys.exit()
     
+    if cache != None:
+        result = cache.calcAngles(filename,staticfile,inputvsk,start,end,flat_foot)
+        pycgmIO.writeResult(result,outputfile,format=fmt)
+        sys.exit()
+
     if inputvsk != None:
         vskdata = pycgmIO.loadVSK(inputvsk)
         if vskdata!=None:
                 vsk = pycgmIO.createVskDataDict(vskdata[0],vskdata[1])
         
     if staticfile != None:
-        staticData = pycgmIO.loadData(staticfile)
-        calibratedMeasurements = pycgmStatic.getStatic(staticData,vsk,flat_foot)
+        staticData = pycgmIO.loadData(staticfile,markerSet=True)
+        calibratedMeasurements = pycgmStatic.getStatic(staticData,vsk,flat_foot,vectorize=True)
 		
+    if chunk != None:
+        chunks = pycgmIO.iterData(filename,chunk,start,end)
+        frame = 0
+        for result in pycgmCalc.calcChunks(chunks,vsk=calibratedMeasurements):
+            pycgmIO.writeResult(result,outputfile,append=frame>0,firstFrame=frame,format=fmt)
+            frame += len(result)
+        if frame == 0:
+            print("No Data Loaded")
+        sys.exit()
+
+    if fmt == 'c3d':
+        result,joints=pycgmCalc.calcAngles(motionData,start=start,end=end,vsk=calibratedMeasurements,
+                                           splitAnglesAxis=False,formatData=False,returnjoints=True)
+        markers=pycgmIO.MarkerSet.fromFrames(motionData[start:end])
+        rate=120.0
+        if filename.endswith('.c3d'):
+            with open(filename,'rb') as handle:
+                rate=pycgmIO.c3d.Reader(handle).frame_rate()
+        pycgmIO.writeC3D(outputfile+'.c3d',result,(markers.labels,markers.data),joints,rate)
+        sys.exit()
+
     result=pycgmCalc.calcAngles(motionData,start=start,end=end,vsk=calibratedMeasurements,splitAnglesAxis=False,formatData=False)
 
-    pycgmIO.writeResult(result,outputfile)
+    pycgmIO.writeResult(result,outputfile,format=fmt)
 
     sys.exit()
 
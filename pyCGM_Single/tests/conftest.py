@@ -0,0 +1,21 @@
+import os
+import pytest
+
+from pyCGM_Single import pycgmIO, pycgmStatic
+from pyCGM_Single.pyCGM_Helpers import getfilenames
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..')
+
+
+@pytest.fixture(scope='session')
+def sample_files():
+    """Dynamic, static and vsk files of the ROM sample."""
+    return [os.path.join(ROOT, name) for name in getfilenames(2)[:3]]
+
+
+@pytest.fixture(scope='session')
+def trial(sample_files):
+    """Markers of the ROM static trial and its calibrated vsk."""
+    markers = pycgmIO.loadData(sample_files[1], markerSet=True)
+    vsk = pycgmStatic.getStatic(markers, pycgmIO.loadVSK(sample_files[2], False), False)
+    return markers, vsk
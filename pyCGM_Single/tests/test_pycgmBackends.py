@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from pyCGM_Single import pycgmBackends, pycgmCalc
+
+
+def test_threads_same_result(trial):
+    markers, vsk = trial
+    serial = pycgmCalc.calcAngles(markers, vsk=vsk, end=20, splitAnglesAxis=False, formatData=False)
+    batch = pycgmCalc.calcAngles(markers, vsk=vsk, end=20, splitAnglesAxis=False, formatData=False,
+                                 vectorize=True)
+    with pycgmBackends.ThreadBackend(3, blockSize=4) as backend:
+        threads = pycgmCalc.calcAngles(markers, vsk=vsk, end=20, splitAnglesAxis=False, formatData=False,
+                                       backend=backend)
+        frames = pycgmCalc.calcAngles(markers, vsk=vsk, end=20, splitAnglesAxis=False, formatData=False,
+                                      backend=backend, vectorize=False)
+    # the vectorized blocks only differ from one batch by rounding
+    np.testing.assert_allclose(threads, batch, rtol=1e-12, atol=1e-10)
+    np.testing.assert_array_equal(frames, serial)
+    with pycgmBackends.ThreadBackend(3, vectorize=False, blockSize=4) as backend:
+        optout = pycgmCalc.calcAngles(markers, vsk=vsk, end=20, splitAnglesAxis=False, formatData=False,
+                                      backend=backend)
+    np.testing.assert_array_equal(optout, serial)
+
+
+def test_without_shared_memory(trial, monkeypatch):
+    # Python 2 and Python 3 before 3.8
+    markers, vsk = trial
+    monkeypatch.setattr(pycgmBackends, 'shared_memory', None)
+    with pytest.raises(Exception):
+        pycgmBackends.getBackend('processes')
+    expected = pycgmCalc.calcAngles(markers, vsk=vsk, end=10, splitAnglesAxis=False, formatData=False,
+                                    backend='threads')
+    result = pycgmCalc.calcAngles(markers, vsk=vsk, end=10, splitAnglesAxis=False, formatData=False,
+                                  multiprocessing=True)
+    np.testing.assert_array_equal(result, expected)
+
+
+def test_unicode_backend_name():
+    backend = pycgmBackends.getBackend(u'serial')
+    assert isinstance(backend, pycgmBackends.SerialBackend)
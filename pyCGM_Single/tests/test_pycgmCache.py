@@ -0,0 +1,79 @@
+import io
+import os
+import shutil
+import time
+import numpy as np
+
+from pyCGM_Single import pycgmCache
+from pyCGM_Single.pycgmCache import TrialCache
+
+
+def test_key_changes(tmpdir, sample_files, monkeypatch):
+    static, vskfile = sample_files[1:]
+    cache = TrialCache(os.path.join(str(tmpdir), 'cache'))
+    vsk = cache.getStatic(static, vskfile)
+    # static and markers
+    assert (cache.misses, cache.hits) == (2, 0)
+
+    # the same content under another name is the same entry
+    copy = os.path.join(str(tmpdir), 'copy.vsk')
+    shutil.copy(vskfile, copy)
+    assert cache.getStatic(static, copy) == vsk
+    assert (cache.misses, cache.hits) == (2, 1)
+
+    # a changed vsk calibrates again, with the markers of the cache
+    with open(copy, 'a') as f:
+        f.write('\n')
+    cache.getStatic(static, copy)
+    assert (cache.misses, cache.hits) == (3, 2)
+
+    # another version of pyCGM uses none of the entries
+    monkeypatch.setattr(pycgmCache, '__version__', 'other')
+    cache.getStatic(static, vskfile)
+    assert (cache.misses, cache.hits) == (5, 2)
+
+
+def test_evicts_least_recently_used(tmpdir, sample_files):
+    static, vskfile = sample_files[1:]
+    directory = os.path.join(str(tmpdir), 'cache')
+    cache = TrialCache(directory)
+    cache.calcAngles(static, static, vskfile, end=10)
+    now = time.time()
+    for name, age in (('angles-old.npy', 300), ('angles-older.npy', 400)):
+        path = os.path.join(directory, name)
+        with open(path, 'wb') as f:
+            f.write(b'\0' * 1000)
+        os.utime(path, (now - age, now - age))
+
+    # the next entry leaves room for all but 500 bytes
+    buf = io.BytesIO()
+    np.save(buf, np.zeros((20, 273)))
+    cache.maxSize = cache.size() + len(buf.getvalue()) - 500
+    cache.calcAngles(static, static, vskfile, end=20)
+    names = os.listdir(directory)
+    assert 'angles-older.npy' not in names
+    assert 'angles-old.npy' in names
+    assert cache.size() <= cache.maxSize
+    assert len(names) == 6
+
+
+def test_corrupt_entries(tmpdir, sample_files):
+    static, vskfile = sample_files[1:]
+    directory = os.path.join(str(tmpdir), 'cache')
+    cache = TrialCache(directory)
+    expected = np.array(cache.calcAngles(static, static, vskfile, end=20))
+    assert (cache.misses, cache.hits) == (3, 1)
+
+    # entries cut short, as by a full disk
+    for name in os.listdir(directory):
+        path = os.path.join(directory, name)
+        size = os.path.getsize(path)
+        with open(path, 'r+b') as f:
+            f.truncate(size // 2)
+
+    result = cache.calcAngles(static, static, vskfile, end=20)
+    np.testing.assert_array_equal(result, expected)
+    assert (cache.misses, cache.hits) == (6, 2)
+    again = cache.calcAngles(static, static, vskfile, end=20)
+    np.testing.assert_array_equal(again, expected)
+    assert (cache.misses, cache.hits) == (6, 3)
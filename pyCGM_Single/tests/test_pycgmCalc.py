@@ -0,0 +1,42 @@
+import sys
+import numpy as np
+import pytest
+
+from pyCGM_Single import pycgmBatch, pycgmCalc
+
+
+def test_empty_range(trial):
+    markers, vsk = trial
+    for vectorize in (False, True):
+        with pytest.raises(ValueError):
+            pycgmCalc.calcAngles(markers, vsk=vsk, start=5, end=5, vectorize=vectorize)
+    with pytest.raises(ValueError):
+        pycgmCalc.calcAngles(markers.frames(), vsk=vsk, start=1, end=1, vectorize=True)
+    with pytest.raises(ValueError):
+        pycgmBatch.JointAngleCalc({}, vsk)
+
+
+def test_outputs_with_backend(trial):
+    markers, vsk = trial
+    with pytest.raises(ValueError):
+        pycgmCalc.calcAngles(markers, vsk=vsk, outputs=['R Hip'], backend='threads')
+    with pytest.raises(ValueError):
+        pycgmCalc.calcAngles(markers, vsk=vsk, outputs=['R Hip'], workers=2)
+
+
+BACKENDS = [{'backend': 'serial'}, {'backend': 'threads', 'workers': 2},
+            {'backend': 'threads', 'workers': 2, 'vectorize': True}]
+if sys.version_info >= (3, 8):
+    BACKENDS.append({'backend': 'processes', 'workers': 2})
+
+
+@pytest.mark.parametrize('kargs', [{}, {'vectorize': True}, {'outputs': ['R Hip', 'L Knee', 'HIPO']}] + BACKENDS)
+def test_subject_model(trial, kargs):
+    markers, vsk = trial
+    model = pycgmCalc.SubjectModel(vsk)
+    expected = pycgmCalc.calcAngles(markers, vsk=vsk, end=10, splitAnglesAxis=False, formatData=False,
+                                    **kargs)
+    result = pycgmCalc.calcAngles(markers, vsk=model, end=10, splitAnglesAxis=False, formatData=False,
+                                  **kargs)
+    assert np.array_equal(np.isnan(result), np.isnan(expected))
+    assert np.allclose(result, expected, equal_nan=True)
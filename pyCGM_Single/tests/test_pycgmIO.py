@@ -0,0 +1,82 @@
+import os
+import numpy as np
+import pytest
+
+from pyCGM_Single import pycgmIO
+
+
+@pytest.fixture
+def result():
+    data = np.random.RandomState(0).uniform(-180, 180, (5, 273))
+    data[1, 10] = np.nan
+    return data
+
+
+@pytest.mark.parametrize('fmt', ['npy', 'npz', 'pycgm'])
+def test_result_round_trip(tmpdir, result, fmt):
+    name = os.path.join(str(tmpdir), 'out')
+    pycgmIO.writeResult(result, name)
+    expected = np.loadtxt(name + '.csv', delimiter=',')
+    pycgmIO.writeResult(result, name, format=fmt)
+    columns, data = pycgmIO.loadResult(name + pycgmIO.RESULT_FORMATS[fmt])
+    assert np.allclose(data, expected, rtol=0, atol=1e-12, equal_nan=True)
+    if fmt != 'npy':
+        assert len(columns) == data.shape[1]
+        assert columns[:2] == ['frame num', 'Pelvis X']
+
+
+@pytest.mark.parametrize('fmt', ['csv', 'pycgm'])
+def test_append_to_missing_file(tmpdir, result, fmt):
+    name = os.path.join(str(tmpdir), 'out')
+    pycgmIO.writeResult(result[:2], name, append=True, format=fmt)
+    pycgmIO.writeResult(result[2:], name, append=True, firstFrame=2, format=fmt)
+    pycgmIO.writeResult(result, os.path.join(str(tmpdir), 'whole'), format=fmt)
+    filename = name + pycgmIO.RESULT_FORMATS[fmt]
+    whole = os.path.join(str(tmpdir), 'whole' + pycgmIO.RESULT_FORMATS[fmt])
+    if fmt == 'csv':
+        with open(filename) as f, open(whole) as g:
+            assert f.read() == g.read()
+    else:
+        columns, data = pycgmIO.loadResult(filename)
+        np.testing.assert_array_equal(data, pycgmIO.loadResult(whole)[1])
+        assert data[:, 0].tolist() == [0, 1, 2, 3, 4]
+
+
+def test_c3d_round_trip(tmpdir):
+    nframes = 6
+    state = np.random.RandomState(1)
+    labels = ['M%03d' % i for i in range(300)]
+    points = state.uniform(-1000, 1000, (nframes, len(labels), 3))
+    points[2, 7] = np.nan
+    result = state.uniform(-180, 180, (nframes, 273))
+    joints = state.uniform(-1000, 1000, (nframes, 27, 3))
+    filename = os.path.join(str(tmpdir), 'result.c3d')
+    pycgmIO.writeC3D(filename, result, (labels, points), joints, rate=100.0)
+
+    written_labels, written = pycgmIO.loadC3DArray(filename)
+    assert written_labels[:len(labels)] == labels
+    assert written_labels[len(labels)] == 'PelvisAngles'
+    assert len(written_labels) == len(labels) + 19 + 27
+    # points are stored as float32
+    np.testing.assert_allclose(written[:, :len(labels)], points, rtol=1e-6)
+    assert np.isnan(written[2, 7]).all()
+    angles = result[:, :57].reshape(nframes, 19, 3)
+    np.testing.assert_allclose(written[:, len(labels):len(labels) + 19], angles, rtol=1e-6)
+    np.testing.assert_allclose(written[:, len(labels) + 19:], joints, rtol=1e-6)
+
+
+def test_from_frames_marker_order():
+    state = np.random.RandomState(2)
+    points = state.uniform(-1000, 1000, (4, 3, 3))
+    labels = ['RASI', 'LASI', 'RPSI']
+    frames = [dict(zip(labels, frame)) for frame in points]
+    # markers in another order, a missing marker and a marker which is not kept
+    frames[1] = dict((label, frames[1][label]) for label in reversed(labels))
+    del frames[2]['LASI']
+    frames[3]['RFIN'] = np.zeros(3)
+    expected = points.copy()
+    expected[2, 1] = np.nan
+    markers = pycgmIO.MarkerSet.fromFrames(frames, labels)
+    assert markers.labels == labels
+    np.testing.assert_array_equal(markers.data, expected)
+    assert pycgmIO.MarkerSet.fromFrames(frames).labels == labels + ['RFIN']